@@ -1,32 +1,79 @@
 import pandas as pd
 import time
-import psutil
 import os
 from urllib.request import urlopen as _urlopen
 import validators as _validators
-import matplotlib.pyplot as plt
-from collections import Counter
 import numpy as np
+import heapq
+from tidlist import PackedTidList, TidBuffer, TidList, TidUniverse, batchable, intersect_class, make_tidlist, CLASS_BATCH_MIN, TIDLIST_BACKENDS, BITSET_DENSITY
+from diffset import difference, diffset_support, DIFFSET_DENSITY
+from profiling import Profiler, memory_usage, merge_counters, peak_rss
+from parallel import mine_classes
+from loader import TransactionData, VerticalData, length_stats, read_transactions
+from dbcache import read_cached
+from sweep import build_table, gap_histogram, sorted_timestamps
+from sinks import PatternSink, SINK_TYPES, make_sink
+from ordering import ITEM_ORDERS, order_items
+from results import PatternStore
 
 class ThreePEclat:
     """
     """
-    def __init__(self, minPS, period, sep='\t'):
+    def __init__(self, minPS, period, sep='\t', tidlist=None, density=BITSET_DENSITY, diffset=False, diffset_density=DIFFSET_DENSITY, workers=1, cache=False, sink=None, topK=None, order=ITEM_ORDERS[0], trace_memory=False, maxLength=None):
+        if tidlist is not None and tidlist not in TIDLIST_BACKENDS:
+            raise ValueError(f"Kiểu tid-list không được hỗ trợ: {tidlist}")
+        if sink is not None and not isinstance(sink, PatternSink) and sink not in SINK_TYPES:
+            raise ValueError(f"Kiểu sink không được hỗ trợ: {sink}")
+        if topK is not None and (not isinstance(topK, int) or topK <= 0):
+            raise ValueError("topK phải là số nguyên dương")
+        if maxLength is not None and (not isinstance(maxLength, int) or maxLength <= 0):
+            raise ValueError("maxLength phải là số nguyên dương")
+        if order not in ITEM_ORDERS:
+            raise ValueError(f"Thứ tự item không được hỗ trợ: {order}")
         self._minPS = minPS
         self._period = period
         self._sep = sep
-        self._Database = []
+        self._tidlist = tidlist
+        self._density = density
+        self._diffset = diffset
+        self._diffset_density = diffset_density
+        self._workers = workers
+        self._cache = cache
+        self._sink = sink
+        self._activeSink = None
+        self._topK = topK
+        self._topHeap = []
+        self._topCount = 0
+        # Độ dài tối đa của mẫu (None: không giới hạn); lớp con chỉ được sinh khi mẫu hiện tại ngắn hơn
+        self._maxLength = maxLength
+        # Danh sách item / tid-list / support và TidBuffer của lớp ở từng độ sâu, dùng lại khi duyệt theo chiều sâu
+        self._levels = []
+        self._universe = None
+        # Thứ tự duyệt item; trong lúc khai thác item là số nguyên 0..n-1 theo thứ tự này, _itemLabels[id] là nhãn gốc
+        self._order = order
+        self._itemLabels = []
+        self._plist = []
+        self._vertical = {}
+        self._Database = VerticalData.empty()
+        self._periodValue = self._convert_support_period(period)
+        self._minPSValue = self._convert_support_period(minPS)
         self._finalPatterns = {}
         self._startTime = 0
         self._endTime = 0
         self._memoryUSS = 0
         self._memoryRSS = 0
+        self._memoryPeakRSS = 0
         self._tidList = {}
         self._lno = 0
-        self._item_frequencies = {}
-        self._transaction_lengths = []
-        self._timestamps = []
         self._current_file = None
+        # Chỉ dùng khi sweep: các period của lưới và histogram khoảng cách của từng mẫu
+        self._sweepPeriods = None
+        self._gapHistograms = {}
+        # Số phép giao đã thực hiện, bị bỏ qua nhờ cận trên của support, bị dừng sớm giữa chừng;
+        # số ứng viên được xét, độ dài lớn nhất của mẫu trong các lớp đã duyệt và số mảng tid-list phải cấp mới
+        self._counters = dict.fromkeys(('intersections', 'skipped', 'aborted', 'candidates', 'max_depth', 'allocations'), 0)
+        # Thời gian từng pha và bộ nhớ đỉnh của lần chạy gần nhất; trace_memory bật thêm tracemalloc
+        self._profiler = Profiler(trace_memory)
 
     def _convert_support_period(self, value):
         if isinstance(value, int):
@@ -45,11 +92,8 @@ class ThreePEclat:
         return value
 
     def _creatingItemSets(self, iFile):
-        self._Database = []
+        self._Database = VerticalData.empty()
         self._lno = 0
-        all_items = []
-        self._transaction_lengths = []
-        self._timestamps = []
 
         if isinstance(iFile, pd.DataFrame):
             data, tids = [], []
@@ -61,70 +105,45 @@ class ThreePEclat:
                 tids = iFile['TS'].tolist()
             if 'Transactions' in cols:
                 data = iFile['Transactions'].tolist()
-            for i in range(len(data)):
-                transaction = data[i]
-                tr = [tids[i]] + transaction
-                self._Database.append(tr)
-                all_items.extend(transaction)
-                self._transaction_lengths.append(len(transaction))
-                self._timestamps.append(tids[i])
+            self._Database = TransactionData.from_rows(tids, data)
             self._lno = len(self._Database)
         elif isinstance(iFile, str):
-            def process_line(line):
-                line = line.strip()
-                temp = [i.strip() for i in line.split(self._sep) if i.strip()]
-                if temp:
-                    timestamp_str = temp[0]
-                    items = temp[1:]
-                    try:
-                        timestamp = int(timestamp_str)
-                        transaction = [timestamp] + items
-                        self._Database.append(transaction)
-                        all_items.extend(items)
-                        self._transaction_lengths.append(len(items))
-                        self._timestamps.append(timestamp)
-                    except ValueError:
-                        print(f"Cảnh báo: Không thể chuyển đổi timestamp '{timestamp_str}' thành số trong dòng: {line}")
-
             if _validators.url(iFile):
                 try:
                     with _urlopen(iFile) as f:
-                        for line_bytes in f:
-                            line = line_bytes.decode("utf-8")
-                            self._lno += 1
-                            process_line(line)
+                        self._Database, self._lno = read_transactions(f, self._sep)
                 except Exception as e:
                     print(f"Lỗi khi đọc dữ liệu từ URL: {e}")
                     quit()
             else:
                 try:
-                    with open(iFile, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            self._lno += 1
-                            process_line(line)
+                    if self._cache:
+                        self._Database, self._lno = read_cached(iFile, self._sep)
+                    else:
+                        with open(iFile, 'r', encoding='utf-8') as f:
+                            self._Database, self._lno = read_transactions(f, self._sep)
                 except IOError:
                     print(f"Không tìm thấy file: {iFile}")
                     quit()
         else:
             raise ValueError("Định dạng đầu vào không được hỗ trợ.")
 
-        self._item_frequencies = Counter(all_items)
+        # Bỏ dạng ngang ngay khi có dạng dọc: khai thác và thống kê chỉ cần tid-list dọc cùng histogram độ dài giao dịch
+        if isinstance(self._Database, TransactionData):
+            self._Database = self._Database.compact()
         print(f"Đã đọc {self._lno} giao dịch từ nguồn.")
 
     def _calculate_database_stats(self, output_file):
         num_transactions = len(self._Database)
-        num_items = len(self._item_frequencies)
-        min_transaction_size = min(self._transaction_lengths) if self._transaction_lengths else 0
-        max_transaction_size = max(self._transaction_lengths) if self._transaction_lengths else 0
-        avg_transaction_size = np.mean(self._transaction_lengths) if self._transaction_lengths else 0
-        std_dev_transaction_size = np.std(self._transaction_lengths) if self._transaction_lengths else 0
-        variance_transaction_size = np.var(self._transaction_lengths) if self._transaction_lengths else 0
+        num_items = len(self._Database.labels)
+        (min_transaction_size, max_transaction_size, avg_transaction_size,
+         std_dev_transaction_size, variance_transaction_size) = length_stats(self._Database.length_counts)
 
         min_period = self._period
         max_period = self._period
         avg_period = self._period
 
-        total_item_occurrences = sum(self._item_frequencies.values())
+        total_item_occurrences = int(self._Database.item_frequencies().sum())
         sparsity = 1 - (total_item_occurrences / (num_transactions * num_items)) if num_transactions * num_items > 0 else 0
 
         output = f"--- Thống kê Cơ Sở Dữ Liệu ---\n"
@@ -143,127 +162,33 @@ class ThreePEclat:
         output += "-----------------------------\n"
         return output
 
-    def _plot_database_stats(self):
-        if not self._Database:
-            print("Không có dữ liệu để vẽ biểu đồ.")
-            return
-
-        output_dir = "output"
-        file_name = os.path.basename(self._current_file)
-        plot_file_prefix = os.path.join(output_dir, f"{os.path.splitext(file_name)[0]}_stats_plot")
-
-        plt.figure(figsize=(15, 10))
-
-        # Biểu đồ tần suất item phổ biến
-        top_n = 20
-        most_common_items = self._item_frequencies.most_common(top_n)
-        item_names = [item[0] for item in most_common_items]
-        frequencies = [item[1] for item in most_common_items]
-
-        plt.subplot(2, 2, 1)
-        plt.bar(item_names, frequencies)
-        plt.xlabel('Item')
-        plt.ylabel('Tần suất')
-        plt.title(f'Top {top_n} Item Phổ Biến Nhất')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-
-        # Biểu đồ phân phối độ dài giao dịch
-        plt.subplot(2, 2, 2)
-        plt.hist(self._transaction_lengths, bins=20, edgecolor='black')
-        plt.xlabel('Độ dài giao dịch')
-        plt.ylabel('Số lượng giao dịch')
-        plt.title('Phân Phối Độ Dài Giao Dịch')
-        plt.tight_layout()
-
-        # Biểu đồ đường tần suất theo số lượng item
-        item_value_counts = Counter(self._item_frequencies.values())
-        sorted_item_counts = sorted(item_value_counts.items())
-        frequencies = [count for count, freq in sorted_item_counts]
-        no_of_items = [freq for count, freq in sorted_item_counts]
-
-        plt.subplot(2, 2, 3)
-        plt.plot(no_of_items, frequencies, marker='o', linestyle='-')
-        plt.xlabel('Số lượng item')
-        plt.ylabel('Tần suất')
-        plt.title('Tần Suất theo Số Lượng Item')
-        plt.grid(True)
-        plt.tight_layout()
-
-        # Biểu đồ đường tần suất theo độ dài giao dịch
-        transaction_length_counts = Counter(self._transaction_lengths)
-        sorted_transaction_lengths = sorted(transaction_length_counts.items())
-        transaction_lengths = [length for length, freq in sorted_transaction_lengths]
-        frequencies = [freq for length, freq in sorted_transaction_lengths]
-
-        plt.subplot(2, 2, 4)
-        plt.plot(transaction_lengths, frequencies, marker='o', linestyle='-')
-        plt.xlabel('Độ dài giao dịch')
-        plt.ylabel('Tần suất')
-        plt.title('Tần Suất theo Độ Dài Giao Dịch')
-        plt.grid(True)
-        plt.tight_layout()
-
-        plot_file_name = f"{plot_file_prefix}.png"
-        plt.savefig(plot_file_name)
-        plt.close()
-        print(f"Đã lưu biểu đồ thống kê vào file: {plot_file_name}")
-
-    def _plot_periodic_patterns(self, patterns, output_path):
-        if not patterns:
-            print("Không có mẫu tuần hoàn nào để vẽ biểu đồ.")
-            return
-
-        pattern_lengths = [len(pattern) for pattern in patterns.keys()]
-        supports = list(patterns.values())
-
-        plt.figure(figsize=(10, 6))
-        plt.plot(pattern_lengths, supports, marker='o', linestyle='-')
-        plt.xlabel('Độ dài mẫu tuần hoàn')
-        plt.ylabel('Periodic Support')
-        plt.title('Biểu đồ Periodic Support theo Độ dài Mẫu')
-        plt.grid(True)
-        plt.tight_layout()
-
-        plt.savefig(output_path)
-        plt.close()
-        print(f"Đã lưu biểu đồ mẫu tuần hoàn vào file: {output_path}")
-
     def _creatingOneitemSets(self):
         self._tidList = {}
-        _mapSupport = {}
-        period = self._convert_support_period(self._period)
-        for line in self._Database:
-            if not line:
-                continue
-            try:
-                n = int(line[0])
-                for i in range(1, len(line)):
-                    si = line[i]
-                    if si not in _mapSupport:
-                        _mapSupport[si] = [0, n]
-                        self._tidList[si] = [n]
-                    else:
-                        lp = n - _mapSupport[si][1]
-                        if lp <= period:
-                            _mapSupport[si][0] += 1
-                        _mapSupport[si][1] = n
-                        self._tidList[si].append(n)
-            except ValueError:
-                print(f"Cảnh báo: Lỗi định dạng timestamp trong giao dịch: {line}")
-                continue
-
-        minPS = self._convert_support_period(self._minPS)
-        _mapSupport = {k: v[0] for k, v in _mapSupport.items() if v[0] >= minPS}
-        plist = sorted(_mapSupport.keys(), key=lambda k: _mapSupport[k], reverse=True)
-        return plist
+        # Ngưỡng chỉ phụ thuộc kích thước CSDL nên quy đổi một lần cho cả lần khai thác
+        self._periodValue = self._convert_support_period(self._period)
+        self._minPSValue = self._convert_support_period(self._minPS)
+        self._itemLabels = []
+        if not len(self._Database):
+            return []
+        labels = self._Database.labels
+        sorted_items, sorted_ts, bounds = self._Database.vertical()
+        # Support của item đơn tính theo thứ tự giao dịch trong file như cách đếm tuần tự trước đây
+        close = (sorted_items[1:] == sorted_items[:-1]) & (np.diff(sorted_ts) <= self._periodValue)
+        supports = np.bincount(sorted_items[1:][close], minlength=len(labels))
+        frequent = order_items(np.flatnonzero(supports >= self._minPSValue), supports, sorted_ts, bounds, self._order)
+        self._itemLabels = [labels[k] for k in frequent]
+        self._tidList = {i: sorted_ts[bounds[k]:bounds[k + 1]].tolist() for i, k in enumerate(frequent)}
+        return list(range(len(frequent)))
 
     def getPeriodicSupport(self, timeStamps):
+        if isinstance(timeStamps, TidList):
+            return timeStamps.periodic_support(self._periodValue)
         timeStamps.sort()
+        period = self._periodValue
         per = 0
         for i in range(len(timeStamps) - 1):
             j = i + 1
-            if abs(timeStamps[j] - timeStamps[i]) <= self._convert_support_period(self._period):
+            if abs(timeStamps[j] - timeStamps[i]) <= period:
                 per += 1
         return per
     # def getPeriodicSupport(self, timeStamps):
@@ -277,97 +202,424 @@ class ThreePEclat:
     #             weighted_support += weight
     #     return weighted_support / (len(self._Database) - 1) * 100  # Chuẩn hóa thành phần trăm
 
-    def _save(self, prefix, suffix, tidSetX):
+    def _intersect(self, tidSetX, tidSetJ):
+        if self._tidlist is None:
+            return list(set(tidSetX).intersection(tidSetJ))
+        return tidSetX.intersect(tidSetJ)
+
+    def _intersect_support(self, tidSetX, tidSetJ, buffer=None, decoded=None):
+        # Trả về (tid-list giao, support); tid-list là None khi phép giao dừng sớm vì support không thể đạt minPS.
+        # buffer: TidBuffer của lớp đang sinh, kết quả được ghi vào đó nếu kiểu tid-list cho phép.
+        # decoded: t(X) đã giải nén sẵn cho cả lớp khi X là PackedTidList
+        self._counters['intersections'] += 1
+        if self._tidlist is None:
+            common_tids = self._intersect(tidSetX, tidSetJ)
+            if buffer is not None:
+                buffer.allocations += 1
+            return common_tids, self.getPeriodicSupport(common_tids)
+        if decoded is None:
+            common_tids, val = tidSetX.intersect_bounded(tidSetJ, self._periodValue, self._minPSValue, buffer)
+        else:
+            common_tids, val = tidSetX.intersect_bounded(tidSetJ, self._periodValue, self._minPSValue, buffer,
+                                                         timestamps=decoded)
+        if common_tids is None:
+            self._counters['aborted'] += 1
+        return common_tids, val
+
+    def _extend_class(self, tidSetX, itemSets, tidSets, candidates, buffer, classItemSets, classTidSets, classSupports):
+        # Giao X với các ứng viên: những tid-list cùng kiểu array / bitset với X được giao và tính support cùng lúc
+        # cho cả lớp (intersect_class), số còn lại giao từng cặp. Lớp con giữ đúng thứ tự của candidates
+        together = [batchable(tidSetX, tidSets[j]) for j in candidates]
+        batch = [tidSets[j] for j, flag in zip(candidates, together) if flag]
+        if len(batch) >= CLASS_BATCH_MIN:
+            self._counters['intersections'] += len(batch)
+            batched = iter(intersect_class(tidSetX, batch, self._periodValue, self._minPSValue, buffer))
+        else:
+            together = [False] * len(candidates)
+        # t(X) nén được giải nén một lần cho cả lớp thay vì một lần cho mỗi cặp
+        decoded = tidSetX.timestamps() if isinstance(tidSetX, PackedTidList) else None
+        for j, flag in zip(candidates, together):
+            if flag:
+                common_tids, val = next(batched)
+            else:
+                common_tids, val = self._intersect_support(tidSetX, tidSets[j], buffer, decoded)
+            if common_tids is not None and val >= self._minPSValue:
+                buffer.commit()
+                classItemSets.append(itemSets[j])
+                classTidSets.append(common_tids)
+                classSupports.append(val)
+
+    def _as_array(self, tidSet):
+        if isinstance(tidSet, TidList):
+            return tidSet.timestamps()
+        return np.unique(np.asarray(tidSet, dtype=np.int64))
+
+    def _save(self, prefix, suffix, tidSetX, support=None):
         if prefix is None:
             pattern = tuple(suffix)
         else:
             pattern = tuple(sorted(prefix + suffix))
 
-        val = self.getPeriodicSupport(tidSetX)
-        if val >= self._convert_support_period(self._minPS):
-            self._finalPatterns[pattern] = val
+        val = self.getPeriodicSupport(tidSetX) if support is None else support
+        self._emit(pattern, tidSetX, val)
 
-    def _generation(self, prefix, itemSets, tidSets):
+    def _emit(self, pattern, tidSetX, val):
+        if val >= self._minPSValue:
+            if self._topK is not None:
+                self._push_top(pattern, val)
+            elif self._activeSink is None:
+                self._finalPatterns[pattern] = val
+            else:
+                self._activeSink.emit(self._decode(pattern), val)
+            if self._sweepPeriods is not None:
+                self._gapHistograms[pattern] = gap_histogram(sorted_timestamps(tidSetX), self._sweepPeriods)
+
+    def _level(self, depth):
+        while len(self._levels) <= depth:
+            self._levels.append(([], [], [], TidBuffer()))
+        return self._levels[depth]
+
+    def _generation(self, prefix, itemSets, tidSets, supports):
+        if self._topK is not None:
+            itemSets, tidSets, supports = self._best_first(itemSets, tidSets, supports)
+        if itemSets and len(prefix) >= self._counters['max_depth']:
+            self._counters['max_depth'] = len(prefix) + 1
+        self._search(prefix, itemSets, tidSets, supports)
+
+    def _search(self, prefix, itemSets, tidSets, supports):
+        # Duyệt theo chiều sâu bằng stack tường minh thay cho đệ quy. Lớp con ở độ sâu d được ghi vào danh sách
+        # và TidBuffer của độ sâu đó (lớp trước cùng độ sâu đã duyệt xong nên dùng lại được);
+        # path là mảng item id của mẫu hiện tại, nối thêm khi đi xuống và cắt bớt khi quay lên
+        topK = self._topK is not None
+        maxLength = self._maxLength
+        counters = self._counters
+        diffset_size = self._diffset_density * self._universe.size if self._diffset else None
+        path = list(prefix)
+        frames = [(itemSets, tidSets, supports)]
+        cursors = [0]
+        while frames:
+            items, tids, sups = frames[-1]
+            i = cursors[-1]
+            if i == len(items):
+                frames.pop()
+                cursors.pop()
+                if frames:
+                    # Quay lên: lớp con đã duyệt xong, lưu nút cha sau các nút con như bản đệ quy
+                    items, tids, sups = frames[-1]
+                    i = cursors[-1] - 1
+                    if not topK:
+                        self._emit(tuple(path), tids[i], sups[i])
+                    path.pop()
+                continue
+            cursors[-1] = i + 1
+            # minPS có thể đã được nâng lên (topK) sau khi lớp được tạo
+            if items[i] is None or sups[i] < self._minPSValue:
+                continue
+            tidSetX = tids[i]
+            path.append(items[i])
+            if topK:
+                # topK: lưu nút trước các nút con để ngưỡng tăng sớm; lớp đã bị sắp lại nên cần sắp xếp item
+                self._emit(tuple(sorted(path)), tidSetX, sups[i])
+            if maxLength is None or len(path) < maxLength:
+                if diffset_size is not None and len(tidSetX) >= diffset_size:
+                    self._switch_to_diffset(sorted(path), tidSetX, sups[i], items[i + 1:], tids[i + 1:])
+                else:
+                    classItemSets, classTidSets, classSupports, buffer = self._level(len(frames))
+                    del classItemSets[:], classTidSets[:], classSupports[:]
+                    buffer.reset()
+                    counters['candidates'] += len(items) - i - 1
+                    # support(XJ) <= support(J) (support không tăng khi thêm item) <= |t(J)| - 1
+                    candidates = [j for j in range(i + 1, len(items)) if sups[j] >= self._minPSValue]
+                    counters['skipped'] += len(items) - i - 1 - len(candidates)
+                    self._extend_class(tidSetX, items, tids, candidates, buffer, classItemSets, classTidSets, classSupports)
+                    counters['allocations'] += buffer.allocations
+                    buffer.allocations = 0
+                    if classItemSets:
+                        if topK:
+                            classItemSets[:], classTidSets[:], classSupports[:] = self._best_first(classItemSets, classTidSets, classSupports)
+                        if len(path) >= counters['max_depth']:
+                            counters['max_depth'] = len(path) + 1
+                        frames.append((classItemSets, classTidSets, classSupports))
+                        cursors.append(0)
+                        continue
+            # Không có lớp con (rỗng, đã duyệt bằng diffset hoặc đã đạt maxLength): lưu nút ngay
+            if not topK:
+                self._emit(tuple(path), tidSetX, sups[i])
+            path.pop()
+
+    def _switch_to_diffset(self, prefix, tidSetX, supportX, itemSets, tidSets):
+        # Lớp con của X dày đặc: lưu d(XY) = t(X) \ t(Y) thay cho t(XY)
+        tidSetP = self._as_array(tidSetX)
+        period = self._periodValue
+        minPS = self._minPSValue
+        classItemSets = []
+        classDiffSets = []
+        classSupports = []
+        self._counters['candidates'] += len(itemSets)
+        for itemJ, tidSetJ in zip(itemSets, tidSets):
+            diffSet = difference(tidSetP, self._as_array(tidSetJ))
+            val = diffset_support(tidSetP, supportX, diffSet, period)
+            if val >= minPS:
+                classItemSets.append(itemJ)
+                classDiffSets.append(diffSet)
+                classSupports.append(val)
+        self._generation_diffset(prefix, tidSetP, classItemSets, classDiffSets, classSupports)
+
+    def _generation_diffset(self, prefix, tidSetP, itemSets, diffSets, supports):
+        # Chỉ tid-list của tiền tố được giữ đầy đủ, các phần tử của lớp chỉ giữ diffset
+        period = self._periodValue
+        minPS = self._minPSValue
         num_items = len(itemSets)
+        if num_items and len(prefix) >= self._counters['max_depth']:
+            self._counters['max_depth'] = len(prefix) + 1
+        # Nút của lớp dài len(prefix) + 1; đã đạt maxLength thì chỉ lưu, không sinh lớp con
+        expand = self._maxLength is None or len(prefix) + 1 < self._maxLength
         for i in range(num_items):
             itemI = itemSets[i]
-            if itemI is None:
+            diffSetX = diffSets[i]
+            tidSetX = difference(tidSetP, diffSetX)
+            if not expand:
+                self._save(prefix, [itemI], tidSetX, supports[i])
                 continue
-            tidSetX = tidSets[i]
-            itemSetX = [itemI]
             classItemSets = []
-            classTidSets = []
+            classDiffSets = []
+            classSupports = []
+            self._counters['candidates'] += num_items - i - 1
             for j in range(i + 1, num_items):
-                itemJ = itemSets[j]
-                tidSetJ = tidSets[j]
-                common_tids = list(set(tidSetX).intersection(tidSetJ))
-                val = self.getPeriodicSupport(common_tids)
-                if val >= self._convert_support_period(self._minPS):
-                    classItemSets.append(itemJ)
-                    classTidSets.append(common_tids)
-
-            newprefix = sorted(prefix + itemSetX)
-            self._generation(newprefix, classItemSets, classTidSets)
-            self._save(prefix, itemSetX, tidSetX)
+                diffSet = difference(diffSets[j], diffSetX)
+                val = diffset_support(tidSetX, supports[i], diffSet, period)
+                if val >= minPS:
+                    classItemSets.append(itemSets[j])
+                    classDiffSets.append(diffSet)
+                    classSupports.append(val)
+
+            self._generation_diffset(sorted(prefix + [itemI]), tidSetX, classItemSets, classDiffSets, classSupports)
+            self._save(prefix, [itemI], tidSetX, supports[i])
+
+    def _mine_class(self, i):
+        if self._maxLength is not None and self._maxLength < 2:
+            return
+        plist = self._plist
+        vertical = self._vertical
+        itemI = plist[i]
+        tidSetX = vertical[itemI]
+        itemSetX = [itemI]
+        itemSets, tidSets, supports, buffer = self._level(0)
+        del itemSets[:], tidSets[:], supports[:]
+        buffer.reset()
+        self._counters['candidates'] += len(plist) - i - 1
+        tidSetsJ = [vertical[itemJ] for itemJ in plist]
+        # Support của item đơn tính cả timestamp trùng nên không làm cận trên được; dùng |t(X) ∩ t(J)| - 1
+        candidates = [j for j in range(i + 1, len(plist)) if min(len(tidSetX), len(tidSetsJ[j])) - 1 >= self._minPSValue]
+        self._counters['skipped'] += len(plist) - i - 1 - len(candidates)
+        self._extend_class(tidSetX, plist, tidSetsJ, candidates, buffer, itemSets, tidSets, supports)
+        self._counters['allocations'] += buffer.allocations
+        buffer.allocations = 0
+
+        self._generation(itemSetX, itemSets, tidSets, supports)
+
+    def _attach_shared(self, arrays):
+        # Chạy trong tiến trình con: arrays[0] là các timestamp, tiếp theo là tid-list đã sắp xếp của từng item trong _plist
+        if self._tidlist is not None or self._diffset:
+            self._universe = TidUniverse(arrays[0])
+        if self._tidlist is None:
+            self._vertical = {item: a.tolist() for item, a in zip(self._plist, arrays[1:])}
+        else:
+            self._vertical = {item: make_tidlist(self._tidlist, self._universe, a, self._density) for item, a in zip(self._plist, arrays[1:])}
 
     def startMine(self, iFile, stats_output_file, patterns_output_file):
+        self._profiler.start()
         self._current_file = iFile
         self._finalPatterns = {}
         self._startTime = time.time()
-        self._creatingItemSets(iFile)
-        stats = self._calculate_database_stats(stats_output_file)
-        self._plot_database_stats() # Lưu biểu đồ thống kê vào file
-        return stats, self._mine_patterns(iFile, patterns_output_file)
+        with self._profiler.phase('load'):
+            self._creatingItemSets(iFile)
+        with self._profiler.phase('stats'):
+            stats = self._calculate_database_stats(stats_output_file)
+        result = self._mine_patterns(iFile, patterns_output_file)
+        self._profiler.stop(self._counters)
+        return stats, result
+
+    def sweep(self, iFile, minPS_list, period_list):
+        # Khai thác một lần ở ngưỡng lỏng nhất (minPS nhỏ nhất, period lớn nhất): support không tăng khi thêm item
+        # và không giảm khi period tăng nên kết quả chứa mọi mẫu của từng điểm (minPS, period) trong lưới
+        if self._topK is not None:
+            raise ValueError("sweep không hỗ trợ chế độ topK")
+        self._profiler.start()
+        self._current_file = iFile
+        self._finalPatterns = {}
+        start_time = time.time()
+        with self._profiler.phase('load'):
+            self._creatingItemSets(iFile)
+        minPS_values = [self._convert_support_period(v) for v in minPS_list]
+        period_values = [self._convert_support_period(v) for v in period_list]
+        minPS, period = self._minPS, self._period
+        self._minPS, self._period = min(minPS_values), max(period_values)
+        self._sweepPeriods = np.array(sorted(set(period_values)), dtype=np.int64)
+        self._gapHistograms = {}
+        try:
+            self._mine()
+            table = build_table(self._Database, self._finalPatterns, self._gapHistograms, self._sweepPeriods)
+        finally:
+            self._sweepPeriods = None
+            self._gapHistograms = {}
+        mine_time = time.time() - start_time
+        self._memoryUSS, self._memoryRSS = memory_usage()
+        self._memoryPeakRSS = peak_rss()
+        self._profiler.stop(self._counters)
+        memory_uss, memory_rss = self._memoryUSS / (1024 * 1024), self._memoryRSS / (1024 * 1024)
+
+        results = []
+        for minPS_raw, minPS_value in zip(minPS_list, minPS_values):
+            for period_raw, period_value in zip(period_list, period_values):
+                point_start = time.time()
+                patterns = table.query(minPS_value, period_value)
+                execution_time = mine_time + time.time() - point_start
+                self._minPS, self._period = minPS_raw, period_raw
+                results.append({
+                    'minPS': minPS_raw,
+                    'period': period_raw,
+                    'patterns': patterns,
+                    'num_patterns': len(patterns),
+                    'execution_time': execution_time,
+                    'memory_uss': memory_uss,
+                    'memory_rss': memory_rss,
+                    'memory_peak_rss': self._memoryPeakRSS / (1024 * 1024),
+                    'stats': self._calculate_database_stats(None),
+                })
+        self._minPS, self._period = minPS, period
+        print(f"Đã trả lời {len(results)} điểm (minPS, period) từ {len(self._finalPatterns)} mẫu của một lần khai thác")
+        return results
+
+    def _push_top(self, pattern, support):
+        # Giữ k mẫu có support lớn nhất; khi heap đầy, minPS được nâng lên để cắt tỉa các nhánh không thể vào top-k
+        self._topCount += 1
+        entry = (support, -self._topCount, pattern)
+        if len(self._topHeap) < self._topK:
+            heapq.heappush(self._topHeap, entry)
+        else:
+            heapq.heapreplace(self._topHeap, entry)
+        if len(self._topHeap) == self._topK:
+            self._minPSValue = max(self._minPSValue, self._topHeap[0][0] + 1)
+
+    def _finish_top(self):
+        # Kết quả top-k theo support giảm dần; cùng support thì mẫu tìm thấy trước đứng trước
+        patterns = {pattern: support for support, _, pattern in sorted(self._topHeap, reverse=True)}
+        self._topHeap = []
+        self._topCount = 0
+        self._collect(patterns)
+
+    def _best_first(self, itemSets, tidSets, supports):
+        order = sorted(range(len(supports)), key=supports.__getitem__, reverse=True)
+        return [itemSets[k] for k in order], [tidSets[k] for k in order], [supports[k] for k in order]
+
+    def _collect(self, patterns):
+        # Gộp kết quả của một lớp do tiến trình con trả về, giữ thứ tự theo lớp
+        if self._activeSink is None:
+            self._finalPatterns.update(patterns)
+        else:
+            for pattern, support in patterns.items():
+                self._activeSink.emit(self._decode(pattern), support)
+
+    def _decode(self, pattern):
+        # Mẫu trong lúc khai thác là bộ số nguyên; đổi về nhãn gốc (sắp xếp theo nhãn) khi xuất
+        labels = self._itemLabels
+        return tuple(sorted([labels[k] for k in pattern]))
+
+    def _decode_results(self):
+        self._finalPatterns = {self._decode(pattern): support for pattern, support in self._finalPatterns.items()}
+        if self._gapHistograms:
+            self._gapHistograms = {self._decode(pattern): h for pattern, h in self._gapHistograms.items()}
+
+    def _mine(self):
+        with self._profiler.phase('one_itemset'):
+            plist = self._creatingOneitemSets()
+            vertical = self._tidList
+            if self._tidlist is not None or self._diffset:
+                self._universe = TidUniverse(self._Database.timestamps)
+            if self._tidlist is not None:
+                vertical = {item: make_tidlist(self._tidlist, self._universe, self._tidList[item], self._density) for item in plist}
+            self._plist = plist
+            self._vertical = vertical
+            self._counters = dict.fromkeys(self._counters, 0)
+            self._counters['max_depth'] = 1 if plist else 0
+        print("Đang khai thác mẫu")
+        with self._profiler.phase('generation'):
+            if self._topK is not None:
+                # topK: lưu các item đơn trước để ngưỡng tăng ngay từ đầu, bỏ qua lớp của item đã dưới ngưỡng
+                supports = [self.getPeriodicSupport(self._tidList[item]) for item in plist]
+                for item, support in zip(plist, supports):
+                    self._save(None, [item], self._tidList[item], support)
+                for i in range(len(plist)):
+                    if supports[i] >= self._minPSValue:
+                        self._mine_class(i)
+                self._finish_top()
+            elif self._workers > 1 and len(plist) > 1:
+                universe = self._universe.timestamps if self._universe is not None else np.empty(0, dtype=np.int64)
+                arrays = [universe] + [np.sort(np.asarray(self._tidList[item], dtype=np.int64)) for item in plist]
+                costs = [len(self._tidList[plist[i]]) * (len(plist) - 1 - i) for i in range(len(plist))]
+                results = mine_classes(self, arrays, costs, self._workers)
+                for i in range(len(plist)):
+                    patterns, histograms, counters = results[i]
+                    self._collect(patterns)
+                    self._gapHistograms.update(histograms)
+                    merge_counters(self._counters, counters)
+                    self._save(None, [plist[i]], self._tidList[plist[i]])
+            else:
+                for i in range(len(plist)):
+                    self._mine_class(i)
+                    self._save(None, [plist[i]], self._tidList[plist[i]])
+            self._vertical = {}
+            self._levels = []
+            self._decode_results()
+        print(f"Ứng viên: {self._counters['candidates']}, phép giao tid-list: {self._counters['intersections']}, "
+              f"bỏ qua nhờ cận trên: {self._counters['skipped']}, dừng sớm: {self._counters['aborted']}, "
+              f"độ dài mẫu lớn nhất: {self._counters['max_depth']}, tid-list cấp mới: {self._counters['allocations']}")
+
+    def _open_sink(self, iFile, patterns_output_file):
+        if self._sink is None:
+            return None
+        sink = make_sink(self._sink, patterns_output_file)
+        sink.open(os.path.basename(iFile))
+        return sink
+
+    def _close_sink(self, iFile, patterns_output_file):
+        # Không có sink: ghi _finalPatterns ra file như trước; có sink: mẫu đã được ghi trong lúc khai thác
+        sink, self._activeSink = self._activeSink, None
+        if sink is None:
+            with open(patterns_output_file, "w", encoding="utf-8") as f:
+                f.write(f"--- Mẫu Tuần Hoàn Cục Bộ từ {os.path.basename(iFile)} ---\n")
+                for pattern, support in self._finalPatterns.items():
+                    f.write(f"{pattern}: {support}\n")
+                f.write("-------------------------------------------------------\n")
+            print(f"Đã ghi nhận {len(self._finalPatterns)} mẫu tuần hoàn vào file: {patterns_output_file}")
+            return self._finalPatterns
+        sink.close()
+        target = f"file: {sink.path}" if sink.path else "bộ đếm"
+        print(f"Đã ghi nhận {len(sink)} mẫu tuần hoàn vào {target}")
+        return sink
 
     def _mine_patterns(self, iFile, patterns_output_file):
         self._finalPatterns = {}
-        plist = self._creatingOneitemSets()
-        print("Đang khai thác mẫu")
-        for i in range(len(plist)):
-            itemI = plist[i]
-            tidSetX = self._tidList[itemI]
-            itemSetX = [itemI]
-            itemSets = []
-            tidSets = []
-            for j in range(i + 1, len(plist)):
-                itemJ = plist[j]
-                # print(f"ItemI: {itemI}, ItemJ: {itemJ}")
-                tidSetJ = self._tidList[itemJ]
-                common_tids = list(set(tidSetX).intersection(tidSetJ))
-                val = self.getPeriodicSupport(common_tids)
-                # print(f"Support of {[itemJ]}: {val}")
-                if val >= self._convert_support_period(self._minPS):
-                    itemSets.append(itemJ)
-                    tidSets.append(common_tids)
-
-            self._generation(itemSetX, itemSets, tidSets)
-            self._save(None, itemSetX, tidSetX)
+        self._activeSink = self._open_sink(iFile, patterns_output_file)
+        self._mine()
         print("Kết thúc khai thác mẫu")
         self._endTime = time.time()
-        process = psutil.Process(os.getpid())
-        self._memoryUSS = process.memory_full_info().uss
-        self._memoryRSS = process.memory_info().rss
+        self._memoryUSS, self._memoryRSS = memory_usage()
+        self._memoryPeakRSS = peak_rss()
+        print(f"Bộ nhớ đỉnh (peak RSS): {self._memoryPeakRSS / (1024 * 1024):.2f} MB")
 
-        with open(patterns_output_file, "w", encoding="utf-8") as f:
-            f.write(f"--- Mẫu Tuần Hoàn Cục Bộ từ {os.path.basename(iFile)} ---\n")
-            for pattern, support in self._finalPatterns.items():
-                f.write(f"{pattern}: {support}\n")
-            f.write("-------------------------------------------------------\n")
-        print(f"Đã ghi nhận {len(self._finalPatterns)} mẫu tuần hoàn vào file: {patterns_output_file}")
+        with self._profiler.phase('output'):
+            found = self._close_sink(iFile, patterns_output_file)
 
-        # Vẽ và lưu biểu đồ mẫu tuần hoàn
-        output_dir = "output"
-        file_name = os.path.basename(iFile)
-        patterns_plot_file = os.path.join(output_dir, f"{os.path.splitext(file_name)[0]}_patterns_plot.png")
-        self._plot_periodic_patterns(self._finalPatterns, patterns_plot_file)
-
-        return len(self._finalPatterns), self._endTime - self._startTime, self._memoryUSS / (1024 * 1024), self._memoryRSS / (1024 * 1024)
+        # Thời gian khai thác = load + one_itemset + generation, cùng phạm vi với ThreePEclatPruning
+        return len(found), self._profiler.elapsed(), self._memoryUSS / (1024 * 1024), self._memoryRSS / (1024 * 1024)
 
     def get_final_patterns(self):
         return self._finalPatterns
 
     def get_execution_time(self):
-        return self._endTime - self._startTime
+        return self._profiler.elapsed()
 
     def get_memory_usage_uss(self):
         return self._memoryUSS
@@ -375,6 +627,27 @@ class ThreePEclat:
     def get_memory_usage_rss(self):
         return self._memoryRSS
 
+    def get_memory_peak_rss(self):
+        return self._memoryPeakRSS
+
+    def get_pattern_store(self):
+        # Kết quả dạng truy vấn được: chỉ mục ngược item -> mẫu, cây tiền tố, lọc theo support; lưu bằng save(path)
+        return PatternStore.from_patterns(self._finalPatterns, {
+            'source': os.path.basename(self._current_file) if self._current_file else None,
+            'minPS': self._minPS, 'period': self._period,
+        })
+
+    def get_database_summary(self):
+        # Dữ liệu cho biểu đồ thống kê CSDL; việc vẽ nằm ở report.py, chạy sau khi khai thác
+        return dict(self._Database.summary(), dataset=os.path.basename(self._current_file))
+
+    def get_intersection_stats(self):
+        return dict(self._counters)
+
+    def get_profile(self):
+        # Thời gian từng pha, bộ nhớ đỉnh (RSS / USS lấy mẫu nền, tracemalloc nếu bật) và các bộ đếm của lần chạy gần nhất
+        return self._profiler.report()
+
 if __name__ == '__main__':
     # Tạo thư mục output nếu chưa tồn tại
     output_dir = "output"
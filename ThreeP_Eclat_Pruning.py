@@ -1,31 +1,100 @@
 import pandas as pd
 import time
-import psutil
 import os
 from urllib.request import urlopen as _urlopen
 import validators as _validators
-import matplotlib.pyplot as plt
-from collections import Counter
 import numpy as np
+import heapq
 import array
+from tidlist import PackedTidList, TidBuffer, TidList, TidUniverse, batchable, intersect_class, make_tidlist, CLASS_BATCH_MIN, TIDLIST_BACKENDS, BITSET_DENSITY
+from diffset import difference, diffset_support, DIFFSET_DENSITY
+from profiling import Profiler, memory_usage, merge_counters, peak_rss
+from support import periodic_support
+from parallel import mine_classes
+from loader import TransactionData, VerticalData, length_stats, read_transactions
+from dbcache import read_cached
+from sweep import build_table, gap_histogram, sorted_timestamps
+from sinks import PatternSink, SINK_TYPES, make_sink
+from closure import ClosedIndex, MaximalIndex
+from ordering import ITEM_ORDERS, order_by_stats, order_items
+from outofcore import MEMORY_LIMIT, read_store
+from results import PatternStore
 
 class ThreePEclatPruning:
-    def __init__(self, minPS, period, sep='\t'):
+    def __init__(self, minPS, period, sep='\t', tidlist='auto', density=BITSET_DENSITY, diffset=False, diffset_density=DIFFSET_DENSITY, workers=1, cache=False, sink=None, topK=None, closed=False, maximal=False, order=ITEM_ORDERS[0], trace_memory=False, maxLength=None, out_of_core=False, memory_limit=MEMORY_LIMIT):
+        if tidlist not in TIDLIST_BACKENDS:
+            raise ValueError(f"Kiểu tid-list không được hỗ trợ: {tidlist}")
+        if sink is not None and not isinstance(sink, PatternSink) and sink not in SINK_TYPES:
+            raise ValueError(f"Kiểu sink không được hỗ trợ: {sink}")
+        if topK is not None and (not isinstance(topK, int) or topK <= 0):
+            raise ValueError("topK phải là số nguyên dương")
+        if (closed or maximal) and topK is not None:
+            raise ValueError("Chế độ closed / maximal không dùng cùng topK")
+        if maxLength is not None and (not isinstance(maxLength, int) or maxLength <= 0):
+            raise ValueError("maxLength phải là số nguyên dương")
+        if (closed or maximal) and maxLength is not None:
+            raise ValueError("Chế độ closed / maximal không dùng cùng maxLength")
+        if out_of_core and (workers > 1 or topK is not None or closed or maximal or diffset):
+            raise ValueError("Chế độ out-of-core không dùng cùng workers / topK / closed / maximal / diffset")
+        if order not in ITEM_ORDERS:
+            raise ValueError(f"Thứ tự item không được hỗ trợ: {order}")
         self._minPS = minPS
         self._period = period
         self._sep = sep
-        self._Database = []
+        self._tidlist = tidlist
+        self._density = density
+        self._diffset = diffset
+        self._diffset_density = diffset_density
+        self._workers = workers
+        self._cache = cache
+        self._sink = sink
+        self._activeSink = None
+        self._topK = topK
+        self._topHeap = []
+        self._topCount = 0
+        # Độ dài tối đa của mẫu (None: không giới hạn); lớp con chỉ được sinh khi mẫu hiện tại ngắn hơn
+        self._maxLength = maxLength
+        # Danh sách item / tid-list / support và TidBuffer của lớp ở từng độ sâu, dùng lại khi duyệt theo chiều sâu
+        self._levels = []
+        # out_of_core: CSDL được sắp xếp ngoài thành các partition trên đĩa (cạnh file dữ liệu, hoặc trong thư mục
+        # out_of_core nếu là chuỗi) và tid-list chỉ được nạp khi khai thác lớp cần đến; memory_limit (MB) giới hạn
+        # lượng dữ liệu mỗi bước đưa vào bộ nhớ. _storeItems[id] là item của CSDL trên đĩa ứng với item id khi khai thác
+        self._outOfCore = out_of_core
+        self._memoryLimit = memory_limit
+        self._storeItems = None
+        self._storeSupports = None
+        # closed / maximal: chỉ xuất mẫu đóng (không có tập cha cùng tid-list) hoặc mẫu cực đại
+        self._closed = closed
+        self._maximal = maximal
+        self._closedIndex = None
+        self._maximalIndex = None
+        self._singleSupports = {}
+        self._universe = None
+        # Thứ tự duyệt item; trong lúc khai thác item là số nguyên 0..n-1 theo thứ tự này, _itemLabels[id] là nhãn gốc
+        self._order = order
+        self._itemLabels = []
+        self._plist = []
+        self._initialClass = None
+        self._Database = VerticalData.empty()
+        self._periodValue = self._convert_support_period(period)
+        self._minPSValue = self._convert_support_period(minPS)
         self._finalPatterns = {}
         self._startTime = 0
         self._endTime = 0
         self._memoryUSS = 0
         self._memoryRSS = 0
+        self._memoryPeakRSS = 0
         self._tidList = {}
         self._lno = 0
-        self._item_frequencies = {}
-        self._transaction_lengths = []
-        self._timestamps = []
         self._current_file = None
+        # Chỉ dùng khi sweep: các period của lưới và histogram khoảng cách của từng mẫu
+        self._sweepPeriods = None
+        self._gapHistograms = {}
+        # Số phép giao đã thực hiện, bị bỏ qua nhờ cận trên của support, bị dừng sớm giữa chừng;
+        # số ứng viên được xét, độ dài lớn nhất của mẫu trong các lớp đã duyệt và số mảng tid-list phải cấp mới
+        self._counters = dict.fromkeys(('intersections', 'skipped', 'aborted', 'candidates', 'max_depth', 'allocations'), 0)
+        # Thời gian từng pha và bộ nhớ đỉnh của lần chạy gần nhất; trace_memory bật thêm tracemalloc
+        self._profiler = Profiler(trace_memory)
 
     def _convert_support_period(self, value):
         if isinstance(value, int):
@@ -43,13 +112,20 @@ class ThreePEclatPruning:
         return value
 
     def _creatingItemSets(self, iFile):
-        self._Database = []
+        self._Database = VerticalData.empty()
         self._lno = 0
-        all_items = []
-        self._transaction_lengths = []
-        self._timestamps = []
 
-        if isinstance(iFile, pd.DataFrame):
+        if self._outOfCore:
+            if not isinstance(iFile, str) or _validators.url(iFile):
+                raise ValueError("Chế độ out-of-core chỉ đọc từ file trên đĩa")
+            root = self._outOfCore if isinstance(self._outOfCore, str) else None
+            try:
+                self._Database = read_store(iFile, self._sep, root, self._memoryLimit)
+            except IOError:
+                print(f"Không tìm thấy file: {iFile}")
+                quit()
+            self._lno = self._Database.num_lines
+        elif isinstance(iFile, pd.DataFrame):
             data, tids = [], []
             if iFile.empty:
                 print(f"DataFrame đầu vào rỗng.")
@@ -59,70 +135,45 @@ class ThreePEclatPruning:
                 tids = iFile['TS'].tolist()
             if 'Transactions' in cols:
                 data = iFile['Transactions'].tolist()
-            for i in range(len(data)):
-                transaction = data[i]
-                tr = [tids[i]] + transaction
-                self._Database.append(tr)
-                all_items.extend(transaction)
-                self._transaction_lengths.append(len(transaction))
-                self._timestamps.append(tids[i])
+            self._Database = TransactionData.from_rows(tids, data)
             self._lno = len(self._Database)
         elif isinstance(iFile, str):
-            def process_line(line):
-                line = line.strip()
-                temp = [i.strip() for i in line.split(self._sep) if i.strip()]
-                if temp:
-                    timestamp_str = temp[0]
-                    items = temp[1:]
-                    try:
-                        timestamp = int(timestamp_str)
-                        transaction = [timestamp] + items
-                        self._Database.append(transaction)
-                        all_items.extend(items)
-                        self._transaction_lengths.append(len(items))
-                        self._timestamps.append(timestamp)
-                    except ValueError:
-                        print(f"Cảnh báo: Không thể chuyển đổi timestamp '{timestamp_str}' thành số trong dòng: {line}")
-
             if _validators.url(iFile):
                 try:
                     with _urlopen(iFile) as f:
-                        for line_bytes in f:
-                            line = line_bytes.decode("utf-8")
-                            self._lno += 1
-                            process_line(line)
+                        self._Database, self._lno = read_transactions(f, self._sep)
                 except Exception as e:
                     print(f"Lỗi khi đọc dữ liệu từ URL: {e}")
                     quit()
             else:
                 try:
-                    with open(iFile, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            self._lno += 1
-                            process_line(line)
+                    if self._cache:
+                        self._Database, self._lno = read_cached(iFile, self._sep)
+                    else:
+                        with open(iFile, 'r', encoding='utf-8') as f:
+                            self._Database, self._lno = read_transactions(f, self._sep)
                 except IOError:
                     print(f"Không tìm thấy file: {iFile}")
                     quit()
         else:
             raise ValueError("Định dạng đầu vào không được hỗ trợ.")
 
-        self._item_frequencies = Counter(all_items)
+        # Bỏ dạng ngang ngay khi có dạng dọc: khai thác và thống kê chỉ cần tid-list dọc cùng histogram độ dài giao dịch
+        if isinstance(self._Database, TransactionData):
+            self._Database = self._Database.compact()
         print(f"Đã đọc {self._lno} giao dịch từ nguồn.")
 
     def _calculate_database_stats(self, output_file, num_patterns, execution_time, memory_uss, memory_rss):
         num_transactions = len(self._Database)
-        num_items = len(self._item_frequencies)
-        min_transaction_size = min(self._transaction_lengths) if self._transaction_lengths else 0
-        max_transaction_size = max(self._transaction_lengths) if self._transaction_lengths else 0
-        avg_transaction_size = np.mean(self._transaction_lengths) if self._transaction_lengths else 0
-        std_dev_transaction_size = np.std(self._transaction_lengths) if self._transaction_lengths else 0
-        variance_transaction_size = np.var(self._transaction_lengths) if self._transaction_lengths else 0
+        num_items = len(self._Database.labels)
+        (min_transaction_size, max_transaction_size, avg_transaction_size,
+         std_dev_transaction_size, variance_transaction_size) = length_stats(self._Database.length_counts)
 
         min_period = self._period
         max_period = self._period
         avg_period = self._period
 
-        total_item_occurrences = sum(self._item_frequencies.values())
+        total_item_occurrences = int(self._Database.item_frequencies().sum())
         sparsity = 1 - (total_item_occurrences / (num_transactions * num_items)) if num_transactions * num_items > 0 else 0
 
         output = f"--- Thống kê Cơ Sở Dữ Liệu ---\n"
@@ -144,221 +195,631 @@ class ThreePEclatPruning:
         output += f"Thời gian thực thi: {execution_time:.4f} giây\n"
         output += f"Bộ nhớ sử dụng (USS): {memory_uss:.2f} MB\n"
         output += f"Bộ nhớ sử dụng (RSS): {memory_rss:.2f} MB\n"
+        output += f"Bộ nhớ đỉnh (peak RSS): {self._memoryPeakRSS / (1024 * 1024):.2f} MB\n"
         output += "-----------------------------\n"
         return output
 
-    def _plot_database_stats(self):
-        if not self._Database:
-            print("Không có dữ liệu để vẽ biểu đồ.")
-            return
-
-        output_dir = "output"
-        file_name = os.path.basename(self._current_file)
-        plot_file_prefix = os.path.join(output_dir, f"{os.path.splitext(file_name)[0]}_stats_plot")
-
-        plt.figure(figsize=(15, 10))
-
-        # Biểu đồ tần suất item phổ biến
-        top_n = 20
-        most_common_items = self._item_frequencies.most_common(top_n)
-        item_names = [item[0] for item in most_common_items]
-        frequencies = [item[1] for item in most_common_items]
-
-        plt.subplot(2, 2, 1)
-        plt.bar(item_names, frequencies)
-        plt.xlabel('Item')
-        plt.ylabel('Tần suất')
-        plt.title(f'Top {top_n} Item Phổ Biến Nhất')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-
-        # Biểu đồ phân phối độ dài giao dịch
-        plt.subplot(2, 2, 2)
-        plt.hist(self._transaction_lengths, bins=20, edgecolor='black')
-        plt.xlabel('Độ dài giao dịch')
-        plt.ylabel('Số lượng giao dịch')
-        plt.title('Phân Phối Độ Dài Giao Dịch')
-        plt.tight_layout()
-
-        # Biểu đồ đường tần suất theo số lượng item
-        item_value_counts = Counter(self._item_frequencies.values())
-        sorted_item_counts = sorted(item_value_counts.items())
-        frequencies = [count for count, freq in sorted_item_counts]
-        no_of_items = [freq for count, freq in sorted_item_counts]
-
-        plt.subplot(2, 2, 3)
-        plt.plot(no_of_items, frequencies, marker='o', linestyle='-')
-        plt.xlabel('Số lượng item')
-        plt.ylabel('Tần suất')
-        plt.title('Tần Suất theo Số Lượng Item')
-        plt.grid(True)
-        plt.tight_layout()
-
-        # Biểu đồ đường tần suất theo độ dài giao dịch
-        transaction_length_counts = Counter(self._transaction_lengths)
-        sorted_transaction_lengths = sorted(transaction_length_counts.items())
-        transaction_lengths = [length for length, freq in sorted_transaction_lengths]
-        frequencies = [freq for length, freq in sorted_transaction_lengths]
-
-        plt.subplot(2, 2, 4)
-        plt.plot(transaction_lengths, frequencies, marker='o', linestyle='-')
-        plt.xlabel('Độ dài giao dịch')
-        plt.ylabel('Tần suất')
-        plt.title('Tần Suất theo Độ Dài Giao Dịch')
-        plt.grid(True)
-        plt.tight_layout()
-
-        plot_file_name = f"{plot_file_prefix}.png"
-        plt.savefig(plot_file_name)
-        plt.close()
-        print(f"Đã lưu biểu đồ thống kê vào file: {plot_file_name}")
-
-    def _plot_periodic_patterns(self, patterns, output_path):
-        if not patterns:
-            print("Không có mẫu tuần hoàn nào để vẽ biểu đồ.")
-            return
-
-        pattern_lengths = [len(pattern) for pattern in patterns.keys()]
-        supports = list(patterns.values())
-
-        plt.figure(figsize=(10, 6))
-        plt.plot(pattern_lengths, supports, marker='o', linestyle='-')
-        plt.xlabel('Độ dài mẫu tuần hoàn')
-        plt.ylabel('Periodic Support')
-        plt.title('Biểu đồ Periodic Support theo Độ dài Mẫu')
-        plt.grid(True)
-        plt.tight_layout()
-
-        plt.savefig(output_path)
-        plt.close()
-        print(f"Đã lưu biểu đồ mẫu tuần hoàn vào file: {output_path}")
-
     def _creatingOneitemSets(self):
-        tid_lists = {}
-        _mapSupport = {}
-        period = self._convert_support_period(self._period)
-        for line in self._Database:
-            if not line:
-                continue
-            try:
-                n = int(line[0])
-                for i in range(1, len(line)):
-                    si = line[i]
-                    if si not in _mapSupport:
-                        _mapSupport[si] = [0, n]
-                        tid_lists[si] = [n]
-                    else:
-                        lp = n - _mapSupport[si][1]
-                        if lp <= period:
-                            _mapSupport[si][0] += 1
-                        _mapSupport[si][1] = n
-                        tid_lists[si].append(n)
-            except ValueError:
-                print(f"Cảnh báo: Lỗi định dạng timestamp trong giao dịch: {line}")
-                continue
-
-        minPS = self._convert_support_period(self._minPS)
-        self._tidList = {k: np.array(v, dtype=np.int32) for k, v in tid_lists.items() if _mapSupport[k][0] >= minPS}
-        plist = sorted(self._tidList.keys(), key=lambda k: _mapSupport[k][0], reverse=True)
-        return plist
+        self._tidList = {}
+        # Ngưỡng chỉ phụ thuộc kích thước CSDL nên quy đổi một lần cho cả lần khai thác
+        self._periodValue = self._convert_support_period(self._period)
+        self._minPSValue = self._convert_support_period(self._minPS)
+        self._itemLabels = []
+        if not len(self._Database):
+            return []
+        labels = self._Database.labels
+        if self._outOfCore:
+            # Support tính trong một lượt đọc các partition; tid-list không được giữ lại
+            store = self._Database
+            file_supports, supports, unique_supports = store.single_supports(self._periodValue)
+            frequent = order_by_stats(np.flatnonzero(file_supports >= self._minPSValue), file_supports, store.counts,
+                                      store.first, store.last, self._order)
+            self._itemLabels = [labels[k] for k in frequent]
+            self._storeItems = frequent
+            self._storeSupports = (supports[frequent].tolist(), unique_supports[frequent].tolist())
+            return list(range(len(frequent)))
+        sorted_items, sorted_ts, bounds = self._Database.vertical()
+        # Support của item đơn tính theo thứ tự giao dịch trong file như cách đếm tuần tự trước đây
+        close = (sorted_items[1:] == sorted_items[:-1]) & (np.diff(sorted_ts) <= self._periodValue)
+        supports = np.bincount(sorted_items[1:][close], minlength=len(labels))
+        frequent = order_items(np.flatnonzero(supports >= self._minPSValue), supports, sorted_ts, bounds, self._order)
+        self._itemLabels = [labels[k] for k in frequent]
+        # Tid-list là view trên mảng đã sắp xếp (memmap khi nạp từ file cache), không sao chép
+        tids = self._Database.sorted_vertical()
+        self._tidList = {i: tids[bounds[k]:bounds[k + 1]] for i, k in enumerate(frequent)}
+        return list(range(len(frequent)))
 
     def getPeriodicSupport(self, timeStamps):
+        if isinstance(timeStamps, TidList):
+            return timeStamps.periodic_support(self._periodValue)
         if len(timeStamps) < 2:
             return 0
-        timeStamps_sorted = np.sort(timeStamps)
-        diffs = np.diff(timeStamps_sorted)
-        return np.sum(diffs <= self._convert_support_period(self._period))
+        return periodic_support(np.sort(timeStamps), self._periodValue)
 
-    def _save(self, prefix, suffix, tidSetX):
+    def _save(self, prefix, suffix, tidSetX, support=None):
         if prefix is None:
             pattern = tuple(suffix)
         else:
             pattern = tuple(sorted(prefix + suffix))
 
-        val = self.getPeriodicSupport(tidSetX)
-        if val >= self._convert_support_period(self._minPS):
-            self._finalPatterns[pattern] = val
+        val = self.getPeriodicSupport(tidSetX) if support is None else support
+        self._emit(pattern, tidSetX, val)
 
-    def _generation(self, prefix, itemSets, tidSets):
+    def _emit(self, pattern, tidSetX, val):
+        if val >= self._minPSValue:
+            if self._topK is not None:
+                self._push_top(pattern, val)
+            elif self._activeSink is None:
+                self._finalPatterns[pattern] = val
+            else:
+                self._activeSink.emit(self._decode(pattern), val)
+            if self._sweepPeriods is not None:
+                self._gapHistograms[pattern] = gap_histogram(sorted_timestamps(tidSetX), self._sweepPeriods)
+
+    def _level(self, depth):
+        while len(self._levels) <= depth:
+            self._levels.append(([], [], [], TidBuffer()))
+        return self._levels[depth]
+
+    def _generation(self, prefix, itemSets, tidSets, supports):
+        if self._topK is not None:
+            itemSets, tidSets, supports = self._best_first(itemSets, tidSets, supports)
+        if itemSets and len(prefix) >= self._counters['max_depth']:
+            self._counters['max_depth'] = len(prefix) + 1
+        self._search(prefix, itemSets, tidSets, supports, 0, len(itemSets))
+
+    def _search(self, prefix, itemSets, tidSets, supports, start, stop):
+        # Duyệt theo chiều sâu các nút start..stop-1 của lớp gốc bằng stack tường minh thay cho đệ quy.
+        # Lớp con ở độ sâu d được ghi vào danh sách và TidBuffer của độ sâu đó (lớp trước cùng độ sâu đã duyệt xong
+        # nên dùng lại được); path là mảng item id của mẫu hiện tại, nối thêm khi đi xuống và cắt bớt khi quay lên.
+        # Item đơn (path dài 1) đã được lưu trong _mine với tid-list gốc
+        topK = self._topK is not None
+        maxLength = self._maxLength
+        counters = self._counters
+        diffset_size = self._diffset_density * self._universe.size if self._diffset else None
+        path = list(prefix)
+        frames = [(itemSets, tidSets, supports)]
+        cursors = [start]
+        stops = [stop]
+        while frames:
+            items, tids, sups = frames[-1]
+            i = cursors[-1]
+            if i == stops[-1]:
+                frames.pop()
+                cursors.pop()
+                stops.pop()
+                if frames:
+                    # Quay lên: lớp con đã duyệt xong, lưu nút cha sau các nút con như bản đệ quy
+                    items, tids, sups = frames[-1]
+                    i = cursors[-1] - 1
+                    if not topK and len(path) > 1:
+                        self._emit(tuple(path), tids[i], sups[i])
+                    path.pop()
+                continue
+            cursors[-1] = i + 1
+            # minPS có thể đã được nâng lên (topK) sau khi lớp được tạo
+            if items[i] is None or sups[i] < self._minPSValue:
+                continue
+            tidSetX = tids[i]
+            path.append(items[i])
+            if topK and len(path) > 1:
+                # topK: lưu nút trước các nút con để ngưỡng tăng sớm; lớp đã bị sắp lại nên cần sắp xếp item
+                self._emit(tuple(sorted(path)), tidSetX, sups[i])
+            if maxLength is None or len(path) < maxLength:
+                if diffset_size is not None and len(tidSetX) >= diffset_size:
+                    self._switch_to_diffset(sorted(path), tidSetX, sups[i], items[i + 1:], tids[i + 1:])
+                else:
+                    classItemSets, classTidSets, classSupports, buffer = self._level(len(frames))
+                    del classItemSets[:], classTidSets[:], classSupports[:]
+                    buffer.reset()
+                    counters['candidates'] += len(items) - i - 1
+                    # support(XJ) <= support(J) (support không tăng khi thêm item) <= |t(J)| - 1
+                    candidates = [j for j in range(i + 1, len(items)) if sups[j] >= self._minPSValue]
+                    counters['skipped'] += len(items) - i - 1 - len(candidates)
+                    self._extend_class(tidSetX, items, tids, candidates, buffer, classItemSets, classTidSets, classSupports)
+                    counters['allocations'] += buffer.allocations
+                    buffer.allocations = 0
+                    if classItemSets:
+                        if topK:
+                            classItemSets[:], classTidSets[:], classSupports[:] = self._best_first(classItemSets, classTidSets, classSupports)
+                        if len(path) >= counters['max_depth']:
+                            counters['max_depth'] = len(path) + 1
+                        frames.append((classItemSets, classTidSets, classSupports))
+                        cursors.append(0)
+                        stops.append(len(classItemSets))
+                        continue
+            # Không có lớp con (rỗng, đã duyệt bằng diffset hoặc đã đạt maxLength): lưu nút ngay
+            if not topK and len(path) > 1:
+                self._emit(tuple(path), tidSetX, sups[i])
+            path.pop()
+
+    def _extend_class(self, tidSetX, itemSets, tidSets, candidates, buffer, classItemSets, classTidSets, classSupports):
+        # Giao X với các ứng viên: những tid-list cùng kiểu array / bitset với X được giao và tính support cùng lúc
+        # cho cả lớp (intersect_class), số còn lại giao từng cặp. Lớp con giữ đúng thứ tự của candidates
+        period = self._periodValue
+        minPS = self._minPSValue
+        counters = self._counters
+        together = [batchable(tidSetX, tidSets[j]) for j in candidates]
+        batch = [tidSets[j] for j, flag in zip(candidates, together) if flag]
+        if len(batch) >= CLASS_BATCH_MIN:
+            batched = iter(intersect_class(tidSetX, batch, period, minPS, buffer))
+        else:
+            together = [False] * len(candidates)
+        counters['intersections'] += len(candidates)
+        # t(X) nén được giải nén một lần cho cả lớp thay vì một lần cho mỗi cặp
+        decoded = tidSetX.timestamps() if isinstance(tidSetX, PackedTidList) else None
+        for j, flag in zip(candidates, together):
+            if flag:
+                common_tids, val = next(batched)
+            else:
+                if decoded is None:
+                    common_tids, val = tidSetX.intersect_bounded(tidSets[j], period, minPS, buffer)
+                else:
+                    common_tids, val = tidSetX.intersect_bounded(tidSets[j], period, minPS, buffer, timestamps=decoded)
+                if common_tids is None:
+                    counters['aborted'] += 1
+                    continue
+            if common_tids is not None and val >= minPS:
+                buffer.commit()
+                classItemSets.append(itemSets[j])
+                classTidSets.append(common_tids)
+                classSupports.append(val)
+
+    def _mine_closed(self, itemSets, tidSets, supports):
+        # Khai thác mẫu đóng kiểu CHARM, chạy tuần tự vì chỉ mục mẫu đóng dùng chung cho cả cây
+        self._closedIndex = ClosedIndex()
+        self._maximalIndex = MaximalIndex() if self._maximal else None
+        members = []
+        for k in range(len(itemSets)):
+            if supports[k] >= self._minPSValue:
+                members.append(k)
+            else:
+                # Chỉ đạt ngưỡng khi giữ timestamp trùng: không có tập cha nào phổ biến nên là mẫu đóng và cực đại
+                self._save_closed([itemSets[k]], tidSets[k], supports[k], True)
+        # Support tăng dần để các item hay đi cùng nhau được gộp sớm
+        members.sort(key=lambda k: supports[k])
+        self._charm([], [[itemSets[k]] for k in members], [tidSets[k] for k in members], [supports[k] for k in members])
+        if self._maximalIndex is not None:
+            for items, support in self._maximalIndex.items():
+                self._save(None, sorted(items), None, support)
+        self._closedIndex = None
+        self._maximalIndex = None
+
+    def _charm(self, prefix, itemSets, tidSets, supports):
+        # itemSets[i] là danh sách item; so sánh tid-list của hai phần tử để gộp thay vì sinh nút không đóng:
+        # t(X) = t(Y): gộp Y vào X và bỏ Y; t(X) ⊂ t(Y): gộp Y vào X; t(X) ⊃ t(Y): bỏ Y, XY là nút con
         num_items = len(itemSets)
+        alive = [True] * num_items
         for i in range(num_items):
-            itemI = itemSets[i]
-            if itemI is None:
+            if not alive[i]:
                 continue
+            itemSetX = list(itemSets[i])
             tidSetX = tidSets[i]
-            itemSetX = [itemI]
+            lenX = len(tidSetX)
             classItemSets = []
             classTidSets = []
+            classSupports = []
             for j in range(i + 1, num_items):
-                itemJ = itemSets[j]
+                if not alive[j]:
+                    continue
                 tidSetJ = tidSets[j]
-                common_tids = np.intersect1d(tidSetX, tidSetJ)
-                val = self.getPeriodicSupport(common_tids)
-                if val >= self._convert_support_period(self._minPS):
-                    classItemSets.append(itemJ)
+                self._counters['candidates'] += 1
+                self._counters['intersections'] += 1
+                common_tids = tidSetX.intersect(tidSetJ)
+                lenXY = len(common_tids)
+                if lenXY == lenX:
+                    itemSetX.extend(itemSets[j])
+                    if lenXY == len(tidSetJ):
+                        alive[j] = False
+                    continue
+                if lenXY == len(tidSetJ):
+                    alive[j] = False
+                val = common_tids.periodic_support(self._periodValue)
+                if val >= self._minPSValue:
+                    classItemSets.append(itemSets[j])
                     classTidSets.append(common_tids)
+                    classSupports.append(val)
 
-            newprefix = sorted(prefix + itemSetX)
+            newprefix = prefix + itemSetX
+            if len(newprefix) > self._counters['max_depth']:
+                self._counters['max_depth'] = len(newprefix)
             if classItemSets:
-                self._generation(newprefix, classItemSets, classTidSets)
+                self._charm(newprefix, classItemSets, classTidSets, classSupports)
+            self._save_closed(newprefix, tidSetX, supports[i], not classItemSets)
+
+    def _save_closed(self, items, tidSetX, support, leaf):
+        if not self._closedIndex.add_if_closed(frozenset(items), tidSetX.timestamps()):
+            return
+        if len(items) == 1:
+            support = self._singleSupports[items[0]]
+        if self._maximalIndex is None:
+            self._save(None, sorted(items), tidSetX, support)
+        elif leaf:
+            # Nút có nút con phổ biến thì không cực đại
+            self._maximalIndex.add(frozenset(items), support)
+
+    def _mine_class(self, index):
+        self._search([], *self._initialClass, index, index + 1)
+
+    def _attach_shared(self, arrays):
+        # Chạy trong tiến trình con: arrays[0] là các timestamp, tiếp theo là tid-list gốc của từng item trong _plist
+        self._universe = TidUniverse(arrays[0])
+        tidSets = [make_tidlist(self._tidlist, self._universe, a, self._density) for a in arrays[1:]]
+        supports = [t.periodic_support(self._periodValue) for t in tidSets]
+        self._initialClass = (self._plist, tidSets, supports)
+
+    def _switch_to_diffset(self, prefix, tidSetX, supportX, itemSets, tidSets):
+        # Lớp con của X dày đặc: lưu d(XY) = t(X) \ t(Y) thay cho t(XY)
+        tidSetP = tidSetX.timestamps()
+        classItemSets = []
+        classDiffSets = []
+        classSupports = []
+        self._counters['candidates'] += len(itemSets)
+        for itemJ, tidSetJ in zip(itemSets, tidSets):
+            diffSet = difference(tidSetP, tidSetJ.timestamps())
+            val = diffset_support(tidSetP, supportX, diffSet, self._periodValue)
+            if val >= self._minPSValue:
+                classItemSets.append(itemJ)
+                classDiffSets.append(diffSet)
+                classSupports.append(val)
+        if classItemSets:
+            self._generation_diffset(prefix, tidSetP, classItemSets, classDiffSets, classSupports)
+
+    def _generation_diffset(self, prefix, tidSetP, itemSets, diffSets, supports):
+        # Chỉ tid-list của tiền tố được giữ đầy đủ, các phần tử của lớp chỉ giữ diffset
+        num_items = len(itemSets)
+        if num_items and len(prefix) >= self._counters['max_depth']:
+            self._counters['max_depth'] = len(prefix) + 1
+        # Nút của lớp dài len(prefix) + 1; đã đạt maxLength thì chỉ lưu, không sinh lớp con
+        expand = self._maxLength is None or len(prefix) + 1 < self._maxLength
+        for i in range(num_items):
+            itemI = itemSets[i]
+            diffSetX = diffSets[i]
+            tidSetX = difference(tidSetP, diffSetX)
+            if not expand:
+                self._save(prefix, [itemI], tidSetX, supports[i])
+                continue
+            classItemSets = []
+            classDiffSets = []
+            classSupports = []
+            self._counters['candidates'] += num_items - i - 1
+            for j in range(i + 1, num_items):
+                diffSet = difference(diffSets[j], diffSetX)
+                val = diffset_support(tidSetX, supports[i], diffSet, self._periodValue)
+                if val >= self._minPSValue:
+                    classItemSets.append(itemSets[j])
+                    classDiffSets.append(diffSet)
+                    classSupports.append(val)
 
-            actual_support = self.getPeriodicSupport(tidSetX)
-            if actual_support >= self._convert_support_period(self._minPS):
-                self._save(prefix, itemSetX, tidSetX)
+            if classItemSets:
+                self._generation_diffset(sorted(prefix + [itemI]), tidSetX, classItemSets, classDiffSets, classSupports)
+            self._save(prefix, [itemI], tidSetX, supports[i])
 
     def startMine(self, iFile, stats_output_file, patterns_output_file):
+        self._profiler.start()
         self._current_file = iFile
         self._finalPatterns = {}
         self._startTime = time.time()
-        self._creatingItemSets(iFile)
+        with self._profiler.phase('load'):
+            self._creatingItemSets(iFile)
         num_patterns, exec_time, mem_uss, mem_rss = self._mine_patterns(iFile, patterns_output_file)
-        database_stats = self._calculate_database_stats(stats_output_file, num_patterns, exec_time, mem_uss, mem_rss)
-        self._plot_database_stats() # Lưu biểu đồ thống kê vào file
+        with self._profiler.phase('stats'):
+            database_stats = self._calculate_database_stats(stats_output_file, num_patterns, exec_time, mem_uss, mem_rss)
+        self._profiler.stop(self._counters)
         return database_stats, (num_patterns, exec_time, mem_uss, mem_rss)
 
+    def sweep(self, iFile, minPS_list, period_list):
+        # Khai thác một lần ở ngưỡng lỏng nhất (minPS nhỏ nhất, period lớn nhất): support không tăng khi thêm item
+        # và không giảm khi period tăng nên kết quả chứa mọi mẫu của từng điểm (minPS, period) trong lưới
+        if self._topK is not None or self._closed or self._maximal or self._outOfCore:
+            raise ValueError("sweep không hỗ trợ chế độ topK / closed / maximal / out-of-core")
+        self._profiler.start()
+        self._current_file = iFile
+        self._finalPatterns = {}
+        start_time = time.time()
+        with self._profiler.phase('load'):
+            self._creatingItemSets(iFile)
+        minPS_values = [self._convert_support_period(v) for v in minPS_list]
+        period_values = [self._convert_support_period(v) for v in period_list]
+        minPS, period = self._minPS, self._period
+        self._minPS, self._period = min(minPS_values), max(period_values)
+        self._sweepPeriods = np.array(sorted(set(period_values)), dtype=np.int64)
+        self._gapHistograms = {}
+        try:
+            self._mine()
+            table = build_table(self._Database, self._finalPatterns, self._gapHistograms, self._sweepPeriods)
+        finally:
+            self._sweepPeriods = None
+            self._gapHistograms = {}
+        mine_time = time.time() - start_time
+        memory_uss, memory_rss = memory_usage()
+        self._memoryUSS = memory_uss / (1024 * 1024)
+        self._memoryRSS = memory_rss / (1024 * 1024)
+        self._memoryPeakRSS = peak_rss()
+        self._profiler.stop(self._counters)
+        memory_uss, memory_rss = self._memoryUSS, self._memoryRSS
+
+        results = []
+        for minPS_raw, minPS_value in zip(minPS_list, minPS_values):
+            for period_raw, period_value in zip(period_list, period_values):
+                point_start = time.time()
+                patterns = table.query(minPS_value, period_value)
+                execution_time = mine_time + time.time() - point_start
+                self._minPS, self._period = minPS_raw, period_raw
+                results.append({
+                    'minPS': minPS_raw,
+                    'period': period_raw,
+                    'patterns': patterns,
+                    'num_patterns': len(patterns),
+                    'execution_time': execution_time,
+                    'memory_uss': memory_uss,
+                    'memory_rss': memory_rss,
+                    'memory_peak_rss': self._memoryPeakRSS / (1024 * 1024),
+                    'stats': self._calculate_database_stats(None, len(patterns), execution_time, memory_uss, memory_rss),
+                })
+        self._minPS, self._period = minPS, period
+        print(f"Đã trả lời {len(results)} điểm (minPS, period) từ {len(self._finalPatterns)} mẫu của một lần khai thác")
+        return results
+
+    def _push_top(self, pattern, support):
+        # Giữ k mẫu có support lớn nhất; khi heap đầy, minPS được nâng lên để cắt tỉa các nhánh không thể vào top-k
+        self._topCount += 1
+        entry = (support, -self._topCount, pattern)
+        if len(self._topHeap) < self._topK:
+            heapq.heappush(self._topHeap, entry)
+        else:
+            heapq.heapreplace(self._topHeap, entry)
+        if len(self._topHeap) == self._topK:
+            self._minPSValue = max(self._minPSValue, self._topHeap[0][0] + 1)
+
+    def _finish_top(self):
+        # Kết quả top-k theo support giảm dần; cùng support thì mẫu tìm thấy trước đứng trước
+        patterns = {pattern: support for support, _, pattern in sorted(self._topHeap, reverse=True)}
+        self._topHeap = []
+        self._topCount = 0
+        self._collect(patterns)
+
+    def _best_first(self, itemSets, tidSets, supports):
+        order = sorted(range(len(supports)), key=supports.__getitem__, reverse=True)
+        return [itemSets[k] for k in order], [tidSets[k] for k in order], [supports[k] for k in order]
+
+    def _collect(self, patterns):
+        # Gộp kết quả của một lớp do tiến trình con trả về, giữ thứ tự theo lớp
+        if self._activeSink is None:
+            self._finalPatterns.update(patterns)
+        else:
+            for pattern, support in patterns.items():
+                self._activeSink.emit(self._decode(pattern), support)
+
+    def _decode(self, pattern):
+        # Mẫu trong lúc khai thác là bộ số nguyên; đổi về nhãn gốc (sắp xếp theo nhãn) khi xuất
+        labels = self._itemLabels
+        return tuple(sorted([labels[k] for k in pattern]))
+
+    def _decode_results(self):
+        self._finalPatterns = {self._decode(pattern): support for pattern, support in self._finalPatterns.items()}
+        if self._gapHistograms:
+            self._gapHistograms = {self._decode(pattern): h for pattern, h in self._gapHistograms.items()}
+
+    def _load_tidlist(self, item):
+        # Đọc tid-list của item (id khi khai thác) từ CSDL trên đĩa
+        timestamps = self._Database.read(self._storeItems[item])
+        return make_tidlist(self._tidlist, self._universe, timestamps, self._density)
+
+    def _load_groups(self, items):
+        # Chia items thành các nhóm có tổng số timestamp không quá một nửa memory_limit
+        budget = self._memoryLimit * (1 << 20) // 16
+        counts = self._Database.counts
+        group, size = [], 0
+        for item in items:
+            count = int(counts[self._storeItems[item]])
+            if group and size + count > budget:
+                yield group
+                group, size = [], 0
+            group.append(item)
+            size += count
+        if group:
+            yield group
+
+    def _pair_members(self, items, supports):
+        # Bước 1 của out-of-core: với mỗi khối item gốc vừa bộ nhớ, đọc lần lượt tid-list của mọi item phía sau
+        # (mỗi tid-list một lần cho cả khối) và giao với các item gốc trong khối; members[i] là các item j sau i
+        # mà {i, j} đạt minPS, theo thứ tự như lớp tiền tố khi khai thác trong bộ nhớ
+        members = {item: [] for item in items}
+        buffer = TidBuffer()
+        counters = self._counters
+        start = 0
+        for block in self._load_groups(items):
+            stop = start + len(block)
+            tidSets = [self._load_tidlist(i) for i in block]
+            for k in range(start + 1, len(items)):
+                j = items[k]
+                roots = min(stop, k) - start
+                counters['candidates'] += roots
+                # support({i, j}) <= support(j): bỏ qua mà không cần đọc tid-list của j
+                if supports[j] < self._minPSValue:
+                    counters['skipped'] += roots
+                    continue
+                tidSetJ = tidSets[k - start] if k < stop else self._load_tidlist(j)
+                found = []
+                buffer.reset()
+                self._extend_class(tidSetJ, block, tidSets, list(range(roots)), buffer, found, [], [])
+                for i in found:
+                    members[i].append(j)
+            counters['allocations'] += buffer.allocations
+            buffer.allocations = 0
+            start = stop
+        return members
+
+    def _mine_stored_class(self, itemI, members):
+        # Bước 2: chỉ nạp tid-list của item gốc và của các item tạo cặp phổ biến với nó (theo nhóm vừa bộ nhớ),
+        # dựng lớp tiền tố rồi duyệt như khi khai thác trong bộ nhớ
+        if not members or (self._maxLength is not None and self._maxLength < 2):
+            return
+        tidSetX = self._load_tidlist(itemI)
+        itemSets, tidSets, supports, buffer = self._level(0)
+        del itemSets[:], tidSets[:], supports[:]
+        buffer.reset()
+        for group in self._load_groups(members):
+            self._extend_class(tidSetX, group, [self._load_tidlist(j) for j in group], list(range(len(group))),
+                               buffer, itemSets, tidSets, supports)
+        self._counters['allocations'] += buffer.allocations
+        buffer.allocations = 0
+        self._generation([itemI], itemSets, tidSets, supports)
+
+    def _mine_out_of_core(self):
+        store = self._Database
+        with self._profiler.phase('one_itemset'):
+            plist = self._creatingOneitemSets()
+            self._universe = TidUniverse.from_sorted(store.timestamps)
+            self._singleSupports = {}
+            self._counters = dict.fromkeys(self._counters, 0)
+            actual_supports, supports = self._storeSupports if plist else ([], [])
+            initial_itemSets = []
+            print("--- Creating initial itemsets ---")
+            for itemI in plist:
+                if actual_supports[itemI] >= self._minPSValue:
+                    initial_itemSets.append(itemI)
+                    self._singleSupports[itemI] = actual_supports[itemI]
+                    self._save(None, [itemI], None, actual_supports[itemI])
+                    print(f"  Initial frequent item: {self._itemLabels[itemI]}, support: {actual_supports[itemI]}, "
+                          f"TID count: {store.counts[self._storeItems[itemI]]}")
+
+        with self._profiler.phase('generation'):
+            print("--- Starting generation ---")
+            self._plist = initial_itemSets
+            self._counters['max_depth'] = 1 if initial_itemSets else 0
+            members = self._pair_members(initial_itemSets, supports)
+            for itemI in initial_itemSets:
+                self._mine_stored_class(itemI, members[itemI])
+            self._levels = []
+            self._decode_results()
+        self._counters['io_read'] = store.bytes_read
+        self._counters['io_written'] = store.bytes_written
+        print(f"Ứng viên: {self._counters['candidates']}, phép giao tid-list: {self._counters['intersections']}, "
+              f"bỏ qua nhờ cận trên: {self._counters['skipped']}, dừng sớm: {self._counters['aborted']}, "
+              f"độ dài mẫu lớn nhất: {self._counters['max_depth']}, tid-list cấp mới: {self._counters['allocations']}")
+        print(f"Đọc từ đĩa: {store.bytes_read / (1024 * 1024):.2f} MB, ghi ra đĩa: {store.bytes_written / (1024 * 1024):.2f} MB")
+
+    def _mine(self):
+        if self._outOfCore:
+            self._mine_out_of_core()
+            return
+        with self._profiler.phase('one_itemset'):
+            plist = self._creatingOneitemSets()
+            self._universe = TidUniverse(self._Database.timestamps)
+            initial_itemSets = []
+            initial_tidSets = []
+            initial_supports = []
+            self._singleSupports = {}
+            self._counters = dict.fromkeys(self._counters, 0)
+            closure = self._closed or self._maximal
+            print("--- Creating initial itemsets ---")
+            for itemI in plist:
+                tidSetX = self._tidList[itemI]
+                actual_support = periodic_support(tidSetX, self._periodValue)
+                if actual_support >= self._minPSValue:
+                    tidList = make_tidlist(self._tidlist, self._universe, tidSetX, self._density)
+                    initial_itemSets.append(itemI)
+                    initial_tidSets.append(tidList)
+                    # Support của tid-list đã bỏ timestamp trùng, dùng cho các bước sinh ứng viên
+                    initial_supports.append(tidList.periodic_support(self._periodValue))
+                    self._singleSupports[itemI] = actual_support
+                    if not closure:
+                        self._save(None, [itemI], tidSetX, actual_support)
+                    print(f"  Initial frequent item: {self._itemLabels[itemI]}, support: {actual_support}, TID count: {len(tidSetX)}")
+
+        with self._profiler.phase('generation'):
+            print("--- Starting generation ---")
+            self._plist = initial_itemSets
+            self._counters['max_depth'] = 1 if initial_itemSets else 0
+            self._initialClass = (initial_itemSets, initial_tidSets, initial_supports)
+            if closure:
+                self._mine_closed(initial_itemSets, initial_tidSets, initial_supports)
+            elif self._workers > 1 and len(initial_itemSets) > 1 and self._topK is None:
+                arrays = [self._universe.timestamps] + [self._tidList[item] for item in initial_itemSets]
+                num_items = len(initial_itemSets)
+                costs = [len(initial_tidSets[i]) * (num_items - 1 - i) for i in range(num_items)]
+                for patterns, histograms, counters in mine_classes(self, arrays, costs, self._workers):
+                    self._collect(patterns)
+                    self._gapHistograms.update(histograms)
+                    merge_counters(self._counters, counters)
+            else:
+                self._generation([], initial_itemSets, initial_tidSets, initial_supports)
+            self._initialClass = None
+            self._levels = []
+            if self._topK is not None:
+                self._finish_top()
+            self._decode_results()
+        print(f"Ứng viên: {self._counters['candidates']}, phép giao tid-list: {self._counters['intersections']}, "
+              f"bỏ qua nhờ cận trên: {self._counters['skipped']}, dừng sớm: {self._counters['aborted']}, "
+              f"độ dài mẫu lớn nhất: {self._counters['max_depth']}, tid-list cấp mới: {self._counters['allocations']}")
+
+    def _open_sink(self, iFile, patterns_output_file):
+        if self._sink is None:
+            return None
+        sink = make_sink(self._sink, patterns_output_file)
+        sink.open(os.path.basename(iFile))
+        return sink
+
+    def _close_sink(self, iFile, patterns_output_file):
+        # Không có sink: ghi _finalPatterns ra file như trước; có sink: mẫu đã được ghi trong lúc khai thác
+        sink, self._activeSink = self._activeSink, None
+        if sink is None:
+            with open(patterns_output_file, "w", encoding="utf-8") as f:
+                f.write(f"--- Mẫu Tuần Hoàn Cục Bộ từ {os.path.basename(iFile)} ---\n")
+                for pattern, support in self._finalPatterns.items():
+                    f.write(f"{pattern}: {support}\n")
+                f.write("-------------------------------------------------------\n")
+            print(f"Đã ghi nhận {len(self._finalPatterns)} mẫu tuần hoàn vào file: {patterns_output_file}")
+            return self._finalPatterns
+        sink.close()
+        target = f"file: {sink.path}" if sink.path else "bộ đếm"
+        print(f"Đã ghi nhận {len(sink)} mẫu tuần hoàn vào {target}")
+        return sink
+
     def _mine_patterns(self, iFile, patterns_output_file):
         self._finalPatterns = {}
-        start_time_mine = time.time()
-        plist = self._creatingOneitemSets()
-        initial_itemSets = []
-        initial_tidSets = []
-        print("--- Creating initial itemsets ---")
-        for itemI in plist:
-            tidSetX = self._tidList[itemI]
-            actual_support = self.getPeriodicSupport(tidSetX)
-            if actual_support >= self._convert_support_period(self._minPS):
-                initial_itemSets.append(itemI)
-                initial_tidSets.append(tidSetX)
-                self._save(None, [itemI], tidSetX)
-                print(f"  Initial frequent item: {itemI}, support: {actual_support}, TID count: {len(tidSetX)}")
-
-        print("--- Starting generation ---")
-        self._generation([], initial_itemSets, initial_tidSets)
-
-        end_time_mine = time.time()
-        process = psutil.Process(os.getpid())
-        memory_info = process.memory_info()
-        memory_uss_mine = getattr(memory_info, 'uss', memory_info.rss)
-        memory_rss_mine = memory_info.rss
+        self._activeSink = self._open_sink(iFile, patterns_output_file)
+        self._mine()
+
+        # memory_info() không có uss: cần memory_full_info()
+        memory_uss_mine, memory_rss_mine = memory_usage()
 
         # Gán lại vào self để sử dụng ở nơi khác
         self._memoryUSS = memory_uss_mine / (1024 * 1024)
         self._memoryRSS = memory_rss_mine / (1024 * 1024)
+        self._memoryPeakRSS = peak_rss()
+        print(f"Bộ nhớ đỉnh (peak RSS): {self._memoryPeakRSS / (1024 * 1024):.2f} MB")
 
-        num_patterns_found = len(self._finalPatterns)
-        execution_time_mine = end_time_mine - start_time_mine
+        # Thời gian khai thác = load + one_itemset + generation, cùng phạm vi với ThreePEclat
+        execution_time_mine = self._profiler.elapsed()
+        with self._profiler.phase('output'):
+            found = self._close_sink(iFile, patterns_output_file)
+        num_patterns_found = len(found)
 
-        with open(patterns_output_file, "w", encoding="utf-8") as f:
-            f.write(f"--- Mẫu Tuần Hoàn Cục Bộ từ {os.path.basename(iFile)} ---\n")
-            for pattern, support in self._finalPatterns.items():
-                f.write(f"{pattern}: {support}\n")
-            f.write("-------------------------------------------------------\n")
-        print(f"Đã ghi nhận {num_patterns_found} mẫu tuần hoàn vào file: {patterns_output_file}")
+        return num_patterns_found, execution_time_mine, self._memoryUSS, self._memoryRSS
 
-        output_dir = "output1"
-        file_name = os.path.basename(iFile)
-        patterns_plot_file = os.path.join(output_dir, f"{os.path.splitext(file_name)[0]}_patterns_plot.png")
-        self._plot_periodic_patterns(self._finalPatterns, patterns_plot_file)
+    def get_final_patterns(self):
+        return self._finalPatterns
 
-        return num_patterns_found, execution_time_mine, self._memoryUSS, self._memoryRSS
+    def get_memory_peak_rss(self):
+        return self._memoryPeakRSS
+
+    def get_pattern_store(self):
+        # Kết quả dạng truy vấn được: chỉ mục ngược item -> mẫu, cây tiền tố, lọc theo support; lưu bằng save(path)
+        return PatternStore.from_patterns(self._finalPatterns, {
+            'source': os.path.basename(self._current_file) if self._current_file else None,
+            'minPS': self._minPS, 'period': self._period,
+        })
+
+    def get_database_summary(self):
+        # Dữ liệu cho biểu đồ thống kê CSDL; việc vẽ nằm ở report.py, chạy sau khi khai thác
+        return dict(self._Database.summary(), dataset=os.path.basename(self._current_file))
+
+    def get_intersection_stats(self):
+        return dict(self._counters)
 
+    def get_profile(self):
+        # Thời gian từng pha, bộ nhớ đỉnh (RSS / USS lấy mẫu nền, tracemalloc nếu bật) và các bộ đếm của lần chạy gần nhất
+        return self._profiler.report()
@@ -0,0 +1,363 @@
+import argparse
+import contextlib
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import kernels
+from main import ALL_DATASETS, ALGORITHMS
+from support import intersect_bounded, periodic_support
+from tidlist import BitsetTidList, TidBuffer, TidUniverse
+
+# Mức chậm hơn / tốn bộ nhớ hơn (tỉ lệ so với baseline) được coi là hồi quy
+DEFAULT_TOLERANCE = 0.10
+DEFAULT_MEMORY_TOLERANCE = 0.10
+DEFAULTS = {
+    'algorithms': [algo['key'] for algo in ALGORITHMS],
+    'datasets': [ds['name'] for ds in ALL_DATASETS],
+    'database_dir': 'database',
+    'minPS': None,
+    'period': None,
+    'repeat': 5,
+    'warmup': 1,
+    'options': {'cache': True},
+}
+# Microbenchmark kernel: số phần tử của tid-list, mật độ (số phần tử / số timestamp) và period
+KERNEL_SIZES = [100, 1000, 10000, 100000, 1000000]
+KERNEL_DENSITY = 0.25
+KERNEL_PERIOD = 4
+# Mỗi lượt đo gọi lặp lại cho đến khi kéo dài ít nhất chừng này giây
+KERNEL_MIN_TIME = 0.01
+
+
+def parse_value(value):
+    # Giá trị từ dòng lệnh: số, true/false/null theo JSON, còn lại giữ nguyên chuỗi
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def resolve_algorithm(key):
+    for algo in ALGORITHMS:
+        if key in (algo['key'], algo['name']):
+            return algo
+    raise ValueError(f"Thuật toán không được hỗ trợ: {key}")
+
+
+def resolve_dataset(name, database_dir):
+    # name là tên file trong database_dir, tên không có phần mở rộng, số thứ tự trong ALL_DATASETS hoặc đường dẫn
+    for ds in ALL_DATASETS:
+        if str(name) in (str(ds['id']), ds['name'], os.path.splitext(ds['name'])[0]):
+            return dict(ds, path=os.path.join(database_dir, ds['name']))
+    if os.path.exists(str(name)):
+        return {'name': os.path.basename(name), 'path': name, 'minPS_fixed': None, 'period_fixed': None}
+    raise ValueError(f"Không tìm thấy dataset: {name}")
+
+
+def summarize(values):
+    values = np.asarray(values, dtype=float)
+    return {
+        'median': float(np.median(values)),
+        'p95': float(np.percentile(values, 95)),
+        'min': float(values.min()),
+        'max': float(values.max()),
+        'runs': values.tolist(),
+    }
+
+
+def measure_point(algorithm_key, dataset_path, min_ps, period, options, repeat, warmup):
+    # Chạy trong một tiến trình mới cho mỗi điểm: bộ nhớ đỉnh và cache của lần đo trước không ảnh hưởng điểm sau.
+    # mine_time là load + 1-itemset + generation (cùng phạm vi cho hai thuật toán), phases là median từng pha
+    algorithm_class = resolve_algorithm(algorithm_key)['class']
+    out_dir = os.path.join("output_benchmark", "runs")
+    os.makedirs(out_dir, exist_ok=True)
+    stats_file = os.path.join(out_dir, "stats.txt")
+    patterns_file = os.path.join(out_dir, "patterns.txt")
+    wall_times, mine_times, peaks, counts, profiles = [], [], [], [], []
+    for k in range(warmup + repeat):
+        gc.collect()
+        miner = algorithm_class(minPS=min_ps, period=period, **options)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            stats, (num_patterns, exec_time, mem_uss, mem_rss) = miner.startMine(dataset_path, stats_file, patterns_file)
+            wall_time = time.perf_counter() - start
+        if k >= warmup:
+            wall_times.append(wall_time)
+            mine_times.append(exec_time)
+            peaks.append(miner.get_memory_peak_rss() / (1024 * 1024))
+            counts.append(num_patterns)
+            profiles.append(miner.get_profile())
+        del miner
+    return {
+        'num_patterns': counts[-1],
+        'stable_patterns': len(set(counts)) == 1,
+        'wall_time': summarize(wall_times),
+        'mine_time': summarize(mine_times),
+        'memory_peak_rss': summarize(peaks),
+        'memory_peak_uss': summarize([p['memory_peak_uss'] for p in profiles]),
+        'phases': {name: float(np.median([p['phases'].get(name, 0.0) for p in profiles])) for name in profiles[-1]['phases']},
+        'counters': profiles[-1]['counters'],
+    }
+
+
+def point_key(result):
+    return (result['algorithm'], result['dataset'], str(result['minPS']), str(result['period']),
+            json.dumps(result['options'], sort_keys=True))
+
+
+def git_revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(config):
+    # Lưới (thuật toán x dataset x minPS x period); minPS / period bỏ trống thì dùng ngưỡng cố định của dataset
+    repeat, warmup = int(config['repeat']), int(config['warmup'])
+    if repeat < 1 or warmup < 0:
+        raise ValueError("repeat phải >= 1 và warmup phải >= 0")
+    algorithms = [resolve_algorithm(key) for key in config['algorithms']]
+    datasets = [resolve_dataset(name, config['database_dir']) for name in config['datasets']]
+    options = dict(config['options'])
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for ds in datasets:
+        if not os.path.exists(ds['path']):
+            print(f"Bỏ qua, không tìm thấy dataset: {ds['path']}")
+            continue
+        min_ps_list = config['minPS'] or [ds['minPS_fixed']]
+        period_list = config['period'] or [ds['period_fixed']]
+        if None in min_ps_list or None in period_list:
+            raise ValueError(f"Cần chỉ định minPS và period cho dataset {ds['name']}")
+        for algo in algorithms:
+            for min_ps in min_ps_list:
+                for period in period_list:
+                    print(f"--- {algo['name']} trên {ds['name']} (minPS={min_ps}, period={period}), "
+                          f"{warmup} lần khởi động + {repeat} lần đo ---")
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                        measured = executor.submit(measure_point, algo['key'], ds['path'], min_ps, period,
+                                                   options, repeat, warmup).result()
+                    result = {'algorithm': algo['name'], 'dataset': ds['name'], 'minPS': min_ps, 'period': period,
+                              'options': options}
+                    result.update(measured)
+                    print(f"   Số lượng mẫu: {result['num_patterns']}, thời gian median / p95: "
+                          f"{result['wall_time']['median']:.4f} / {result['wall_time']['p95']:.4f} giây, "
+                          f"bộ nhớ đỉnh: {result['memory_peak_rss']['max']:.2f} MB")
+                    results.append(result)
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'kernel': kernels.KERNEL,
+            'repeat': repeat,
+            'warmup': warmup,
+        },
+        'results': results,
+    }
+
+
+def time_call(fn, repeat):
+    # Thời gian median của một lần gọi fn (giây); lần gọi đầu để khởi động (biên dịch JIT) không được tính
+    fn()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= KERNEL_MIN_TIME:
+            break
+        loops *= 10
+    runs = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        runs.append((time.perf_counter() - start) / loops)
+    return float(np.median(runs))
+
+
+def measure_kernels(sizes, density=KERNEL_DENSITY, period=KERNEL_PERIOD, repeat=5, seed=0):
+    # Chi phí mỗi lần gọi (micro giây) của periodic support, phép giao mảng có đếm khoảng cách và phép giao bitset
+    # theo kích thước tid-list, với mọi kernel dùng được (numpy và numba nếu đã cài)
+    rng = np.random.default_rng(seed)
+    available = [name for name in kernels.KERNELS if name == 'numpy' or kernels.njit is not None]
+    current = kernels.KERNEL
+    rows = []
+    try:
+        for size in sizes:
+            universe_size = max(size, int(size / density))
+            # Khoảng cách timestamp ngẫu nhiên 1..2*period nên khoảng một nửa số khoảng <= period
+            universe = TidUniverse(np.cumsum(rng.integers(1, 2 * period + 1, universe_size)))
+            tidSetA = np.sort(rng.choice(universe_size, size, replace=False))
+            tidSetB = np.sort(rng.choice(universe_size, size, replace=False))
+            timeStamps = universe.timestamps[tidSetA]
+            out = np.empty(size, dtype=np.int64)
+            bitsetA = BitsetTidList.from_positions(universe, tidSetA)
+            bitsetB = BitsetTidList.from_positions(universe, tidSetB)
+            buffer = TidBuffer()
+            calls = {
+                'periodic_support': lambda: periodic_support(timeStamps, period),
+                'intersect': lambda: intersect_bounded(tidSetA, tidSetB, period, 0, universe.timestamps, out=out),
+                'bitset': lambda: bitsetA.intersect_bounded(bitsetB, period, 0, buffer),
+            }
+            for name, fn in calls.items():
+                row = {'op': name, 'size': size}
+                for kernel in available:
+                    kernels.use_kernel(kernel)
+                    row[kernel] = time_call(fn, repeat) * 1e6
+                rows.append(row)
+                timings = ", ".join(f"{kernel} {row[kernel]:.2f} µs" for kernel in available)
+                speedup = f", x{row['numpy'] / row['numba']:.1f}" if 'numba' in row else ""
+                print(f"{name:<18} n={size:<9} {timings}{speedup}")
+    finally:
+        kernels.use_kernel(current)
+    return rows
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE, memory_tolerance=DEFAULT_MEMORY_TOLERANCE):
+    # So median thời gian và median bộ nhớ đỉnh của từng điểm với baseline; trả về danh sách các dòng so sánh
+    base = {point_key(r): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        old = base.get(point_key(result))
+        row = {'algorithm': result['algorithm'], 'dataset': result['dataset'], 'minPS': result['minPS'],
+               'period': result['period'], 'status': 'OK', 'regression': False}
+        if old is None:
+            row['status'] = 'MỚI'
+            rows.append(row)
+            continue
+        row['time_ratio'] = result['wall_time']['median'] / max(old['wall_time']['median'], 1e-9)
+        row['memory_ratio'] = result['memory_peak_rss']['median'] / max(old['memory_peak_rss']['median'], 1e-9)
+        problems = []
+        if result['num_patterns'] != old['num_patterns']:
+            problems.append(f"KHÁC SỐ MẪU ({old['num_patterns']} -> {result['num_patterns']})")
+        if row['time_ratio'] > 1 + tolerance:
+            problems.append("CHẬM HƠN")
+        if row['memory_ratio'] > 1 + memory_tolerance:
+            problems.append("TỐN BỘ NHỚ HƠN")
+        if problems:
+            row['status'] = ", ".join(problems)
+            row['regression'] = True
+        elif row['time_ratio'] < 1 - tolerance:
+            row['status'] = "NHANH HƠN"
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows):
+    for row in rows:
+        ratios = ""
+        if 'time_ratio' in row:
+            ratios = f"thời gian x{row['time_ratio']:.3f}, bộ nhớ x{row['memory_ratio']:.3f}: "
+        print(f"{row['algorithm']:<18} {row['dataset']:<28} minPS={row['minPS']:<8} period={row['period']:<8} {ratios}{row['status']}")
+    regressions = sum(row['regression'] for row in rows)
+    print(f"\nSố điểm hồi quy: {regressions} / {len(rows)}")
+    return regressions
+
+
+def load_config(args):
+    config = dict(DEFAULTS)
+    config['options'] = dict(DEFAULTS['options'])
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        unknown = set(loaded) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Khóa cấu hình không hợp lệ: {sorted(unknown)}")
+        options = loaded.pop('options', {})
+        config.update(loaded)
+        config['options'].update(options)
+    for name in ('algorithms', 'datasets', 'database_dir', 'minPS', 'period', 'repeat', 'warmup'):
+        value = getattr(args, name)
+        if value is not None:
+            config[name] = value
+    for option in args.option:
+        key, sep, value = option.partition('=')
+        if not sep:
+            raise ValueError(f"Tùy chọn phải có dạng khóa=giá_trị: {option}")
+        config['options'][key] = parse_value(value)
+    return config
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark 3P-ECLAT / 3P-ECLAT Pruning không cần tương tác")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Chạy lưới benchmark và ghi kết quả JSON")
+    run.add_argument('--config', help="File JSON với các khóa: " + ", ".join(DEFAULTS))
+    run.add_argument('--algorithms', nargs='+', help="eclat, pruning")
+    run.add_argument('--datasets', nargs='+', help="Tên file, tên không đuôi, số thứ tự hoặc đường dẫn")
+    run.add_argument('--database-dir', dest='database_dir')
+    run.add_argument('--minps', dest='minPS', nargs='+', type=parse_value)
+    run.add_argument('--periods', dest='period', nargs='+', type=parse_value)
+    run.add_argument('--repeat', type=int)
+    run.add_argument('--warmup', type=int)
+    run.add_argument('--option', action='append', default=[], help="Tham số của miner, ví dụ tidlist=array, workers=4")
+    run.add_argument('--output', default=os.path.join("output_benchmark", "benchmark.json"))
+    run.add_argument('--baseline', help="File JSON cũ để so sánh ngay sau khi chạy")
+    run.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    run.add_argument('--memory-tolerance', dest='memory_tolerance', type=float, default=DEFAULT_MEMORY_TOLERANCE)
+
+    kernel = commands.add_parser('kernel', help="Đo chi phí mỗi lần gọi của kernel periodic support / phép giao")
+    kernel.add_argument('--sizes', nargs='+', type=int, default=KERNEL_SIZES)
+    kernel.add_argument('--density', type=float, default=KERNEL_DENSITY)
+    kernel.add_argument('--period', type=int, default=KERNEL_PERIOD)
+    kernel.add_argument('--repeat', type=int, default=5)
+    kernel.add_argument('--output', help="Ghi kết quả ra file JSON")
+
+    cmp = commands.add_parser('compare', help="So sánh hai file kết quả JSON")
+    cmp.add_argument('current')
+    cmp.add_argument('baseline')
+    cmp.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    cmp.add_argument('--memory-tolerance', dest='memory_tolerance', type=float, default=DEFAULT_MEMORY_TOLERANCE)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'kernel':
+        rows = measure_kernels(args.sizes, args.density, args.period, args.repeat)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump({'kernel': kernels.KERNEL, 'density': args.density, 'period': args.period, 'results': rows},
+                          f, indent=2, ensure_ascii=False)
+            print(f"Đã lưu kết quả vào file: {args.output}")
+        return 0
+    if args.command == 'run':
+        report = run_suite(load_config(args))
+        output_dir = os.path.dirname(args.output)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Đã lưu kết quả benchmark vào file: {args.output}")
+        if not args.baseline:
+            return 0
+        current = report
+        baseline_file = args.baseline
+    else:
+        with open(args.current, "r", encoding="utf-8") as f:
+            current = json.load(f)
+        baseline_file = args.baseline
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(current, baseline, args.tolerance, args.memory_tolerance)
+    return 1 if print_comparison(rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+class ClosedIndex:
+    # Chỉ mục băm theo tid-list (số timestamp, tổng timestamp) của các mẫu đóng đã tìm được.
+    # Nếu C chứa X và |t(C)| = |t(X)| thì t(C) = t(X), nên chỉ cần so sánh tập item trong cùng một ô.
+    def __init__(self):
+        self._buckets = {}
+
+    def add_if_closed(self, items, timeStamps):
+        key = (len(timeStamps), int(timeStamps.sum()))
+        bucket = self._buckets.setdefault(key, [])
+        if any(items <= closed for closed in bucket):
+            return False
+        bucket.append(items)
+        return True
+
+
+class MaximalIndex:
+    # Tập các mẫu cực đại hiện tại với chỉ mục ngược item -> mẫu; mẫu mới loại bỏ các mẫu cũ là tập con của nó
+    def __init__(self):
+        self._patterns = {}
+        self._postings = {}
+
+    def add(self, items, support):
+        postings = [self._postings.get(item, set()) for item in items]
+        if postings and set.intersection(*postings):
+            return False
+        for other in set().union(*postings):
+            if other < items:
+                for item in other:
+                    self._postings[item].discard(other)
+                del self._patterns[other]
+        for item in items:
+            self._postings.setdefault(item, set()).add(items)
+        self._patterns[items] = support
+        return True
+
+    def items(self):
+        return self._patterns.items()
+
+    def __len__(self):
+        return len(self._patterns)
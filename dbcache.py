@@ -0,0 +1,105 @@
+import glob
+import hashlib
+import json
+import os
+import struct
+import numpy as np
+from loader import TransactionData, read_transactions
+
+MAGIC = b'3PDB'
+VERSION = 1
+CACHE_EXT = '.3pdb'
+_HEADER = struct.Struct('<4sIQ')
+_ARRAYS = ('offsets', 'items', 'timestamps', 'vertical_ts', 'vertical_sorted', 'bounds')
+
+
+def file_digest(path, sep, block_size=1 << 20):
+    h = hashlib.blake2b(digest_size=8)
+    h.update(sep.encode('utf-8'))
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_path(path, sep):
+    # File cache nằm cạnh file nguồn, tên gắn với hash nội dung và ký tự phân tách
+    return f"{path}.{file_digest(path, sep)}{CACHE_EXT}"
+
+
+def save_database(data, num_lines, path):
+    data.vertical()
+    data.sorted_vertical()
+    arrays = {name: np.ascontiguousarray(getattr(data, name)) for name in _ARRAYS}
+    # vertical_sorted trùng vertical_ts khi dữ liệu đã theo thứ tự thời gian: chỉ ghi một lần
+    shared_sorted = data.vertical_sorted is data.vertical_ts
+    if shared_sorted:
+        del arrays['vertical_sorted']
+    layout = {}
+    offset = 0
+    for name, arr in arrays.items():
+        layout[name] = [arr.dtype.str, offset, len(arr)]
+        offset += (arr.nbytes + 7) // 8 * 8
+    meta = json.dumps({
+        'labels': data.labels, 'num_lines': num_lines, 'shared_sorted': shared_sorted, 'arrays': layout,
+    }).encode('utf-8')
+    meta += b' ' * (-(_HEADER.size + len(meta)) % 8)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(meta)))
+        f.write(meta)
+        for name, arr in arrays.items():
+            f.write(arr.tobytes())
+            f.write(b'\0' * (-arr.nbytes % 8))
+    os.replace(tmp_path, path)
+
+
+def load_database(path):
+    # Các mảng là np.memmap chỉ đọc: tid-list của từng item là view trên file, không sao chép
+    with open(path, 'rb') as f:
+        magic, version, meta_len = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"File cache không hợp lệ: {path}")
+        meta = json.loads(f.read(meta_len).decode('utf-8'))
+    base = _HEADER.size + meta_len
+    arrays = {}
+    for name, (dtype, offset, length) in meta['arrays'].items():
+        if length == 0:
+            arrays[name] = np.empty(0, dtype=dtype)
+        else:
+            arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=base + offset, shape=(length,))
+    if meta['shared_sorted']:
+        arrays['vertical_sorted'] = arrays['vertical_ts']
+    data = TransactionData(meta['labels'], arrays['offsets'], arrays['items'], arrays['timestamps'],
+                           arrays['vertical_ts'], arrays['vertical_sorted'], arrays['bounds'])
+    return data, meta['num_lines']
+
+
+def remove_stale(path, keep):
+    for old in glob.glob(f"{glob.escape(path)}.*{CACHE_EXT}"):
+        if old != keep:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def read_cached(path, sep):
+    # Lần đầu: đọc file văn bản rồi ghi file cache nhị phân; các lần sau nạp lại bằng memmap
+    target = cache_path(path, sep)
+    if os.path.exists(target):
+        try:
+            return load_database(target)
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"Cảnh báo: Không đọc được file cache {target}: {e}")
+    with open(path, 'r', encoding='utf-8') as f:
+        data, num_lines = read_transactions(f, sep)
+    try:
+        save_database(data, num_lines, target)
+        remove_stale(path, target)
+    except OSError as e:
+        print(f"Cảnh báo: Không ghi được file cache {target}: {e}")
+    return data, num_lines
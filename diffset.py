@@ -0,0 +1,34 @@
+import numpy as np
+
+# Tỉ lệ |t(PX)| / số timestamp mà từ đó lớp con của PX chuyển sang diffset
+DIFFSET_DENSITY = 0.5
+
+
+def difference(tidSetA, tidSetB):
+    # a \ b với hai mảng timestamp đã sắp xếp và không trùng lặp
+    return np.setdiff1d(tidSetA, tidSetB, assume_unique=True)
+
+
+def diffset_support(tidSetP, supportP, diffSet, period):
+    # Periodic support của t(P) \ d suy ra từ cấu trúc khoảng cách của t(P):
+    # mỗi khối phần tử bị xóa liên tiếp làm mất các khoảng quanh nó và có thể tạo ra một khoảng mới
+    if len(diffSet) == 0:
+        return supportP
+    n = len(tidSetP)
+    if len(diffSet) >= n - 1:
+        return 0
+    idx = np.searchsorted(tidSetP, diffSet)
+    gaps_ok = np.diff(tidSetP) <= period
+    touched = np.union1d(idx, idx - 1)
+    touched = touched[(touched >= 0) & (touched < n - 1)]
+    lost = int(np.count_nonzero(gaps_ok[touched]))
+
+    block_start = np.ones(len(idx), dtype=bool)
+    block_start[1:] = idx[1:] != idx[:-1] + 1
+    block_end = np.ones(len(idx), dtype=bool)
+    block_end[:-1] = block_start[1:]
+    left = idx[block_start] - 1
+    right = idx[block_end] + 1
+    inner = (left >= 0) & (right < n)
+    gained = int(np.count_nonzero(tidSetP[right[inner]] - tidSetP[left[inner]] <= period))
+    return supportP - lost + gained
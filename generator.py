@@ -0,0 +1,232 @@
+import argparse
+import itertools
+import os
+import re
+import sys
+import time
+import numpy as np
+
+# Số giao dịch sinh và ghi mỗi lần: bộ nhớ chỉ phụ thuộc kích thước khối, không phụ thuộc tổng số giao dịch
+CHUNK_TRANSACTIONS = 100000
+
+# Thay thế cho các bộ dữ liệu main.py cần nhưng không có sẵn trong repo (connect chỉ là xấp xỉ độ dày đặc)
+PRESETS = {
+    'Temporal_T10I4D100K.csv': {'transactions': 100000, 'avg_length': 10, 'avg_pattern_length': 4, 'items': 1000},
+    'Temporal_T20I6D100K.csv': {'transactions': 100000, 'avg_length': 20, 'avg_pattern_length': 6, 'items': 1000},
+    'Transactional_connect.csv': {'transactions': 67557, 'avg_length': 43, 'avg_pattern_length': 10, 'items': 129,
+                                  'patterns': 200, 'correlation': 0.9},
+}
+
+
+class QuestGenerator:
+    # Sinh CSDL giao dịch có thời gian kiểu IBM Quest: giao dịch ghép từ một kho mẫu tiềm năng có trọng số,
+    # mỗi lần chọn mẫu bỏ đi vài item cuối (mức nhiễu riêng của mẫu); thêm các mẫu tuần hoàn được chèn theo chu kỳ
+    # trong những khoảng thời gian hoạt động, và khoảng cách timestamp ngẫu nhiên có các khoảng nghỉ dài
+    def __init__(self, transactions=100000, avg_length=10, items=1000, patterns=2000, avg_pattern_length=4,
+                 correlation=0.5, corruption=0.5, periodic=10, periodic_length=3, period=20, jitter=2,
+                 periodic_prob=0.9, active=0.5, window=20000, gap_mean=1.0, long_gap_prob=0.0, long_gap=1000, seed=0):
+        if transactions < 1 or avg_length <= 0 or items < 1 or patterns < 1 or avg_pattern_length <= 0:
+            raise ValueError("transactions, avg_length, items, patterns, avg_pattern_length phải dương")
+        if periodic and (periodic_length > items or period < 1):
+            raise ValueError("periodic_length phải <= items và period phải >= 1")
+        if gap_mean < 1:
+            raise ValueError("gap_mean phải >= 1")
+        self.transactions = int(transactions)
+        self.avg_length = avg_length
+        self.items = int(items)
+        self.periodic_prob = periodic_prob
+        self.gap_mean = gap_mean
+        self.long_gap_prob = long_gap_prob
+        self.long_gap = int(long_gap)
+        self._rng = np.random.default_rng(seed)
+        rng = self._rng
+
+        # Kho mẫu tiềm năng: mỗi mẫu lấy một phần item (tỉ lệ ~ mũ, trung bình correlation) từ mẫu trước
+        sizes = np.clip(rng.poisson(avg_pattern_length, patterns), 1, self.items)
+        pool = []
+        previous = np.empty(0, dtype=np.int64)
+        for size in sizes.tolist():
+            shared = min(int(min(1.0, rng.exponential(correlation)) * size), len(previous))
+            chosen = rng.choice(previous, shared, replace=False) if shared else np.empty(0, dtype=np.int64)
+            fresh = np.setdiff1d(rng.choice(self.items, size, replace=False), chosen)[:size - shared]
+            pattern = np.concatenate((chosen, rng.permutation(fresh)))
+            pool.append(pattern)
+            previous = pattern
+        self._sizes = np.array([len(p) for p in pool], dtype=np.int64)
+        self._offsets = np.concatenate(([0], np.cumsum(self._sizes)))
+        self._pool = np.concatenate(pool).astype(np.int64)
+        weights = rng.exponential(1.0, patterns)
+        self._weights = weights / weights.sum()
+        self._corruption = np.clip(rng.normal(corruption, 0.1, patterns), 0.0, 0.95)
+        # Số mẫu cần chọn cho mỗi giao dịch tính theo số item giữ lại trung bình của một lần chọn
+        kept = np.maximum(self._sizes - self._corruption / (1 - self._corruption), 1)
+        self._kept_mean = float(np.dot(self._weights, kept))
+
+        # Mẫu tuần hoàn: xuất hiện khoảng mỗi `period` đơn vị thời gian (lệch tối đa `jitter`), với xác suất
+        # periodic_prob, chỉ trong phần `active` của mỗi cửa sổ `window` (pha ngẫu nhiên cho từng mẫu)
+        self.periodic = [np.sort(rng.choice(self.items, periodic_length, replace=False)) for _ in range(periodic)]
+        self.period = int(period)
+        self.jitter = int(jitter)
+        self.active = active
+        self.window = int(window)
+        self._phases = rng.integers(0, max(self.period, 1), periodic)
+        self._offsets_active = rng.integers(0, max(self.window, 1), periodic)
+        self._last_ts = 0
+
+    def _timestamps(self, n):
+        gaps = self._rng.geometric(1.0 / self.gap_mean, n) if self.gap_mean > 1 else np.ones(n, dtype=np.int64)
+        if self.long_gap_prob > 0:
+            gaps = gaps + (self._rng.random(n) < self.long_gap_prob) * self.long_gap
+        ts = self._last_ts + np.cumsum(gaps)
+        self._last_ts = int(ts[-1])
+        return ts
+
+    def _quest_items(self, n):
+        rng = self._rng
+        lengths = np.maximum(1, rng.poisson(self.avg_length, n))
+        # Làm tròn ngẫu nhiên để độ dài trung bình không lệch
+        picks = np.maximum(1, np.floor(lengths / self._kept_mean + rng.random(n)).astype(np.int64))
+        rows = np.repeat(np.arange(n), picks)
+        chosen = rng.choice(len(self._sizes), len(rows), p=self._weights)
+        sizes = self._sizes[chosen]
+        drops = rng.geometric(1 - self._corruption[chosen]) - 1
+        kept = np.maximum(sizes - drops, 1)
+        # Vị trí của từng item được giữ trong kho mẫu: offsets[mẫu] + 0..kept-1
+        starts = np.repeat(self._offsets[chosen] - np.concatenate(([0], np.cumsum(kept)[:-1])), kept)
+        items = self._pool[starts + np.arange(int(kept.sum()))]
+        return np.repeat(rows, kept), items
+
+    def _periodic_items(self, ts, first_ts):
+        # Các lần xuất hiện theo chu kỳ rơi vào (first_ts - 1, ts[-1]]: gán cho giao dịch đầu tiên có timestamp >= thời điểm đó
+        rng = self._rng
+        rows, items = [], []
+        for j, pattern in enumerate(self.periodic):
+            k0 = -(-(first_ts - self._phases[j]) // self.period)
+            targets = self._phases[j] + self.period * np.arange(k0, (int(ts[-1]) - self._phases[j]) // self.period + 1)
+            if self.jitter:
+                targets = targets + rng.integers(-self.jitter, self.jitter + 1, len(targets))
+            keep = rng.random(len(targets)) < self.periodic_prob
+            if self.active < 1:
+                keep &= ((targets + self._offsets_active[j]) % self.window) < self.active * self.window
+            targets = targets[keep & (targets >= first_ts) & (targets <= ts[-1])]
+            hit = np.unique(np.searchsorted(ts, targets, side='left'))
+            rows.append(np.repeat(hit, len(pattern)))
+            items.append(np.tile(pattern, len(hit)))
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(rows), np.concatenate(items)
+
+    def chunks(self, chunk=CHUNK_TRANSACTIONS):
+        # Sinh từng khối: (timestamp của từng giao dịch, độ dài, item đã sắp xếp và bỏ trùng trong từng giao dịch)
+        produced = 0
+        while produced < self.transactions:
+            n = min(chunk, self.transactions - produced)
+            first_ts = self._last_ts + 1
+            ts = self._timestamps(n)
+            rows, items = self._quest_items(n)
+            if self.periodic:
+                extra_rows, extra_items = self._periodic_items(ts, first_ts)
+                rows = np.concatenate((rows, extra_rows))
+                items = np.concatenate((items, extra_items))
+            keys = np.sort(rows * self.items + items)
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+            lengths = np.bincount(keys // self.items, minlength=n)
+            yield ts, lengths, keys % self.items
+            produced += n
+
+    def write(self, path, sep='\t', chunk=CHUNK_TRANSACTIONS):
+        # Mỗi dòng: timestamp rồi các item, cùng định dạng mà hai miner đọc
+        labels = np.array([str(i) for i in range(self.items)], dtype=object)
+        total_items = 0
+        start = time.time()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+            for ts, lengths, items in self.chunks(chunk):
+                # Ghép token và ký tự phân tách xen kẽ: sep giữa các item, xuống dòng sau item cuối của mỗi giao dịch
+                counts = lengths + 1
+                tokens = np.empty(int(counts.sum()), dtype=object)
+                row_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+                tokens[row_starts] = ts.astype(str).astype(object)
+                item_mask = np.ones(len(tokens), dtype=bool)
+                item_mask[row_starts] = False
+                tokens[item_mask] = labels[items]
+                seps = np.full(len(tokens), sep, dtype=object)
+                seps[np.cumsum(counts) - 1] = '\n'
+                out = np.empty(2 * len(tokens), dtype=object)
+                out[0::2] = tokens
+                out[1::2] = seps
+                f.write(''.join(out.tolist()))
+                total_items += len(items)
+        os.replace(tmp_path, path)
+        return {
+            'path': path,
+            'transactions': self.transactions,
+            'avg_length': total_items / self.transactions,
+            'last_timestamp': self._last_ts,
+            'time': time.time() - start,
+        }
+
+
+def preset_params(name):
+    # Tên trong PRESETS hoặc dạng Quest T<độ dài>I<độ dài mẫu>D<số giao dịch>[K|M]
+    base = os.path.basename(name)
+    if base in PRESETS:
+        return dict(PRESETS[base])
+    match = re.search(r'T(\d+)I(\d+)D(\d+)([KM]?)', base)
+    if not match:
+        raise ValueError(f"Không nhận ra preset: {name}")
+    scale = {'': 1, 'K': 1000, 'M': 1000000}[match.group(4)]
+    return {'avg_length': int(match.group(1)), 'avg_pattern_length': int(match.group(2)),
+            'transactions': int(match.group(3)) * scale}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Sinh CSDL giao dịch có thời gian kiểu IBM Quest")
+    parser.add_argument('output', help="File đầu ra; có thể chứa {n} và {length} khi truyền nhiều giá trị")
+    parser.add_argument('--preset', help="Tên bộ dữ liệu trong main.py hoặc dạng T10I4D100K")
+    parser.add_argument('--transactions', '-n', type=int, nargs='+')
+    parser.add_argument('--avg-length', dest='avg_length', type=float, nargs='+')
+    parser.add_argument('--items', type=int)
+    parser.add_argument('--patterns', type=int)
+    parser.add_argument('--avg-pattern-length', dest='avg_pattern_length', type=float)
+    parser.add_argument('--correlation', type=float)
+    parser.add_argument('--corruption', type=float)
+    parser.add_argument('--periodic', type=int, help="Số mẫu tuần hoàn được chèn")
+    parser.add_argument('--periodic-length', dest='periodic_length', type=int)
+    parser.add_argument('--period', type=int, help="Chu kỳ (đơn vị timestamp) của mẫu tuần hoàn")
+    parser.add_argument('--jitter', type=int)
+    parser.add_argument('--periodic-prob', dest='periodic_prob', type=float)
+    parser.add_argument('--active', type=float, help="Tỉ lệ thời gian mẫu tuần hoàn hoạt động trong mỗi cửa sổ")
+    parser.add_argument('--window', type=int)
+    parser.add_argument('--gap-mean', dest='gap_mean', type=float, help="Khoảng cách timestamp trung bình (>= 1)")
+    parser.add_argument('--long-gap-prob', dest='long_gap_prob', type=float)
+    parser.add_argument('--long-gap', dest='long_gap', type=int)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--chunk', type=int, default=CHUNK_TRANSACTIONS)
+    return parser
+
+
+def main(argv=None):
+    args = vars(build_parser().parse_args(argv))
+    output, preset, chunk = args.pop('output'), args.pop('preset'), args.pop('chunk')
+    params = preset_params(preset) if preset else {}
+    sizes = args.pop('transactions') or [params.pop('transactions', 100000)]
+    lengths = args.pop('avg_length') or [params.pop('avg_length', 10)]
+    params.pop('transactions', None)
+    params.pop('avg_length', None)
+    params.update({k: v for k, v in args.items() if v is not None})
+    if len(sizes) * len(lengths) > 1 and '{' not in output:
+        raise ValueError("Cần {n} hoặc {length} trong tên file khi sinh nhiều bộ dữ liệu")
+    # Lưới (số giao dịch x độ dài trung bình) để đo khả năng mở rộng theo N và theo mật độ
+    for n, length in itertools.product(sizes, lengths):
+        path = output.format(n=n, length=f"{length:g}")
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        summary = QuestGenerator(transactions=n, avg_length=length, **params).write(path, chunk=chunk)
+        print(f"Đã ghi {summary['transactions']} giao dịch (độ dài trung bình {summary['avg_length']:.2f}, "
+              f"timestamp cuối {summary['last_timestamp']}) vào file: {path} trong {summary['time']:.2f} giây")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
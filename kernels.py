@@ -0,0 +1,227 @@
+import os
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+KERNELS = ('numba', 'numpy')
+
+
+def _check_kernel(name):
+    if name not in KERNELS:
+        raise ValueError(f"Kernel không được hỗ trợ: {name}")
+    if name == 'numba' and njit is None:
+        raise ImportError("Cần cài đặt numba để dùng kernel biên dịch (pip install numba)")
+    return name
+
+
+# Kernel biên dịch (Numba) cho periodic support, phép giao tid-list và tid-list nén (packed); không cài numba thì dùng
+# đường NumPy trong support.py / tidlist.py. Đặt biến môi trường THREEP_KERNEL=numpy để luôn dùng NumPy (ví dụ khi so sánh)
+KERNEL = _check_kernel(os.environ.get('THREEP_KERNEL', 'numba' if njit is not None else 'numpy'))
+
+
+def _gap_count(timeStamps, period):
+    count = 0
+    for k in range(1, len(timeStamps)):
+        if timeStamps[k] - timeStamps[k - 1] <= period:
+            count += 1
+    return count
+
+
+def _merge_intersect(small, large, timestamps, mapped, period, minPS, chunk, out):
+    # Với mỗi phần tử của mảng ngắn, nhảy cóc (galloping) trong mảng dài từ vị trí trước đó rồi tìm nhị phân;
+    # phần tử chung được ghi thẳng vào out và khoảng cách tới phần tử chung trước được đếm ngay, không có mảng tạm.
+    # Sau mỗi chunk phần tử kiểm tra cận trên như intersect_bounded: support + số phần tử còn lại < minPS thì dừng.
+    # Trả về (số phần tử đã ghi, support, đã dừng sớm hay chưa)
+    n = len(small)
+    m = len(large)
+    written = 0
+    support = 0
+    last = 0
+    j = 0
+    for k in range(n):
+        x = small[k]
+        if j < m and large[j] < x:
+            lo = j
+            step = 1
+            while j + step < m and large[j + step] < x:
+                lo = j + step
+                step *= 2
+            hi = min(j + step, m)
+            lo += 1
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if large[mid] < x:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            j = lo
+        if j < m and large[j] == x:
+            out[written] = x
+            value = timestamps[x] if mapped else x
+            if written and value - last <= period:
+                support += 1
+            last = value
+            written += 1
+            j += 1
+        if (k + 1) % chunk == 0:
+            remaining = n - k - 1
+            if remaining > 0 and support + remaining < minPS:
+                return written, support + remaining, True
+    return written, support, False
+
+
+def _and_gaps(wordsA, wordsB, timestamps, period, out):
+    # AND hai bitset vào out, đồng thời duyệt các bit 1 theo thứ tự để đếm số phần tử và khoảng cách <= period
+    count = 0
+    support = 0
+    last = 0
+    one = np.uint64(1)
+    for w in range(len(wordsA)):
+        word = wordsA[w] & wordsB[w]
+        out[w] = word
+        if word == 0:
+            continue
+        for b in range(64):
+            if (word >> np.uint64(b)) & one:
+                value = timestamps[w * 64 + b]
+                if count and value - last <= period:
+                    support += 1
+                last = value
+                count += 1
+    return count, support
+
+
+def _and_rows(matrix, words, timestamps, period, counts, supports):
+    # Như _and_gaps cho từng hàng của ma trận bitset (AND tại chỗ với words), dùng cho intersect_class
+    for r in range(matrix.shape[0]):
+        counts[r], supports[r] = _and_gaps(matrix[r], words, timestamps, period, matrix[r])
+
+
+def _read_bits(data, bit, width):
+    # width bit bắt đầu từ bit thứ bit của data (little-endian), chỉ đọc các byte chứa chúng
+    byte = bit >> 3
+    shift = bit & 7
+    if width + shift <= 63:
+        word = 0
+        for t in range((shift + width + 7) >> 3):
+            word |= np.int64(data[byte + t]) << (8 * t)
+        return (word >> shift) & ((np.int64(1) << width) - 1)
+    value = 0
+    for j in range(width):
+        value |= np.int64((data[(bit + j) >> 3] >> ((bit + j) & 7)) & 1) << j
+    return value
+
+
+def _pack_deltas(deltas, refs, widths, offsets, block, data):
+    # Ghi phần dư (khoảng - ref) của từng khối block giá trị vào data (đã điền 0) theo bố cục của tidlist._pack_deltas
+    for k in range(len(deltas)):
+        b = k // block
+        width = np.int64(widths[b])
+        if width == 0:
+            continue
+        value = deltas[k] - refs[b]
+        bit = offsets[b] * 8 + (k - b * block) * width
+        for j in range(width):
+            if (value >> j) & 1:
+                data[(bit + j) >> 3] |= np.uint8(1 << ((bit + j) & 7))
+
+
+def _unpack_timestamps(first, count, refs, widths, offsets, block, data, out):
+    # Giải nén và cộng dồn khoảng cách trong một lượt: out là các timestamp đã sắp xếp
+    if count == 0:
+        return
+    value = first
+    out[0] = value
+    k = 1
+    for b in range(len(refs)):
+        width = np.int64(widths[b])
+        ref = refs[b]
+        bit = offsets[b] * 8
+        for i in range(min(block, count - k)):
+            value += ref
+            if width:
+                value += _read_bits(data, bit, width)
+                bit += width
+            out[k] = value
+            k += 1
+
+
+def _packed_gaps(count, refs, widths, offsets, block, data, period):
+    # Periodic support trên dạng nén: khối có ref > period bỏ qua, khối có ref + 2^width - 1 <= period đếm cả khối,
+    # chỉ đọc từng giá trị ở các khối còn lại
+    support = 0
+    for b in range(len(refs)):
+        width = np.int64(widths[b])
+        n = min(block, count - 1 - b * block)
+        if refs[b] > period:
+            continue
+        if width < 63 and refs[b] + (np.int64(1) << width) - 1 <= period:
+            support += n
+            continue
+        bit = offsets[b] * 8
+        for i in range(n):
+            if refs[b] + _read_bits(data, bit, width) <= period:
+                support += 1
+            bit += width
+    return support
+
+
+if njit is not None:
+    _gap_count = njit(cache=True, nogil=True)(_gap_count)
+    _merge_intersect = njit(cache=True, nogil=True)(_merge_intersect)
+    _and_gaps = njit(cache=True, nogil=True)(_and_gaps)
+    _and_rows = njit(cache=True, nogil=True)(_and_rows)
+    _read_bits = njit(cache=True, nogil=True)(_read_bits)
+    _pack_deltas = njit(cache=True, nogil=True)(_pack_deltas)
+    _unpack_timestamps = njit(cache=True, nogil=True)(_unpack_timestamps)
+    _packed_gaps = njit(cache=True, nogil=True)(_packed_gaps)
+
+
+def use_kernel(name):
+    # Đổi kernel trong tiến trình hiện tại (tiến trình con đọc lại THREEP_KERNEL)
+    global KERNEL
+    KERNEL = _check_kernel(name)
+
+
+def gap_count(timeStamps, period):
+    # Periodic support của mảng timestamp đã sắp xếp, một vòng lặp không cấp phát
+    return int(_gap_count(np.asarray(timeStamps), period))
+
+
+def merge_intersect(tidSetA, tidSetB, period, minPS, timestamps, chunk, out):
+    # tidSetA là mảng ngắn hơn; out đủ chỗ cho tidSetA và cùng kiểu phần tử
+    tidSetA = np.asarray(tidSetA)
+    mapped = timestamps is not None
+    written, support, aborted = _merge_intersect(tidSetA, np.asarray(tidSetB), np.asarray(timestamps) if mapped else tidSetA,
+                                                 mapped, period, minPS, chunk, out)
+    return int(written), int(support), bool(aborted)
+
+
+def and_gaps(wordsA, wordsB, timestamps, period, out):
+    count, support = _and_gaps(wordsA, wordsB, np.asarray(timestamps), period, out)
+    return int(count), int(support)
+
+
+def pack_deltas(deltas, refs, widths, offsets, block, data):
+    _pack_deltas(np.asarray(deltas, dtype=np.int64), refs, widths, offsets, block, data)
+
+
+def unpack_timestamps(first, count, refs, widths, offsets, block, data):
+    out = np.empty(count, dtype=np.int64)
+    _unpack_timestamps(first, count, refs, widths, offsets, block, data, out)
+    return out
+
+
+def packed_gaps(count, refs, widths, offsets, block, data, period):
+    return int(_packed_gaps(count, refs, widths, offsets, block, data, period))
+
+
+def and_rows(matrix, words, timestamps, period):
+    # Trả về (số phần tử, support) của từng hàng sau khi AND ma trận với words
+    counts = np.zeros(matrix.shape[0], dtype=np.int64)
+    supports = np.zeros(matrix.shape[0], dtype=np.int64)
+    _and_rows(matrix, words, np.asarray(timestamps), period, counts, supports)
+    return counts, supports
@@ -0,0 +1,280 @@
+import codecs
+import numpy as np
+from collections import Counter
+
+# Kích thước mỗi khối đọc từ file (ký tự)
+CHUNK_SIZE = 1 << 22
+# Số item phổ biến nhất giữ lại trong bản tóm tắt CSDL (biểu đồ thống kê)
+SUMMARY_TOP_N = 20
+
+
+def summarize(labels, frequencies, length_counts, top_n=SUMMARY_TOP_N):
+    # Dữ liệu nhỏ, ghi được ra JSON, đủ để vẽ biểu đồ thống kê sau này mà không cần giữ CSDL:
+    # top_n item phổ biến nhất (cùng thứ tự với Counter.most_common), số item theo tần suất, số giao dịch theo độ dài
+    top = np.argsort(-frequencies, kind='stable')[:top_n]
+    values, counts = np.unique(frequencies, return_counts=True)
+    return {
+        'top_items': [[str(labels[k]), int(frequencies[k])] for k in top],
+        'item_frequency_counts': [[int(v), int(c)] for v, c in zip(values, counts)],
+        'transaction_length_counts': [[int(v), int(c)] for v, c in length_counts],
+    }
+
+
+def length_stats(length_counts):
+    # (nhỏ nhất, lớn nhất, trung bình, độ lệch chuẩn, phương sai) của độ dài giao dịch
+    # từ histogram [[độ dài, số giao dịch], ...]
+    if not len(length_counts):
+        return 0, 0, 0, 0, 0
+    lengths, counts = np.asarray(length_counts, dtype=np.int64).T
+    mean = (lengths * counts).sum() / counts.sum()
+    variance = (counts * (lengths - mean) ** 2).sum() / counts.sum()
+    return int(lengths.min()), int(lengths.max()), mean, np.sqrt(variance), variance
+
+
+def _sort_vertical(sorted_items, vertical_ts, timestamps):
+    # Tid-list của từng item đã sắp xếp; trùng với vertical_ts khi timestamp trong file không giảm
+    if np.all(np.diff(timestamps) >= 0):
+        return vertical_ts
+    return vertical_ts[np.lexsort((vertical_ts, sorted_items))]
+
+
+class VerticalData:
+    # CSDL chỉ còn dạng dọc, dùng trong lúc khai thác thay cho TransactionData: timestamp của từng giao dịch,
+    # tid-list của item k ở [bounds[k]:bounds[k + 1]] và histogram độ dài giao dịch cho phần thống kê;
+    # không giữ mảng item theo giao dịch (offsets / items)
+    def __init__(self, labels, timestamps, vertical_ts, bounds, length_counts, vertical_sorted=None):
+        self.labels = labels
+        self.timestamps = timestamps
+        self.vertical_ts = vertical_ts
+        self.vertical_sorted = vertical_sorted
+        self.bounds = bounds
+        self.length_counts = length_counts
+
+    @classmethod
+    def empty(cls):
+        return cls([], np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64), [])
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def item_frequencies(self):
+        return np.diff(self.bounds)
+
+    def item_counter(self):
+        return Counter(dict(zip(self.labels, self.item_frequencies().tolist())))
+
+    def summary(self, top_n=SUMMARY_TOP_N):
+        return summarize(self.labels, self.item_frequencies(), self.length_counts, top_n)
+
+    def vertical(self):
+        sorted_items = np.repeat(np.arange(len(self.labels), dtype=np.int32), np.diff(self.bounds))
+        return sorted_items, self.vertical_ts, self.bounds
+
+    def sorted_vertical(self):
+        if self.vertical_sorted is None:
+            sorted_items, vertical_ts, bounds = self.vertical()
+            self.vertical_sorted = _sort_vertical(sorted_items, vertical_ts, self.timestamps)
+        return self.vertical_sorted
+
+
+class TransactionData:
+    # CSDL dạng CSR: giao dịch r gồm items[offsets[r]:offsets[r + 1]] với timestamp timestamps[r];
+    # item được đánh số liên tục theo thứ tự xuất hiện đầu tiên, labels[id] là nhãn gốc
+    def __init__(self, labels, offsets, items, timestamps, vertical_ts=None, vertical_sorted=None, bounds=None):
+        self.labels = labels
+        self.offsets = offsets
+        self.items = items
+        self.timestamps = timestamps
+        # Dạng dọc (tính khi cần hoặc nạp từ file cache): timestamp của item k nằm ở [bounds[k]:bounds[k + 1]],
+        # vertical_ts theo thứ tự trong file, vertical_sorted đã sắp xếp tăng dần
+        self.vertical_ts = vertical_ts
+        self.vertical_sorted = vertical_sorted
+        self.bounds = bounds
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self):
+        # Tương thích với dạng cũ [timestamp, item1, item2, ...]
+        labels = self.labels
+        for r in range(len(self.timestamps)):
+            yield [int(self.timestamps[r])] + [labels[i] for i in self.items[self.offsets[r]:self.offsets[r + 1]]]
+
+    def transaction_lengths(self):
+        return np.diff(self.offsets)
+
+    def item_frequencies(self):
+        return np.bincount(self.items, minlength=len(self.labels))
+
+    def item_counter(self):
+        return Counter(dict(zip(self.labels, self.item_frequencies().tolist())))
+
+    def length_counts(self):
+        lengths, counts = np.unique(self.transaction_lengths(), return_counts=True)
+        return [[int(v), int(c)] for v, c in zip(lengths, counts)]
+
+    def summary(self, top_n=SUMMARY_TOP_N):
+        return summarize(self.labels, self.item_frequencies(), self.length_counts(), top_n)
+
+    def vertical(self):
+        # Gom timestamp theo item, giữ nguyên thứ tự trong file: trả về (item đã sắp xếp, timestamp, biên của từng item)
+        if self.bounds is None:
+            order = np.argsort(self.items, kind='stable')
+            self.vertical_ts = np.repeat(self.timestamps, self.transaction_lengths())[order]
+            self.bounds = np.concatenate(([0], np.cumsum(self.item_frequencies())))
+        sorted_items = np.repeat(np.arange(len(self.labels), dtype=np.int32), np.diff(self.bounds))
+        return sorted_items, self.vertical_ts, self.bounds
+
+    def sorted_vertical(self):
+        if self.vertical_sorted is None:
+            sorted_items, vertical_ts, bounds = self.vertical()
+            self.vertical_sorted = _sort_vertical(sorted_items, vertical_ts, self.timestamps)
+        return self.vertical_sorted
+
+    def compact(self):
+        # Chuyển sang VerticalData và bỏ dạng ngang: sau bước này miner chỉ giữ tid-list dọc và thống kê gọn
+        sorted_items, vertical_ts, bounds = self.vertical()
+        return VerticalData(self.labels, self.timestamps, vertical_ts, bounds, self.length_counts(), self.vertical_sorted)
+
+    @classmethod
+    def from_rows(cls, timestamps, transactions):
+        builder = _Builder()
+        builder.add_rows(timestamps, transactions)
+        return builder.build()
+
+
+class _Builder:
+    def __init__(self):
+        self.index = {}
+        self.labels = []
+        self.lengths = []
+        self.items = []
+        self.timestamps = []
+
+    def _intern(self, local_ids, keys):
+        # Ánh xạ id cục bộ của khối -> id toàn cục; nhãn mới được cấp id theo thứ tự xuất hiện đầu tiên
+        n = len(local_ids)
+        first = np.full(len(keys), n, dtype=np.int64)
+        # Gán ngược để vị trí xuất hiện đầu tiên ghi đè cuối cùng
+        first[local_ids[::-1]] = np.arange(n - 1, -1, -1)
+        present = np.flatnonzero(first < n)
+        mapping = np.zeros(len(keys), dtype=np.int32)
+        for k in present[np.argsort(first[present], kind='stable')].tolist():
+            label = keys[k]
+            item_id = self.index.get(label)
+            if item_id is None:
+                item_id = len(self.labels)
+                self.index[label] = item_id
+                self.labels.append(label)
+            mapping[k] = item_id
+        return mapping[local_ids]
+
+    def add_rows(self, timestamps, transactions):
+        # Dữ liệu từ DataFrame: giữ nguyên kiểu của item
+        ids = []
+        for transaction in transactions:
+            for item in transaction:
+                item_id = self.index.get(item)
+                if item_id is None:
+                    item_id = len(self.labels)
+                    self.index[item] = item_id
+                    self.labels.append(item)
+                ids.append(item_id)
+        self.items.append(np.array(ids, dtype=np.int32))
+        self.lengths.append(np.array([len(t) for t in transactions], dtype=np.int64))
+        self.timestamps.append(np.asarray(timestamps, dtype=np.int64))
+
+    def add_chunk(self, text, sep):
+        lines = [line.strip() for line in text.split('\n')]
+        lines = [line for line in lines if line]
+        if not lines:
+            return
+        tokens = sep.join(lines).split(sep)
+        keys = list(dict.fromkeys(tokens))
+        if any(not key or key != key.strip() for key in keys):
+            # Có token rỗng hoặc chứa khoảng trắng thừa: tách lại từng dòng như trước đây
+            rows = [[t.strip() for t in line.split(sep) if t.strip()] for line in lines]
+            lines = [line for line, row in zip(lines, rows) if row]
+            rows = [row for row in rows if row]
+            if not rows:
+                return
+            tokens = [t for row in rows for t in row]
+            keys = list(dict.fromkeys(tokens))
+            counts = np.array([len(row) for row in rows], dtype=np.int64)
+        else:
+            counts = np.array([line.count(sep) + 1 for line in lines], dtype=np.int64)
+        local = dict(zip(keys, range(len(keys))))
+        local_ids = np.fromiter(map(local.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        ts_tokens = [keys[i] for i in local_ids[starts].tolist()]
+        try:
+            timestamps = np.array(ts_tokens).astype(np.int64)
+            ok = np.ones(len(starts), dtype=bool)
+        except ValueError:
+            timestamps = np.zeros(len(starts), dtype=np.int64)
+            ok = np.zeros(len(starts), dtype=bool)
+            for r, token in enumerate(ts_tokens):
+                try:
+                    timestamps[r] = int(token)
+                    ok[r] = True
+                except ValueError:
+                    print(f"Cảnh báo: Không thể chuyển đổi timestamp '{token}' thành số trong dòng: {lines[r]}")
+        # Token đầu mỗi dòng là timestamp; bỏ cả các item của những dòng có timestamp lỗi
+        is_item = np.repeat(ok, counts)
+        is_item[starts] = False
+        self.items.append(self._intern(local_ids[is_item], keys))
+        self.lengths.append(counts[ok] - 1)
+        self.timestamps.append(timestamps[ok])
+
+    def drain(self):
+        # Lấy (item, độ dài, timestamp) của các khối đã đọc từ lần drain trước và bỏ chúng khỏi builder;
+        # chỉ giữ lại bảng nhãn nên đọc được file lớn hơn bộ nhớ theo từng khối
+        items = np.concatenate(self.items).astype(np.int32) if self.items else np.empty(0, dtype=np.int32)
+        lengths = np.concatenate(self.lengths) if self.lengths else np.empty(0, dtype=np.int64)
+        timestamps = np.concatenate(self.timestamps) if self.timestamps else np.empty(0, dtype=np.int64)
+        self.items, self.lengths, self.timestamps = [], [], []
+        return items, lengths, timestamps
+
+    def build(self):
+        lengths = np.concatenate(self.lengths) if self.lengths else np.empty(0, dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        items = np.concatenate(self.items).astype(np.int32) if self.items else np.empty(0, dtype=np.int32)
+        timestamps = np.concatenate(self.timestamps) if self.timestamps else np.empty(0, dtype=np.int64)
+        return TransactionData(self.labels, offsets, items, timestamps)
+
+
+def read_blocks(stream, chunk_size=CHUNK_SIZE):
+    # stream: đối tượng có read(n) trả về str hoặc bytes (file, HTTP response); trả về từng khối văn bản
+    # kết thúc ở cuối dòng (khối cuối có thể không có ký tự xuống dòng)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    carry = ''
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        if isinstance(block, bytes):
+            block = decoder.decode(block)
+        block = carry + block
+        cut = block.rfind('\n')
+        if cut < 0:
+            carry = block
+            continue
+        carry = block[cut + 1:]
+        yield block[:cut + 1]
+    if carry:
+        yield carry
+
+
+def count_lines(block):
+    return block.count('\n') + (not block.endswith('\n'))
+
+
+def read_transactions(stream, sep='\t', chunk_size=CHUNK_SIZE):
+    # Trả về (TransactionData, số dòng đã đọc)
+    builder = _Builder()
+    num_lines = 0
+    for block in read_blocks(stream, chunk_size):
+        num_lines += count_lines(block)
+        builder.add_chunk(block, sep)
+    return builder.build(), num_lines
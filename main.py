@@ -1,179 +1,230 @@
+import argparse
 import time
 import os
 import psutil
 import pandas as pd
-import matplotlib.pyplot as plt
 from ThreeP_Eclat import ThreePEclat
 from ThreeP_Eclat_Pruning import ThreePEclatPruning
-
-def run_experiment(algorithm_class, algorithm_name, base_output_dir, dataset_path, min_ps, period):
-    print(f"\n--- Running {algorithm_name} on {os.path.basename(dataset_path)} (minPS={min_ps}, period={period}) ---")
+from ordering import ITEM_ORDERS
+from profiling import flatten_profile
+from report import render_results, write_summary
+
+ALL_DATASETS = [
+    {'id': 1, 'name': 'Temporal_T10I4D100K.csv', 'minPS_fixed': 0.008, 'period_fixed': 0.001},
+    {'id': 2, 'name': 'Temporal_T20I6D100K.csv', 'minPS_fixed': 0.0034, 'period_fixed': 0.006},
+    {'id': 3, 'name': 'Transactional_connect.csv', 'minPS_fixed': 0.0002, 'period_fixed': 0.01},
+    {'id': 4, 'name': 'Transactional_retail.csv', 'minPS_fixed': 0.0015, 'period_fixed': 0.0045}
+]
+
+ALGORITHMS = [
+    {'key': 'eclat', 'name': '3P-ECLAT', 'class': ThreePEclat},
+    {'key': 'pruning', 'name': '3P-ECLAT Pruning', 'class': ThreePEclatPruning}
+]
+
+def run_experiment(algorithm_class, algorithm_name, base_output_dir, dataset_path, min_ps, period, order=ITEM_ORDERS[0]):
+    print(f"\n--- Running {algorithm_name} on {os.path.basename(dataset_path)} (minPS={min_ps}, period={period}, order={order}) ---")
     
     algo_output_dir = os.path.join(base_output_dir, algorithm_name)
     os.makedirs(algo_output_dir, exist_ok=True)
     
     stats_file = os.path.join(algo_output_dir, f"{os.path.splitext(os.path.basename(dataset_path))[0]}_stats_minPS_{str(min_ps).replace('.', '_')}_per_{str(period).replace('.', '_')}.txt")
     patterns_file = os.path.join(algo_output_dir, f"{os.path.splitext(os.path.basename(dataset_path))[0]}_patterns_minPS_{str(min_ps).replace('.', '_')}_per_{str(period).replace('.', '_')}.txt")
+    summary_file = os.path.join(algo_output_dir, f"{os.path.splitext(os.path.basename(dataset_path))[0]}_database.json")
 
-    miner = algorithm_class(minPS=min_ps, period=period)
+    # Dùng file cache nhị phân: chỉ lần chạy đầu tiên trên mỗi dataset phải phân tích file CSV
+    miner = algorithm_class(minPS=min_ps, period=period, cache=True, order=order)
     start_time = time.time()
     
     stats, (num_patterns, exec_time, mem_uss, mem_rss) = miner.startMine(dataset_path, stats_file, patterns_file)
     end_time = time.time()
     total_exec_time = end_time - start_time
+    mem_peak_rss = miner.get_memory_peak_rss() / (1024 * 1024)
+    profile = miner.get_profile()
     
     print(f"   Số lượng mẫu tìm được: {num_patterns}")
     print(f"   Thời gian thực thi (tổng): {total_exec_time:.4f} giây")
-    print(f"   Thời gian thực thi (trong mine): {exec_time:.4f} giây")
+    print(f"   Thời gian thực thi (load + khai thác): {exec_time:.4f} giây")
+    print("   Thời gian từng pha: " + ", ".join(f"{name} {seconds:.4f}s" for name, seconds in profile['phases'].items()))
     print(f"   Bộ nhớ sử dụng (USS): {mem_uss:.2f} MB")
     print(f"   Bộ nhớ sử dụng (RSS): {mem_rss:.2f} MB")
+    print(f"   Bộ nhớ đỉnh (peak RSS): {mem_peak_rss:.2f} MB")
+    print(f"   Bộ nhớ đỉnh lấy mẫu trong lúc chạy (USS): {profile['memory_peak_uss']:.2f} MB")
 
     with open(stats_file, "w", encoding="utf-8") as f:
         f.write(stats)
+    write_summary(miner.get_database_summary(), summary_file)
     print(f"   Đã lưu thống kê vào file: {stats_file}")
 
-    return {
+    # execution_time cùng phạm vi (load + 1-itemset + generation) cho cả hai thuật toán; total_time gồm cả ghi file kết quả.
+    # patterns_file / summary_file là dữ liệu để report.py vẽ biểu đồ sau khi khai thác
+    result = {
         'algorithm': algorithm_name,
         'dataset': os.path.basename(dataset_path),
         'minPS': min_ps,
         'period': period,
+        'order': order,
         'num_patterns': num_patterns,
-        'execution_time': total_exec_time,
+        'execution_time': exec_time,
+        'total_time': total_exec_time,
         'memory_uss': mem_uss,
-        'memory_rss': mem_rss
+        'memory_rss': mem_rss,
+        'memory_peak_rss': mem_peak_rss,
+        'patterns_file': patterns_file,
+        'summary_file': summary_file
     }
+    result.update(flatten_profile(profile))
+    return result
 
-def plot_results(df, dataset_name, y, x, x_ticks, y_label, x_label, output_filename, title_prefix=""):
-    plt.figure(figsize=(10, 6))
+def run_sweep(algorithm_class, algorithm_name, base_output_dir, dataset_path, min_ps_list, period_list):
+    # Một lần khai thác ở ngưỡng lỏng nhất cho cả lưới; mỗi điểm vẫn có file mẫu, file thống kê và một dòng kết quả như run_experiment
+    print(f"\n--- Running {algorithm_name} sweep on {os.path.basename(dataset_path)} (minPS={min_ps_list}, period={period_list}) ---")
 
-    color_map = {
-        '3P-ECLAT': 'C1',
-        '3P-ECLAT Pruning': 'red'
-    }
+    algo_output_dir = os.path.join(base_output_dir, algorithm_name)
+    os.makedirs(algo_output_dir, exist_ok=True)
+    dataset_stem = os.path.splitext(os.path.basename(dataset_path))[0]
 
-    for algorithm in df['algorithm'].unique():
-        subset = df[(df['dataset'] == dataset_name) & (df['algorithm'] == algorithm)]
-        subset = subset.sort_values(by=x)
-        plt.plot(subset[x] * 1000, subset[y], marker='o', label=algorithm, color=color_map.get(algorithm))
-
-    plt.xlabel(x_label)
-    plt.ylabel(y_label)
-    plt.title(f'{title_prefix}{y} vs. {x} on {dataset_name}')
-    plt.xticks(x_ticks)
-    plt.legend()
-    plt.grid(False)
-    plt.tight_layout()
-    plt.savefig(output_filename)
-    plt.close()
-    print(f"Đã lưu biểu đồ vào: {output_filename}")
+    miner = algorithm_class(minPS=min(min_ps_list), period=max(period_list), cache=True)
+    results = []
+    points = miner.sweep(dataset_path, min_ps_list, period_list)
+    summary_file = write_summary(miner.get_database_summary(), os.path.join(algo_output_dir, f"{dataset_stem}_database.json"))
+    for point in points:
+        min_ps, period = point['minPS'], point['period']
+        suffix = f"minPS_{str(min_ps).replace('.', '_')}_per_{str(period).replace('.', '_')}.txt"
+        stats_file = os.path.join(algo_output_dir, f"{dataset_stem}_stats_{suffix}")
+        patterns_file = os.path.join(algo_output_dir, f"{dataset_stem}_patterns_{suffix}")
+
+        with open(patterns_file, "w", encoding="utf-8") as f:
+            f.write(f"--- Mẫu Tuần Hoàn Cục Bộ từ {os.path.basename(dataset_path)} ---\n")
+            for pattern, support in point['patterns'].items():
+                f.write(f"{pattern}: {support}\n")
+            f.write("-------------------------------------------------------\n")
+        with open(stats_file, "w", encoding="utf-8") as f:
+            f.write(point['stats'])
+
+        print(f"   (minPS={min_ps}, period={period}) Số lượng mẫu: {point['num_patterns']}, thời gian: {point['execution_time']:.4f} giây")
+        results.append({
+            'algorithm': algorithm_name,
+            'dataset': os.path.basename(dataset_path),
+            'minPS': min_ps,
+            'period': period,
+            'num_patterns': point['num_patterns'],
+            'execution_time': point['execution_time'],
+            'memory_uss': point['memory_uss'],
+            'memory_rss': point['memory_rss'],
+            'memory_peak_rss': point['memory_peak_rss'],
+            'patterns_file': patterns_file,
+            'summary_file': summary_file
+        })
+    return results
+
+def run_ordering_benchmark(algorithms, datasets, database_dir, base_output_dir="output_ordering", plots=True):
+    # Chạy cả hai thuật toán với từng thứ tự duyệt item trên mọi bộ dữ liệu có sẵn, tại ngưỡng cố định của bộ dữ liệu
+    results = []
+    for ds in datasets:
+        dataset_path = os.path.join(database_dir, ds['name'])
+        if not os.path.exists(dataset_path):
+            print(f"Bỏ qua, không tìm thấy dataset: {dataset_path}")
+            continue
+        for algo_info in algorithms:
+            for order in ITEM_ORDERS:
+                results.append(run_experiment(algo_info['class'], algo_info['name'], os.path.join(base_output_dir, order),
+                                              dataset_path, ds['minPS_fixed'], ds['period_fixed'], order))
+    if not results:
+        return None
+
+    df_results = pd.DataFrame(results)
+    os.makedirs(base_output_dir, exist_ok=True)
+    output_csv_file = os.path.join(base_output_dir, "comparison_results_ordering.csv")
+    df_results.to_csv(output_csv_file, index=False)
+    print("\n" + df_results.pivot_table(index=['dataset', 'algorithm'], columns='order', values='execution_time').to_string())
+    if plots:
+        render_results(output_csv_file)
+    return df_results
 
 if __name__ == '__main__':
-    os.makedirs("output", exist_ok=True)
-    os.makedirs("output1", exist_ok=True)
     database_dir = "database"
     results = []
-
-    all_datasets = [
-        {'id': 1, 'name': 'Temporal_T10I4D100K.csv', 'minPS_fixed': 0.008, 'period_fixed': 0.001},
-        {'id': 2, 'name': 'Temporal_T20I6D100K.csv', 'minPS_fixed': 0.0034, 'period_fixed': 0.006},
-        {'id': 3, 'name': 'Transactional_connect.csv', 'minPS_fixed': 0.0002, 'period_fixed': 0.01},
-        {'id': 4, 'name': 'Transactional_retail.csv', 'minPS_fixed': 0.0015, 'period_fixed': 0.0045}
-    ]
-
-    algorithms = [
-        {'name': '3P-ECLAT', 'class': ThreePEclat},
-        {'name': '3P-ECLAT Pruning', 'class': ThreePEclatPruning}
-    ]
-
-    print("Chọn chế độ thử nghiệm:")
-    print("1. Giữ minPS cố định, thay đổi Period")
-    print("2. Giữ Period cố định, thay đổi minPS")
-
-    while True:
-        mode_choice = input("Nhập lựa chọn của bạn (1 hoặc 2): ")
-        if mode_choice in ['1', '2']:
-            break
-        else:
-            print("Lựa chọn không hợp lệ. Vui lòng nhập '1' hoặc '2'.")
-
-    print("\nChọn bộ dữ liệu để chạy thử nghiệm:")
-    for ds in all_datasets:
-        print(f"{ds['id']}. {ds['name']}")
-
-    while True:
-        dataset_choice_id = input("Nhập số của bộ dữ liệu bạn muốn chọn: ")
-        try:
-            dataset_choice_id = int(dataset_choice_id)
-            selected_dataset_info = next((ds for ds in all_datasets if ds['id'] == dataset_choice_id), None)
-            if selected_dataset_info:
+    all_datasets = ALL_DATASETS
+    algorithms = ALGORITHMS
+
+    # Chế độ và bộ dữ liệu có thể truyền qua dòng lệnh để chạy không cần tương tác;
+    # benchmark lặp lại nhiều lần và so sánh với kết quả cũ: xem benchmark.py
+    parser = argparse.ArgumentParser(description="Chạy thử nghiệm 3P-ECLAT và 3P-ECLAT Pruning")
+    parser.add_argument('--mode', choices=['1', '2', '3'])
+    parser.add_argument('--dataset', type=int, choices=[ds['id'] for ds in all_datasets])
+    # Biểu đồ được vẽ sau khi khai thác xong, từ file CSV kết quả; có thể vẽ lại bất cứ lúc nào bằng report.py
+    parser.add_argument('--no-plots', action='store_true')
+    args = parser.parse_args()
+
+    mode_choice = args.mode
+    if mode_choice is None:
+        print("Chọn chế độ thử nghiệm:")
+        print("1. Giữ minPS cố định, thay đổi Period")
+        print("2. Giữ Period cố định, thay đổi minPS")
+        print("3. So sánh thứ tự duyệt item trên tất cả bộ dữ liệu")
+
+        while True:
+            mode_choice = input("Nhập lựa chọn của bạn (1, 2 hoặc 3): ")
+            if mode_choice in ['1', '2', '3']:
                 break
             else:
-                print("Lựa chọn bộ dữ liệu không hợp lệ. Vui lòng nhập lại.")
-        except ValueError:
-            print("Đầu vào không hợp lệ. Vui lòng nhập một số.")
-
-    dataset_path = os.path.join(database_dir, selected_dataset_info['name'])
-    dataset_name_without_ext = os.path.splitext(selected_dataset_info['name'])[0]
+                print("Lựa chọn không hợp lệ. Vui lòng nhập '1', '2' hoặc '3'.")
 
-    if not os.path.exists(dataset_path):
-        print(f"Không tìm thấy dataset: {dataset_path}")
+    if mode_choice == '3':
+        run_ordering_benchmark(algorithms, all_datasets, database_dir, plots=not args.no_plots)
     else:
-        if mode_choice == '1':
-            current_min_ps = selected_dataset_info['minPS_fixed']
-            periods_to_test = [0.001, 0.005, 0.007, 0.01, 0.05, 0.07]
-            base_output_for_mode = f"output_{dataset_name_without_ext}_minPS_fixed"
-            os.makedirs(base_output_for_mode, exist_ok=True)
-
-            print(f"\n--- Chạy thử nghiệm với minPS cố định ({current_min_ps}) và thay đổi Period ---")
-            for period in periods_to_test:
+        selected_dataset_info = next((ds for ds in all_datasets if ds['id'] == args.dataset), None)
+        if selected_dataset_info is None:
+            print("\nChọn bộ dữ liệu để chạy thử nghiệm:")
+            for ds in all_datasets:
+                print(f"{ds['id']}. {ds['name']}")
+
+        while selected_dataset_info is None:
+            dataset_choice_id = input("Nhập số của bộ dữ liệu bạn muốn chọn: ")
+            try:
+                dataset_choice_id = int(dataset_choice_id)
+                selected_dataset_info = next((ds for ds in all_datasets if ds['id'] == dataset_choice_id), None)
+                if selected_dataset_info is None:
+                    print("Lựa chọn bộ dữ liệu không hợp lệ. Vui lòng nhập lại.")
+            except ValueError:
+                print("Đầu vào không hợp lệ. Vui lòng nhập một số.")
+
+        dataset_path = os.path.join(database_dir, selected_dataset_info['name'])
+        dataset_name_without_ext = os.path.splitext(selected_dataset_info['name'])[0]
+
+        if not os.path.exists(dataset_path):
+            print(f"Không tìm thấy dataset: {dataset_path}")
+        else:
+            if mode_choice == '1':
+                current_min_ps = selected_dataset_info['minPS_fixed']
+                periods_to_test = [0.001, 0.005, 0.007, 0.01, 0.05, 0.07]
+                base_output_for_mode = f"output_{dataset_name_without_ext}_minPS_fixed"
+                os.makedirs(base_output_for_mode, exist_ok=True)
+
+                print(f"\n--- Chạy thử nghiệm với minPS cố định ({current_min_ps}) và thay đổi Period ---")
                 for algo_info in algorithms:
-                    result = run_experiment(algo_info['class'], algo_info['name'], base_output_for_mode, dataset_path, current_min_ps, period)
-                    results.append(result)
-
-            df_results = pd.DataFrame(results)
-            output_csv_file = os.path.join(base_output_for_mode, f"comparison_results_minPS_fixed_{dataset_name_without_ext}.csv")
-            df_results.to_csv(output_csv_file, index=False)
-
-            x_ticks = [p * 1000 for p in periods_to_test]
-            plot_results(df_results, selected_dataset_info['name'], 'execution_time', 'period', x_ticks, "Runtime (second)", "per ($\\times 10^{-3}$)",
-                         os.path.join(base_output_for_mode, f"{dataset_name_without_ext}_runtime_vs_per.png"), 
-                         title_prefix="Runtime ")
-            plot_results(df_results, selected_dataset_info['name'], 'num_patterns', 'period', x_ticks, "Number of patterns", "per ($\\times 10^{-3}$)",
-                         os.path.join(base_output_for_mode, f"{dataset_name_without_ext}_patterns_vs_per.png"), 
-                         title_prefix="Number of Patterns ")
-            plot_results(df_results, selected_dataset_info['name'], 'memory_uss', 'period', x_ticks, "Memory USS (MB)", "per ($\\times 10^{-3}$)",
-                         os.path.join(base_output_for_mode, f"{dataset_name_without_ext}_memory_uss_vs_per.png"), 
-                         title_prefix="Memory USS ")
-            plot_results(df_results, selected_dataset_info['name'], 'memory_rss', 'period', x_ticks, "Memory RSS (MB)", "per ($\\times 10^{-3}$)",
-                         os.path.join(base_output_for_mode, f"{dataset_name_without_ext}_memory_rss_vs_per.png"), 
-                         title_prefix="Memory RSS ")
-
-        elif mode_choice == '2':
-            current_period = selected_dataset_info['period_fixed']
-            min_ps_to_test = [0.001, 0.005, 0.007, 0.01, 0.05, 0.07]
-            base_output_for_mode = f"output_{dataset_name_without_ext}_period_fixed"
-            os.makedirs(base_output_for_mode, exist_ok=True)
-
-            print(f"\n--- Chạy thử nghiệm với Period cố định ({current_period}) và thay đổi minPS ---")
-            for min_ps in min_ps_to_test:
+                    results.extend(run_sweep(algo_info['class'], algo_info['name'], base_output_for_mode, dataset_path, [current_min_ps], periods_to_test))
+
+                df_results = pd.DataFrame(results)
+                output_csv_file = os.path.join(base_output_for_mode, f"comparison_results_minPS_fixed_{dataset_name_without_ext}.csv")
+                df_results.to_csv(output_csv_file, index=False)
+
+                if not args.no_plots:
+                    render_results(output_csv_file)
+
+            elif mode_choice == '2':
+                current_period = selected_dataset_info['period_fixed']
+                min_ps_to_test = [0.001, 0.005, 0.007, 0.01, 0.05, 0.07]
+                base_output_for_mode = f"output_{dataset_name_without_ext}_period_fixed"
+                os.makedirs(base_output_for_mode, exist_ok=True)
+
+                print(f"\n--- Chạy thử nghiệm với Period cố định ({current_period}) và thay đổi minPS ---")
                 for algo_info in algorithms:
-                    result = run_experiment(algo_info['class'], algo_info['name'], base_output_for_mode, dataset_path, min_ps, current_period)
-                    results.append(result)
-
-            df_results = pd.DataFrame(results)
-            output_csv_file = os.path.join(base_output_for_mode, f"comparison_results_period_fixed_{dataset_name_without_ext}.csv")
-            df_results.to_csv(output_csv_file, index=False)
-
-            x_ticks = [p * 1000 for p in min_ps_to_test]
-            plot_results(df_results, selected_dataset_info['name'], 'execution_time', 'minPS', x_ticks, "Runtime (second)", "minPS ($\\times 10^{-3}$)",
-                         os.path.join(base_output_for_mode, f"{dataset_name_without_ext}_runtime_vs_minPS.png"), 
-                         title_prefix="Runtime ")
-            plot_results(df_results, selected_dataset_info['name'], 'num_patterns', 'minPS', x_ticks, "Number of patterns", "minPS ($\\times 10^{-3}$)",
-                         os.path.join(base_output_for_mode, f"{dataset_name_without_ext}_patterns_vs_minPS.png"), 
-                         title_prefix="Number of Patterns ")
-            plot_results(df_results, selected_dataset_info['name'], 'memory_uss', 'minPS', x_ticks, "Memory USS (MB)", "minPS ($\\times 10^{-3}$)",
-                         os.path.join(base_output_for_mode, f"{dataset_name_without_ext}_memory_uss_vs_minPS.png"), 
-                         title_prefix="Memory USS ")
-            plot_results(df_results, selected_dataset_info['name'], 'memory_rss', 'minPS', x_ticks, "Memory RSS (MB)", "minPS ($\\times 10^{-3}$)",
-                         os.path.join(base_output_for_mode, f"{dataset_name_without_ext}_memory_rss_vs_minPS.png"), 
-                         title_prefix="Memory RSS ")
+                    results.extend(run_sweep(algo_info['class'], algo_info['name'], base_output_for_mode, dataset_path, min_ps_to_test, [current_period]))
+
+                df_results = pd.DataFrame(results)
+                output_csv_file = os.path.join(base_output_for_mode, f"comparison_results_period_fixed_{dataset_name_without_ext}.csv")
+                df_results.to_csv(output_csv_file, index=False)
+
+                if not args.no_plots:
+                    render_results(output_csv_file)
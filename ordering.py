@@ -0,0 +1,32 @@
+import numpy as np
+
+# Thứ tự duyệt item ở gốc cây tìm kiếm; phần tử đầu là mặc định (support giảm dần như trước)
+ITEM_ORDERS = ('descending', 'ascending', 'length', 'density')
+
+
+def order_items(frequent, supports, vertical_ts, bounds, order):
+    # frequent: chỉ số các item đạt ngưỡng; trả về các chỉ số đó theo thứ tự duyệt. Sắp xếp ổn định nên
+    # các item cùng khóa giữ thứ tự xuất hiện trong file.
+    # 'length': số timestamp tăng dần; 'density': số timestamp / khoảng thời gian item xuất hiện, tăng dần
+    if order not in ITEM_ORDERS:
+        raise ValueError(f"Thứ tự item không được hỗ trợ: {order}")
+    first = last = None
+    if order == 'density':
+        first = np.minimum.reduceat(vertical_ts, bounds[:-1])
+        last = np.maximum.reduceat(vertical_ts, bounds[:-1])
+    return order_by_stats(frequent, supports, np.diff(bounds), first, last, order)
+
+
+def order_by_stats(frequent, supports, lengths, first, last, order):
+    # Như order_items khi đã có sẵn số timestamp, timestamp đầu / cuối của từng item (CSDL trên đĩa)
+    if order not in ITEM_ORDERS:
+        raise ValueError(f"Thứ tự item không được hỗ trợ: {order}")
+    if order == 'descending':
+        key = -supports[frequent]
+    elif order == 'ascending':
+        key = supports[frequent]
+    elif order == 'length':
+        key = lengths[frequent]
+    else:
+        key = lengths[frequent] / (last[frequent] - first[frequent] + 1)
+    return frequent[np.argsort(key, kind='stable')]
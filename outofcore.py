@@ -0,0 +1,258 @@
+import glob
+import json
+import os
+import shutil
+from collections import Counter
+import numpy as np
+from dbcache import file_digest
+from loader import CHUNK_SIZE, SUMMARY_TOP_N, _Builder, count_lines, read_blocks, summarize
+from support import grouped_periodic_support
+
+VERSION = 1
+STORE_EXT = '.3pvp'
+# Bộ nhớ (MB) cho dữ liệu của một bước: khối văn bản khi đọc file, một partition khi trộn,
+# các tid-list được nạp cùng lúc khi khai thác
+MEMORY_LIMIT = 256
+_ITEM_ARRAYS = ('counts', 'partition', 'starts', 'first', 'last')
+
+
+def _grow(arr, size, fill):
+    if len(arr) >= size:
+        return arr
+    grown = np.full(max(size, 2 * len(arr)), fill, dtype=arr.dtype)
+    grown[:len(arr)] = arr
+    return grown
+
+
+class VerticalStore:
+    # CSDL dạng dọc trên đĩa: timestamp của item k (thứ tự trong file) nằm ở partition[k], từ vị trí starts[k],
+    # dài counts[k]; part_<p>.sorted.bin chứa cùng dữ liệu đã sắp xếp trong từng item (chỉ ghi khi file không theo
+    # thứ tự thời gian). universe.bin là các timestamp khác nhau đã sắp xếp; độ dài giao dịch chỉ được giữ dưới dạng
+    # histogram (length_counts). Mọi lần đọc tid-list đi qua read() để đếm số byte đọc từ đĩa
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != VERSION:
+            raise ValueError(f"CSDL trên đĩa không hợp lệ: {directory}")
+        self.labels = meta['labels']
+        self.num_lines = meta['num_lines']
+        self.num_transactions = meta['num_transactions']
+        self.sorted_input = meta['sorted_input']
+        self.num_partitions = meta['num_partitions']
+        self.length_counts = meta['length_counts']
+        self.bytes_written = 0
+        self.bytes_read = 0
+        with np.load(os.path.join(directory, 'items.npz')) as items:
+            for name in _ITEM_ARRAYS:
+                setattr(self, name, items[name])
+
+    def __len__(self):
+        return self.num_transactions
+
+    def _file(self, name):
+        return os.path.join(self.directory, name)
+
+    def _memmap(self, name, dtype):
+        path = self._file(name)
+        if os.path.getsize(path) == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r')
+
+    @property
+    def timestamps(self):
+        # Các timestamp khác nhau đã sắp xếp (dùng làm TidUniverse), nạp bằng memmap
+        return self._memmap('universe.bin', np.int64)
+
+    def item_frequencies(self):
+        return self.counts
+
+    def item_counter(self):
+        return Counter(dict(zip(self.labels, self.counts.tolist())))
+
+    def summary(self, top_n=SUMMARY_TOP_N):
+        return summarize(self.labels, self.counts, self.length_counts, top_n)
+
+    def _part_name(self, p, sorted_values):
+        if sorted_values and not self.sorted_input:
+            return f"part_{p:05d}.sorted.bin"
+        return f"part_{p:05d}.bin"
+
+    def read(self, item, sorted_values=True):
+        # Tid-list của một item (timestamp tăng dần, hoặc theo thứ tự trong file nếu sorted_values=False)
+        count = int(self.counts[item])
+        values = np.fromfile(self._file(self._part_name(self.partition[item], sorted_values)), dtype=np.int64,
+                             count=count, offset=int(self.starts[item]) * 8)
+        self.bytes_read += values.nbytes
+        return values
+
+    def read_partition(self, p, sorted_values=True):
+        values = np.fromfile(self._file(self._part_name(p, sorted_values)), dtype=np.int64)
+        self.bytes_read += values.nbytes
+        return values
+
+    def single_supports(self, period):
+        # Một lượt qua các partition, trả về ba support của mỗi item đơn: theo thứ tự trong file (chọn item phổ biến
+        # như _creatingOneitemSets), trên timestamp đã sắp xếp còn giữ trùng (support được lưu của item đơn)
+        # và trên tid-list đã bỏ timestamp trùng (dùng cho các bước sinh ứng viên)
+        file_supports = np.zeros(len(self.labels), dtype=np.int64)
+        supports = np.zeros(len(self.labels), dtype=np.int64)
+        unique_supports = np.zeros(len(self.labels), dtype=np.int64)
+        for p in range(self.num_partitions):
+            members = np.flatnonzero(self.partition == p)
+            rows = np.repeat(np.arange(len(members)), self.counts[members])
+            values = self.read_partition(p, sorted_values=False)
+            file_supports[members] = grouped_periodic_support(rows, values, period, len(members))
+            if not self.sorted_input:
+                values = self.read_partition(p)
+            supports[members] = grouped_periodic_support(rows, values, period, len(members))
+            # Khoảng cách 0 là timestamp trùng, bị bỏ khi đưa về tid-list
+            unique = np.ones(len(values), dtype=bool)
+            unique[1:] = (rows[1:] != rows[:-1]) | (values[1:] != values[:-1])
+            unique_supports[members] = grouped_periodic_support(rows[unique], values[unique], period, len(members))
+        return file_supports, supports, unique_supports
+
+
+def build_store(path, sep, directory, memory_limit=MEMORY_LIMIT, chunk_size=CHUNK_SIZE):
+    # Sắp xếp ngoài: mỗi khối của file được đổi sang dạng dọc (sắp theo item, giữ thứ tự trong file) và ghi thành
+    # một run trên đĩa; sau đó các item được chia thành partition vừa với memory_limit và mỗi partition được
+    # ghép từ phần tương ứng của mọi run. Bộ nhớ chỉ phụ thuộc kích thước khối / partition và số item
+    budget = max(1, memory_limit * (1 << 20) // 8)
+    chunk_size = max(1, min(chunk_size, memory_limit * (1 << 20) // 16))
+    tmp_dir = directory + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    written = 0
+    builder = _Builder()
+    runs = []
+    totals = np.zeros(0, dtype=np.int64)
+    first = np.zeros(0, dtype=np.int64)
+    last = np.zeros(0, dtype=np.int64)
+    length_counts = np.zeros(0, dtype=np.int64)
+    num_lines = 0
+    num_transactions = 0
+    sorted_input = True
+    previous = None
+    with open(path, 'r', encoding='utf-8') as f, \
+            open(os.path.join(tmp_dir, 'universe.bin'), 'wb') as universe_file:
+        for block in read_blocks(f, chunk_size):
+            num_lines += count_lines(block)
+            builder.add_chunk(block, sep)
+            items, lengths, timestamps = builder.drain()
+            if not len(lengths):
+                continue
+            num_transactions += len(lengths)
+            length_counts = _grow(length_counts, int(lengths.max()) + 1, 0)
+            length_counts[:int(lengths.max()) + 1] += np.bincount(lengths)
+            if sorted_input and (np.any(np.diff(timestamps) < 0) or (previous is not None and timestamps[0] < previous)):
+                sorted_input = False
+            unique = np.unique(timestamps)
+            if previous is not None and sorted_input and unique[0] == previous:
+                unique = unique[1:]
+            previous = int(timestamps[-1]) if sorted_input else None
+            universe_file.write(unique.tobytes())
+            written += unique.nbytes
+            # Run: các cặp (item, timestamp) của khối, sắp theo item, giữ thứ tự trong file
+            rows = np.repeat(np.arange(len(timestamps)), lengths)
+            order = np.argsort(items, kind='stable')
+            run_items = items[order]
+            run_values = timestamps[rows[order]]
+            present, run_starts = np.unique(run_items, return_index=True)
+            run_counts = np.diff(np.append(run_starts, len(run_items)))
+            size = len(builder.labels)
+            totals = _grow(totals, size, 0)
+            first = _grow(first, size, np.iinfo(np.int64).max)
+            last = _grow(last, size, np.iinfo(np.int64).min)
+            totals[present] += run_counts
+            first[present] = np.minimum(first[present], np.minimum.reduceat(run_values, run_starts))
+            last[present] = np.maximum(last[present], np.maximum.reduceat(run_values, run_starts))
+            run_file = os.path.join(tmp_dir, f"run_{len(runs):05d}.bin")
+            run_values.tofile(run_file)
+            written += run_values.nbytes
+            runs.append((run_file, present, run_starts, run_counts))
+    num_items = len(builder.labels)
+    totals, first, last = totals[:num_items], first[:num_items], last[:num_items]
+
+    # Chia item (theo id) thành các partition tối đa budget / 4 timestamp; item lớn hơn thì đứng riêng
+    partition = np.zeros(num_items, dtype=np.int64)
+    starts = np.zeros(num_items, dtype=np.int64)
+    bounds = [0]
+    size = 0
+    for k in range(num_items):
+        if size and size + totals[k] > budget // 4:
+            bounds.append(k)
+            size = 0
+        partition[k] = len(bounds) - 1
+        starts[k] = size
+        size += totals[k]
+    bounds.append(num_items)
+    num_partitions = len(bounds) - 1 if num_items else 0
+    for p in range(num_partitions):
+        lo, hi = bounds[p], bounds[p + 1]
+        values = np.empty(int(totals[lo:hi].sum()), dtype=np.int64)
+        cursor = starts[lo:hi].copy()
+        for run_file, present, run_starts, run_counts in runs:
+            a, b = np.searchsorted(present, [lo, hi])
+            if a == b:
+                continue
+            begin = run_starts[a]
+            end = run_starts[b] if b < len(present) else run_starts[-1] + run_counts[-1]
+            segment = np.fromfile(run_file, dtype=np.int64, count=int(end - begin), offset=int(begin) * 8)
+            # Phần của item k trong run được nối tiếp vào sau phần của các run trước
+            counts = run_counts[a:b]
+            target = np.repeat(cursor[present[a:b] - lo] - (run_starts[a:b] - begin), counts)
+            values[target + np.arange(len(segment))] = segment
+            cursor[present[a:b] - lo] += counts
+        values.tofile(os.path.join(tmp_dir, f"part_{p:05d}.bin"))
+        written += values.nbytes
+        if not sorted_input:
+            rows = np.repeat(np.arange(hi - lo), totals[lo:hi])
+            values = values[np.lexsort((values, rows))]
+            values.tofile(os.path.join(tmp_dir, f"part_{p:05d}.sorted.bin"))
+            written += values.nbytes
+    for run_file, _, _, _ in runs:
+        os.remove(run_file)
+    if not sorted_input:
+        # File không theo thứ tự thời gian: các timestamp khác nhau của từng khối được gộp lại trong bộ nhớ
+        universe_path = os.path.join(tmp_dir, 'universe.bin')
+        universe = np.unique(np.fromfile(universe_path, dtype=np.int64))
+        universe.tofile(universe_path)
+        written += universe.nbytes
+
+    np.savez(os.path.join(tmp_dir, 'items.npz'), counts=totals, partition=partition, starts=starts, first=first, last=last)
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': VERSION, 'labels': builder.labels, 'num_lines': num_lines,
+            'num_transactions': num_transactions, 'sorted_input': sorted_input, 'num_partitions': num_partitions,
+            'length_counts': [[int(v), int(c)] for v, c in enumerate(length_counts) if c],
+        }, f)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+    store = VerticalStore(directory)
+    store.bytes_written = written
+    return store
+
+
+def store_path(path, sep, root=None):
+    # Thư mục CSDL trên đĩa nằm cạnh file nguồn (hoặc trong root), tên gắn với hash nội dung và ký tự phân tách
+    name = f"{os.path.basename(path)}.{file_digest(path, sep)}{STORE_EXT}"
+    return os.path.join(root if root else os.path.dirname(path), name)
+
+
+def remove_stale(path, keep):
+    for old in glob.glob(os.path.join(glob.escape(os.path.dirname(keep)), f"{glob.escape(os.path.basename(path))}.*{STORE_EXT}")):
+        if old != keep:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def read_store(path, sep, root=None, memory_limit=MEMORY_LIMIT):
+    # Lần đầu: sắp xếp ngoài file văn bản thành các partition trên đĩa; các lần sau chỉ mở lại thư mục đó
+    target = store_path(path, sep, root)
+    if os.path.isdir(target):
+        try:
+            return VerticalStore(target)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Cảnh báo: Không đọc được CSDL trên đĩa {target}: {e}")
+    store = build_store(path, sep, target, memory_limit)
+    remove_stale(path, target)
+    return store
@@ -0,0 +1,73 @@
+import copy
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+# Các trường lớn của miner không gửi sang tiến trình con (dữ liệu đi qua shared memory)
+_HEAVY_FIELDS = {
+    '_Database': [], '_tidList': {}, '_finalPatterns': {}, '_universe': None,
+    '_initialClass': None, '_vertical': {}, '_gapHistograms': {}, '_activeSink': None, '_profiler': None, '_levels': [],
+}
+
+_worker = {}
+
+
+class SharedArrays:
+    # Gộp các mảng int64 chỉ đọc vào một khối shared memory; tiến trình con tạo view không sao chép
+    def __init__(self, arrays):
+        lengths = [len(a) for a in arrays]
+        total = sum(lengths)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(total, 1) * 8)
+        buf = np.ndarray((total,), dtype=np.int64, buffer=self._shm.buf)
+        layout = []
+        offset = 0
+        for arr, n in zip(arrays, lengths):
+            buf[offset:offset + n] = arr
+            layout.append((offset, n))
+            offset += n
+        self.spec = (self._shm.name, total, layout)
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+
+def attach_arrays(spec):
+    name, total, layout = spec
+    shm = shared_memory.SharedMemory(name=name)
+    buf = np.ndarray((total,), dtype=np.int64, buffer=shm.buf)
+    buf.flags.writeable = False
+    return shm, [buf[offset:offset + n] for offset, n in layout]
+
+
+def _init_worker(miner, spec):
+    shm, arrays = attach_arrays(spec)
+    _worker['shm'] = shm
+    miner._attach_shared(arrays)
+    _worker['miner'] = miner
+
+
+def _run_class(index):
+    miner = _worker['miner']
+    miner._finalPatterns = {}
+    miner._gapHistograms = {}
+    miner._counters = dict.fromkeys(miner._counters, 0)
+    miner._mine_class(index)
+    return index, (miner._finalPatterns, miner._gapHistograms, miner._counters)
+
+
+def mine_classes(miner, arrays, costs, workers):
+    # Mỗi lớp tương đương (một item đầu) là một tác vụ, trả về (mẫu, histogram khoảng cách, bộ đếm phép giao) của từng lớp; lớp lớn nhất được giao trước,
+    # các tiến trình rảnh tự lấy tác vụ kế tiếp nên lớp lớn không kéo dài thời gian tổng
+    light = copy.copy(miner)
+    light.__dict__.update({k: copy.copy(v) for k, v in _HEAVY_FIELDS.items()})
+    order = sorted(range(len(costs)), key=lambda i: costs[i], reverse=True)
+    results = [None] * len(costs)
+    shared = SharedArrays(arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(light, shared.spec)) as executor:
+            for index, result in executor.map(_run_class, order):
+                results[index] = result
+    finally:
+        shared.close()
+    return results
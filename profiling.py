@@ -0,0 +1,180 @@
+import contextlib
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import psutil
+
+
+def reset_peak_rss():
+    # Linux cho phép đặt lại VmHWM để đo đỉnh bộ nhớ của từng lần chạy
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    info = psutil.Process(os.getpid()).memory_info()
+    if hasattr(info, 'peak_wset'):
+        return info.peak_wset
+    try:
+        import resource
+    except ImportError:
+        return info.rss
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+# Các pha được đo của một lần chạy; thời gian khai thác báo cáo = load + one_itemset + generation cho cả hai thuật toán
+PHASES = ('load', 'one_itemset', 'generation', 'output', 'stats')
+MINING_PHASES = ('load', 'one_itemset', 'generation')
+SAMPLE_INTERVAL = 0.05
+TRACEMALLOC_TOP = 10
+_MB = 1024 * 1024
+
+
+def memory_usage():
+    # (USS, RSS) hiện tại tính theo byte; USS cần memory_full_info, nền tảng không hỗ trợ thì dùng RSS
+    process = psutil.Process(os.getpid())
+    try:
+        info = process.memory_full_info()
+    except (psutil.AccessDenied, NotImplementedError):
+        info = process.memory_info()
+    return getattr(info, 'uss', info.rss), info.rss
+
+
+def merge_counters(total, part):
+    # Gộp bộ đếm của một lớp (tiến trình con) vào tổng: max_depth lấy lớn nhất, các bộ đếm khác cộng dồn
+    for key, value in part.items():
+        if key == 'max_depth':
+            total[key] = max(total.get(key, 0), value)
+        else:
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+class MemorySampler:
+    # Luồng nền đọc RSS / USS của tiến trình theo chu kỳ và giữ giá trị lớn nhất trong suốt lần chạy,
+    # thay vì chỉ đo một lần lúc kết thúc
+    def __init__(self, interval=SAMPLE_INTERVAL, uss=True):
+        self.interval = interval
+        self.uss = uss
+        self.peak_rss = 0
+        self.peak_uss = 0
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        process = psutil.Process(os.getpid())
+        try:
+            info = process.memory_full_info() if self.uss else process.memory_info()
+        except (psutil.AccessDenied, NotImplementedError):
+            self.uss = False
+            info = process.memory_info()
+        self.peak_rss = max(self.peak_rss, info.rss)
+        self.peak_uss = max(self.peak_uss, getattr(info, 'uss', 0))
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._stop.clear()
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name='memory-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self._sample()
+        return self
+
+
+class Profiler:
+    # Đo thời gian từng pha, bộ nhớ đỉnh (VmHWM + luồng lấy mẫu RSS / USS) và tùy chọn tracemalloc theo pha
+    def __init__(self, trace_memory=False, interval=SAMPLE_INTERVAL):
+        self.trace_memory = trace_memory
+        self.interval = interval
+        self.phases = {}
+        self.traced = {}
+        self.top_allocations = []
+        self._sampler = None
+        self._report = {}
+
+    def start(self):
+        self.phases = {}
+        self.traced = {}
+        self.top_allocations = []
+        self._report = {}
+        reset_peak_rss()
+        if self.trace_memory:
+            tracemalloc.start()
+        self._sampler = MemorySampler(self.interval).start()
+        return self
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+            if self.trace_memory and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                previous = self.traced.get(name, {'current_mb': 0.0, 'peak_mb': 0.0})
+                self.traced[name] = {'current_mb': current / _MB, 'peak_mb': max(previous['peak_mb'], peak / _MB)}
+                tracemalloc.reset_peak()
+
+    def elapsed(self, names=MINING_PHASES):
+        return sum(self.phases.get(name, 0.0) for name in names)
+
+    def stop(self, counters=None):
+        if self._sampler is None:
+            return self._report
+        sampler, self._sampler = self._sampler.stop(), None
+        if self.trace_memory and tracemalloc.is_tracing():
+            stats = tracemalloc.take_snapshot().statistics('lineno')[:TRACEMALLOC_TOP]
+            self.top_allocations = [f"{stat.traceback}: {stat.size / _MB:.2f} MB ({stat.count} khối)" for stat in stats]
+            tracemalloc.stop()
+        self._report = {
+            'phases': {name: self.phases[name] for name in PHASES if name in self.phases},
+            'execution_time': self.elapsed(),
+            'memory_peak_rss': max(peak_rss(), sampler.peak_rss) / _MB,
+            'memory_sampled_peak_rss': sampler.peak_rss / _MB,
+            'memory_peak_uss': sampler.peak_uss / _MB,
+            'memory_samples': sampler.samples,
+            'counters': dict(counters or {}),
+        }
+        if self.trace_memory:
+            self._report['tracemalloc'] = self.traced
+            self._report['tracemalloc_top'] = self.top_allocations
+        return self._report
+
+    def report(self):
+        return self._report
+
+
+def flatten_profile(report):
+    # Dạng phẳng để ghép vào một dòng kết quả (DataFrame / CSV)
+    row = {f"time_{name}": report.get('phases', {}).get(name, 0.0) for name in PHASES}
+    for key in ('memory_peak_uss', 'memory_sampled_peak_rss'):
+        row[key] = report.get(key, 0.0)
+    row.update(report.get('counters', {}))
+    return row
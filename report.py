@@ -0,0 +1,197 @@
+import argparse
+import json
+import os
+import pandas as pd
+from results import iter_patterns
+
+COLOR_MAP = {
+    '3P-ECLAT': 'C1',
+    '3P-ECLAT Pruning': 'red'
+}
+
+# Trục x của biểu đồ quét ngưỡng: cột trong CSV -> (hậu tố tên file, nhãn trục)
+SWEEP_AXES = {
+    'period': ('per', "per ($\\times 10^{-3}$)"),
+    'minPS': ('minPS', "minPS ($\\times 10^{-3}$)"),
+}
+
+# Các đại lượng vẽ theo ngưỡng: cột -> (tên trong file, nhãn trục y, tiền tố tiêu đề)
+SWEEP_METRICS = {
+    'execution_time': ('runtime', "Runtime (second)", "Runtime "),
+    'num_patterns': ('patterns', "Number of patterns", "Number of Patterns "),
+    'memory_uss': ('memory_uss', "Memory USS (MB)", "Memory USS "),
+    'memory_rss': ('memory_rss', "Memory RSS (MB)", "Memory RSS "),
+}
+
+
+def _pyplot():
+    # matplotlib chỉ được nạp khi thực sự vẽ, không bao giờ trong lúc khai thác
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def write_summary(summary, output_file):
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False)
+    return output_file
+
+
+def read_patterns(patterns_file):
+    # Trả về (độ dài, support) của từng mẫu trong file kết quả: text, JSONL nén hoặc Parquet
+    lengths, supports = [], []
+    for pattern, support in iter_patterns(patterns_file):
+        lengths.append(len(pattern))
+        supports.append(support)
+    return lengths, supports
+
+
+def plot_database_stats(summary, output_file):
+    plt = _pyplot()
+    plt.figure(figsize=(15, 10))
+
+    # Biểu đồ tần suất item phổ biến
+    item_names = [item for item, frequency in summary['top_items']]
+    frequencies = [frequency for item, frequency in summary['top_items']]
+
+    plt.subplot(2, 2, 1)
+    plt.bar(item_names, frequencies)
+    plt.xlabel('Item')
+    plt.ylabel('Tần suất')
+    plt.title(f'Top {len(item_names)} Item Phổ Biến Nhất')
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+
+    # Biểu đồ phân phối độ dài giao dịch
+    transaction_lengths = [length for length, count in summary['transaction_length_counts']]
+    counts = [count for length, count in summary['transaction_length_counts']]
+
+    plt.subplot(2, 2, 2)
+    plt.hist(transaction_lengths, bins=20, weights=counts, edgecolor='black')
+    plt.xlabel('Độ dài giao dịch')
+    plt.ylabel('Số lượng giao dịch')
+    plt.title('Phân Phối Độ Dài Giao Dịch')
+    plt.tight_layout()
+
+    # Biểu đồ đường tần suất theo số lượng item
+    frequencies = [frequency for frequency, num_items in summary['item_frequency_counts']]
+    no_of_items = [num_items for frequency, num_items in summary['item_frequency_counts']]
+
+    plt.subplot(2, 2, 3)
+    plt.plot(no_of_items, frequencies, marker='o', linestyle='-')
+    plt.xlabel('Số lượng item')
+    plt.ylabel('Tần suất')
+    plt.title('Tần Suất theo Số Lượng Item')
+    plt.grid(True)
+    plt.tight_layout()
+
+    # Biểu đồ đường tần suất theo độ dài giao dịch
+    plt.subplot(2, 2, 4)
+    plt.plot(transaction_lengths, counts, marker='o', linestyle='-')
+    plt.xlabel('Độ dài giao dịch')
+    plt.ylabel('Tần suất')
+    plt.title('Tần Suất theo Độ Dài Giao Dịch')
+    plt.grid(True)
+    plt.tight_layout()
+
+    plt.savefig(output_file)
+    plt.close()
+    print(f"Đã lưu biểu đồ thống kê vào file: {output_file}")
+
+
+def plot_periodic_patterns(pattern_lengths, supports, output_file):
+    if not supports:
+        print("Không có mẫu tuần hoàn nào để vẽ biểu đồ.")
+        return
+
+    plt = _pyplot()
+    plt.figure(figsize=(10, 6))
+    plt.plot(pattern_lengths, supports, marker='o', linestyle='-')
+    plt.xlabel('Độ dài mẫu tuần hoàn')
+    plt.ylabel('Periodic Support')
+    plt.title('Biểu đồ Periodic Support theo Độ dài Mẫu')
+    plt.grid(True)
+    plt.tight_layout()
+
+    plt.savefig(output_file)
+    plt.close()
+    print(f"Đã lưu biểu đồ mẫu tuần hoàn vào file: {output_file}")
+
+
+def plot_results(df, dataset_name, y, x, x_ticks, y_label, x_label, output_filename, title_prefix=""):
+    plt = _pyplot()
+    plt.figure(figsize=(10, 6))
+
+    for algorithm in df['algorithm'].unique():
+        subset = df[(df['dataset'] == dataset_name) & (df['algorithm'] == algorithm)]
+        subset = subset.sort_values(by=x)
+        plt.plot(subset[x] * 1000, subset[y], marker='o', label=algorithm, color=COLOR_MAP.get(algorithm))
+
+    plt.xlabel(x_label)
+    plt.ylabel(y_label)
+    plt.title(f'{title_prefix}{y} vs. {x} on {dataset_name}')
+    plt.xticks(x_ticks)
+    plt.legend()
+    plt.grid(False)
+    plt.tight_layout()
+    plt.savefig(output_filename)
+    plt.close()
+    print(f"Đã lưu biểu đồ vào: {output_filename}")
+
+
+def plot_ordering(df, dataset_name, item_orders, output_filename):
+    plt = _pyplot()
+    subset = df[df['dataset'] == dataset_name]
+    table = subset.pivot(index='order', columns='algorithm', values='execution_time').reindex(item_orders)
+    ax = table.plot(kind='bar', figsize=(10, 6), rot=0)
+    ax.set_xlabel("Item order")
+    ax.set_ylabel("Runtime (second)")
+    ax.set_title(f"Runtime by item order on {dataset_name}")
+    plt.tight_layout()
+    plt.savefig(output_filename)
+    plt.close()
+    print(f"Đã lưu biểu đồ vào: {output_filename}")
+
+
+def render_results(results_csv, patterns=True):
+    # Bước báo cáo, chạy riêng sau khi khai thác: vẽ mọi biểu đồ chỉ từ file CSV kết quả và các file được CSV trỏ tới
+    df = pd.read_csv(results_csv)
+    output_dir = os.path.dirname(results_csv)
+
+    for dataset_name in df['dataset'].unique():
+        dataset_stem = os.path.splitext(dataset_name)[0]
+        subset = df[df['dataset'] == dataset_name]
+        if 'order' in subset and subset['order'].nunique() > 1:
+            item_orders = list(dict.fromkeys(subset['order']))
+            plot_ordering(subset, dataset_name, item_orders, os.path.join(output_dir, f"{dataset_stem}_runtime_vs_order.png"))
+            continue
+        x = 'period' if subset['period'].nunique() > 1 else 'minPS'
+        x_name, x_label = SWEEP_AXES[x]
+        x_ticks = sorted(subset[x].unique() * 1000)
+        for y, (y_name, y_label, title_prefix) in SWEEP_METRICS.items():
+            plot_results(subset, dataset_name, y, x, x_ticks, y_label, x_label,
+                         os.path.join(output_dir, f"{dataset_stem}_{y_name}_vs_{x_name}.png"), title_prefix=title_prefix)
+
+    if 'summary_file' in df:
+        for summary_file in df['summary_file'].dropna().unique():
+            with open(summary_file, encoding="utf-8") as f:
+                summary = json.load(f)
+            plot_database_stats(summary, summary_file.replace('_database.json', '_stats_plot.png'))
+
+    # Biểu đồ của từng điểm (minPS, period) vẽ lại từ file mẫu đã lưu
+    if patterns and 'patterns_file' in df:
+        for patterns_file in df['patterns_file'].dropna():
+            if not os.path.exists(patterns_file):
+                print(f"Bỏ qua, không tìm thấy file mẫu: {patterns_file}")
+                continue
+            lengths, supports = read_patterns(patterns_file)
+            stem = patterns_file[:-len('.jsonl.gz')] if patterns_file.endswith('.jsonl.gz') else os.path.splitext(patterns_file)[0]
+            plot_periodic_patterns(lengths, supports, f"{stem}_plot.png")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Vẽ biểu đồ từ file CSV kết quả của main.py (không khai thác lại)")
+    parser.add_argument('results', nargs='+', help="File comparison_results_*.csv")
+    parser.add_argument('--no-patterns', action='store_true', help="Không vẽ biểu đồ mẫu của từng điểm")
+    args = parser.parse_args()
+    for results_csv in args.results:
+        render_results(results_csv, patterns=not args.no_patterns)
@@ -0,0 +1,297 @@
+import argparse
+import ast
+import gzip
+import json
+import os
+import struct
+import time
+import numpy as np
+
+MAGIC = b'3PRS'
+VERSION = 1
+STORE_EXT = '.3prs'
+_HEADER = struct.Struct('<4sIQ')
+_ARRAYS = ('offsets', 'items', 'supports', 'by_support', 'posting_offsets', 'postings')
+
+
+def iter_patterns(patterns_file):
+    # Đọc (mẫu, support) từ file kết quả: text, JSONL nén hoặc Parquet
+    if patterns_file.endswith('.jsonl.gz'):
+        with gzip.open(patterns_file, "rt", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                yield tuple(record['pattern']), record['support']
+    elif patterns_file.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Cần cài đặt pyarrow để đọc kết quả dạng Parquet (pip install pyarrow)")
+        table = pq.read_table(patterns_file)
+        for pattern, support in zip(table.column('pattern').to_pylist(), table.column('support').to_pylist()):
+            yield tuple(pattern), support
+    else:
+        with open(patterns_file, encoding="utf-8") as f:
+            for line in f:
+                pattern, sep, support = line.rstrip("\n").rpartition(": ")
+                if not sep or line.startswith("---"):
+                    continue
+                pattern = ast.literal_eval(pattern)
+                yield (tuple(pattern) if isinstance(pattern, (tuple, list)) else (pattern,)), int(support)
+
+
+class PatternStore:
+    # Kết quả khai thác chỉ đọc, truy vấn không cần quét toàn bộ. Item được đánh số theo thứ tự nhãn, mẫu được sắp
+    # theo thứ tự từ điển và lưu kiểu CSR (items[offsets[p]:offsets[p + 1]]) cùng support:
+    # - cây tiền tố: mọi mẫu có chung một tiền tố nằm liền nhau, tìm bằng tìm kiếm nhị phân từng mức
+    # - chỉ mục ngược: postings[posting_offsets[k]:posting_offsets[k + 1]] là id các mẫu chứa item k (tăng dần)
+    # - by_support: id mẫu theo support tăng dần để lọc theo khoảng support
+    def __init__(self, labels, arrays, meta=None):
+        self.labels = labels
+        self.meta = meta or {}
+        self.offsets = arrays['offsets']
+        self.items = arrays['items']
+        self.supports = arrays['supports']
+        self.by_support = arrays['by_support']
+        self.posting_offsets = arrays['posting_offsets']
+        self.postings = arrays['postings']
+        self._index = {label: k for k, label in enumerate(labels)}
+
+    @classmethod
+    def from_patterns(cls, patterns, meta=None):
+        # patterns: {tuple item: support} như get_final_patterns() hoặc các cặp (mẫu, support)
+        pairs = list(patterns.items()) if isinstance(patterns, dict) else list(patterns)
+        labels = sorted({item for pattern, _ in pairs for item in pattern})
+        index = {label: k for k, label in enumerate(labels)}
+        n = len(pairs)
+        lengths = np.fromiter((len(pattern) for pattern, _ in pairs), dtype=np.int64, count=n)
+        width = int(lengths.max()) if n else 0
+        # Ma trận n x width, ô trống là len(labels) để sắp xếp từng dòng, sau đó đổi thành -1 (mẫu ngắn đứng trước)
+        matrix = np.full((n, width), len(labels), dtype=np.int64)
+        matrix[np.arange(width) < lengths[:, None]] = np.fromiter(
+            (index[item] for pattern, _ in pairs for item in pattern), dtype=np.int64, count=int(lengths.sum()))
+        matrix.sort(axis=1)
+        matrix[matrix == len(labels)] = -1
+        order = np.lexsort(matrix.T[::-1]) if width else np.arange(n)
+        matrix = matrix[order]
+        lengths = lengths[order]
+        items = matrix[matrix >= 0].astype(np.int32)
+        supports = np.fromiter((support for _, support in pairs), dtype=np.int64, count=n)[order]
+        owners = np.repeat(np.arange(n, dtype=np.int64), lengths)
+        arrays = {
+            'offsets': np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+            'items': items,
+            'supports': supports,
+            'by_support': np.argsort(supports, kind='stable').astype(np.int64),
+            'posting_offsets': np.concatenate(([0], np.cumsum(np.bincount(items, minlength=len(labels))))).astype(np.int64),
+            'postings': owners[np.argsort(items, kind='stable')],
+        }
+        return cls(labels, arrays, meta)
+
+    @classmethod
+    def from_file(cls, patterns_file, meta=None):
+        return cls.from_patterns(iter_patterns(patterns_file), dict(meta or {}, source=os.path.basename(patterns_file)))
+
+    def save(self, path):
+        arrays = {name: np.ascontiguousarray(getattr(self, name)) for name in _ARRAYS}
+        layout = {}
+        offset = 0
+        for name, arr in arrays.items():
+            layout[name] = [arr.dtype.str, offset, len(arr)]
+            offset += (arr.nbytes + 7) // 8 * 8
+        header = json.dumps({'labels': self.labels, 'meta': self.meta, 'arrays': layout}, default=str).encode('utf-8')
+        header += b' ' * (-(_HEADER.size + len(header)) % 8)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(header)))
+            f.write(header)
+            for arr in arrays.values():
+                f.write(arr.tobytes())
+                f.write(b'\0' * (-arr.nbytes % 8))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        # Các mảng là np.memmap chỉ đọc: nạp gần như tức thì, truy vấn chỉ đọc những trang cần thiết
+        with open(path, 'rb') as f:
+            magic, version, header_len = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"File kết quả không hợp lệ: {path}")
+            header = json.loads(f.read(header_len).decode('utf-8'))
+        base = _HEADER.size + header_len
+        arrays = {}
+        for name, (dtype, offset, length) in header['arrays'].items():
+            if length == 0:
+                arrays[name] = np.empty(0, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=base + offset, shape=(length,))
+        return cls(header['labels'], arrays, header['meta'])
+
+    def __len__(self):
+        return len(self.supports)
+
+    def __contains__(self, pattern):
+        return self.get(pattern) is not None
+
+    def pattern(self, pattern_id):
+        labels = self.labels
+        return tuple(labels[k] for k in self.items[self.offsets[pattern_id]:self.offsets[pattern_id + 1]])
+
+    def patterns(self, ids):
+        return {self.pattern(p): int(self.supports[p]) for p in ids}
+
+    def _item_ids(self, items):
+        # None nếu có item không xuất hiện trong kết quả
+        ids = [self._index.get(item) for item in items]
+        return None if None in ids else sorted(set(ids))
+
+    def _narrow(self, lo, hi, depth, item):
+        # Trong [lo, hi) các mẫu có chung depth item đầu nên item thứ depth (-1 nếu mẫu đã hết) không giảm
+        offsets, items = self.offsets, self.items
+
+        def key(p):
+            start = offsets[p] + depth
+            return items[start] if start < offsets[p + 1] else -1
+
+        a, b = lo, hi
+        while a < b:
+            mid = (a + b) // 2
+            if key(mid) < item:
+                a = mid + 1
+            else:
+                b = mid
+        start, b = a, hi
+        while a < b:
+            mid = (a + b) // 2
+            if key(mid) <= item:
+                a = mid + 1
+            else:
+                b = mid
+        return start, a
+
+    def _prefix_range(self, ids):
+        lo, hi = 0, len(self)
+        for depth, item in enumerate(ids):
+            lo, hi = self._narrow(lo, hi, depth, item)
+            if lo == hi:
+                break
+        return lo, hi
+
+    def get(self, pattern):
+        # Support của đúng mẫu này, None nếu không có
+        ids = self._item_ids(pattern)
+        if not ids or len(ids) != len(pattern):
+            return None
+        lo, hi = self._prefix_range(ids)
+        if lo < hi and self.offsets[lo + 1] - self.offsets[lo] == len(ids):
+            return int(self.supports[lo])
+        return None
+
+    def with_prefix(self, prefix):
+        # Id các mẫu có tiền tố (theo thứ tự nhãn) là prefix, kể cả chính prefix
+        ids = self._item_ids(prefix)
+        if ids is None:
+            return np.empty(0, dtype=np.int64)
+        lo, hi = self._prefix_range(ids)
+        return np.arange(lo, hi, dtype=np.int64)
+
+    def containing(self, items):
+        # Id các mẫu chứa mọi item đã cho (tập cha của items): giao danh sách ngược, ngắn nhất trước
+        ids = self._item_ids(items)
+        if ids is None:
+            return np.empty(0, dtype=np.int64)
+        if not ids:
+            return np.arange(len(self), dtype=np.int64)
+        postings = sorted((self.postings[self.posting_offsets[k]:self.posting_offsets[k + 1]] for k in ids), key=len)
+        result = np.asarray(postings[0])
+        for other in postings[1:]:
+            result = result[np.isin(result, other, assume_unique=True)]
+        return result
+
+    def within(self, items):
+        # Id các mẫu chỉ gồm item trong items (tập con của items): mẫu xuất hiện trong đủ len(mẫu) danh sách ngược
+        ids = sorted({self._index[item] for item in items if item in self._index})
+        if not ids:
+            return np.empty(0, dtype=np.int64)
+        candidates, counts = np.unique(np.concatenate([self.postings[self.posting_offsets[k]:self.posting_offsets[k + 1]] for k in ids]), return_counts=True)
+        return candidates[counts == self.offsets[candidates + 1] - self.offsets[candidates]]
+
+    def support_range(self, min_support=None, max_support=None):
+        # Id các mẫu có min_support <= support <= max_support, theo support tăng dần
+        ordered = self.supports[self.by_support]
+        lo = 0 if min_support is None else np.searchsorted(ordered, min_support, 'left')
+        hi = len(ordered) if max_support is None else np.searchsorted(ordered, max_support, 'right')
+        return np.asarray(self.by_support[lo:hi])
+
+    def query(self, contains=None, prefix=None, within=None, min_support=None, max_support=None,
+              min_length=None, max_length=None, limit=None):
+        # Kết hợp các điều kiện; bắt đầu từ chỉ mục chọn lọc nhất rồi lọc phần còn lại trên tập id nhỏ.
+        # Kết quả {mẫu: support} theo support giảm dần, limit giữ các mẫu đầu
+        candidates = None
+        if prefix is not None:
+            candidates = self.with_prefix(prefix)
+        if contains is not None:
+            found = self.containing(contains)
+            candidates = found if candidates is None else candidates[np.isin(candidates, found, assume_unique=True)]
+        if within is not None:
+            found = self.within(within)
+            candidates = found if candidates is None else candidates[np.isin(candidates, found, assume_unique=True)]
+        if candidates is None:
+            candidates = self.support_range(min_support, max_support)
+        else:
+            supports = self.supports[candidates]
+            keep = np.ones(len(candidates), dtype=bool)
+            if min_support is not None:
+                keep &= supports >= min_support
+            if max_support is not None:
+                keep &= supports <= max_support
+            candidates = candidates[keep]
+        if min_length is not None or max_length is not None:
+            lengths = self.offsets[candidates + 1] - self.offsets[candidates]
+            keep = np.ones(len(candidates), dtype=bool)
+            if min_length is not None:
+                keep &= lengths >= min_length
+            if max_length is not None:
+                keep &= lengths <= max_length
+            candidates = candidates[keep]
+        # Support giảm dần, cùng support thì theo thứ tự từ điển
+        candidates = candidates[np.lexsort((candidates, -self.supports[candidates]))]
+        if limit is not None:
+            candidates = candidates[:limit]
+        return self.patterns(candidates)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Tạo và truy vấn kho kết quả mẫu tuần hoàn (*.3prs) mà không cần khai thác lại")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Tạo kho từ file mẫu (text, .jsonl.gz hoặc .parquet)")
+    build_parser.add_argument('patterns_file')
+    build_parser.add_argument('--output', help="Mặc định: cùng tên file mẫu, đuôi .3prs")
+    query_parser = subparsers.add_parser('query', help="Truy vấn một kho đã tạo")
+    query_parser.add_argument('store')
+    query_parser.add_argument('--contains', nargs='+', help="Mẫu chứa mọi item này")
+    query_parser.add_argument('--prefix', nargs='+', help="Mẫu bắt đầu bằng các item này (theo thứ tự nhãn)")
+    query_parser.add_argument('--within', nargs='+', help="Mẫu chỉ gồm các item này")
+    query_parser.add_argument('--min-support', type=int)
+    query_parser.add_argument('--max-support', type=int)
+    query_parser.add_argument('--min-length', type=int)
+    query_parser.add_argument('--max-length', type=int)
+    query_parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.time()
+        store = PatternStore.from_file(args.patterns_file)
+        output = args.output or os.path.splitext(args.patterns_file[:-len('.gz')] if args.patterns_file.endswith('.gz') else args.patterns_file)[0] + STORE_EXT
+        store.save(output)
+        print(f"Đã lưu {len(store)} mẫu vào {output} ({time.time() - start:.2f} giây)")
+    else:
+        start = time.perf_counter()
+        store = PatternStore.load(args.store)
+        loaded = time.perf_counter()
+        found = store.query(args.contains, args.prefix, args.within, args.min_support, args.max_support,
+                            args.min_length, args.max_length, args.limit)
+        done = time.perf_counter()
+        for pattern, support in found.items():
+            print(f"{pattern}: {support}")
+        print(f"{len(found)} mẫu (kho có {len(store)} mẫu), nạp {(loaded - start) * 1000:.1f} ms, truy vấn {(done - loaded) * 1000:.1f} ms")
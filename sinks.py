@@ -0,0 +1,151 @@
+import gzip
+import json
+import os
+from array import array
+
+SINK_TYPES = ('text', 'jsonl', 'parquet', 'count')
+FOOTER = "-------------------------------------------------------\n"
+
+
+class PatternSink:
+    # Nơi nhận mẫu ngay khi tìm được thay vì gom vào _finalPatterns; keep_points=True giữ thêm (độ dài, support)
+    # trong bộ nhớ, còn biểu đồ của report.py được vẽ lại từ file kết quả nên mặc định không giữ
+    def __init__(self, path=None, keep_points=False):
+        self.path = path
+        self.keep_points = keep_points
+        self.count = 0
+        self._lengths = array('i')
+        self._supports = array('q')
+
+    def open(self, source):
+        self.count = 0
+        self._lengths = array('i')
+        self._supports = array('q')
+
+    def emit(self, pattern, support):
+        self.count += 1
+        if self.keep_points:
+            self._lengths.append(len(pattern))
+            self._supports.append(support)
+        self._write(pattern, support)
+
+    def _write(self, pattern, support):
+        pass
+
+    def close(self):
+        return self.count
+
+    def points(self):
+        return list(self._lengths), list(self._supports)
+
+    def __len__(self):
+        return self.count
+
+
+class TextSink(PatternSink):
+    # Cùng định dạng file mẫu như trước, ghi theo từng khối dòng
+    def __init__(self, path, buffer_lines=8192, keep_points=False):
+        super().__init__(path, keep_points)
+        self._buffer_lines = buffer_lines
+        self._buffer = []
+        self._file = None
+
+    def open(self, source):
+        super().open(source)
+        self._buffer = []
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(f"--- Mẫu Tuần Hoàn Cục Bộ từ {source} ---\n")
+
+    def _write(self, pattern, support):
+        self._buffer.append(f"{pattern}: {support}\n")
+        if len(self._buffer) >= self._buffer_lines:
+            self._file.writelines(self._buffer)
+            self._buffer = []
+
+    def close(self):
+        self._file.writelines(self._buffer)
+        self._buffer = []
+        self._file.write(FOOTER)
+        self._file.close()
+        return self.count
+
+
+class JsonlSink(PatternSink):
+    # Mỗi dòng một mẫu {"pattern": [...], "support": n}, nén gzip
+    def __init__(self, path, keep_points=False):
+        super().__init__(path, keep_points)
+        self._file = None
+
+    def open(self, source):
+        super().open(source)
+        self._file = gzip.open(self.path, "wt", encoding="utf-8")
+
+    def _write(self, pattern, support):
+        self._file.write(json.dumps({"pattern": list(pattern), "support": support}, default=str) + "\n")
+
+    def close(self):
+        self._file.close()
+        return self.count
+
+
+class ParquetSink(PatternSink):
+    # Ghi theo lô Arrow (cột pattern: list<string>, support: int64); cần pyarrow
+    def __init__(self, path, batch_size=65536, keep_points=False):
+        super().__init__(path, keep_points)
+        self._batch_size = batch_size
+        self._patterns = []
+        self._values = []
+        self._writer = None
+
+    def open(self, source):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Cần cài đặt pyarrow để ghi kết quả dạng Parquet (pip install pyarrow)")
+        super().open(source)
+        self._pa = pa
+        self._schema = pa.schema([('pattern', pa.list_(pa.string())), ('support', pa.int64())], metadata={'source': str(source)})
+        self._writer = pq.ParquetWriter(self.path, self._schema)
+        self._patterns = []
+        self._values = []
+
+    def _write(self, pattern, support):
+        self._patterns.append([str(item) for item in pattern])
+        self._values.append(support)
+        if len(self._values) >= self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._values:
+            pa = self._pa
+            batch = pa.record_batch([pa.array(self._patterns, type=pa.list_(pa.string())), pa.array(self._values, type=pa.int64())], schema=self._schema)
+            self._writer.write_batch(batch)
+            self._patterns = []
+            self._values = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+        return self.count
+
+
+class CountSink(PatternSink):
+    # Chỉ đếm số mẫu, dùng khi đo hiệu năng
+    def __init__(self):
+        super().__init__(None, keep_points=False)
+
+
+def make_sink(sink, patterns_output_file):
+    if isinstance(sink, PatternSink):
+        return sink
+    stem = os.path.splitext(patterns_output_file)[0]
+    if sink == 'text':
+        return TextSink(patterns_output_file)
+    if sink == 'jsonl':
+        return JsonlSink(stem + '.jsonl.gz')
+    if sink == 'parquet':
+        return ParquetSink(stem + '.parquet')
+    if sink == 'count':
+        return CountSink()
+    raise ValueError(f"Kiểu sink không được hỗ trợ: {sink}")
@@ -0,0 +1,338 @@
+import contextlib
+import io
+import sys
+import time
+import numpy as np
+from bisect import bisect_right
+from collections import deque
+import pandas as pd
+from support import periodic_support
+from loader import read_transactions
+
+
+class ThreePEclatStream:
+    _tidlist_type = list
+
+    # Khai thác tăng dần trên log giao dịch được nối thêm theo thời gian.
+    # Theo dõi (support, timestamp cuối) của các mẫu phổ biến và các ứng viên (mọi tập con trực tiếp đều phổ biến);
+    # nối thêm timestamp chỉ thêm khoảng cách mới nên support của mẫu chỉ cần cộng phần của lô mới.
+    def __init__(self, minPS, period):
+        # Ngưỡng tương đối thay đổi theo kích thước CSDL, nên chế độ tăng dần chỉ nhận ngưỡng tuyệt đối
+        if not isinstance(minPS, int) or not isinstance(period, int):
+            raise ValueError("Chế độ tăng dần chỉ hỗ trợ minPS và period là số nguyên tuyệt đối")
+        self._minPS = minPS
+        self._period = period
+        self._tidList = {}
+        self._state = {}
+        self._finalPatterns = {}
+        self._lastTimestamp = None
+        # Các item đã gặp ở timestamp cuối: giao dịch cùng timestamp ở lô sau vẫn được gộp với chúng
+        self._lastItems = []
+        self._lno = 0
+
+    def _read_batch(self, batch):
+        if isinstance(batch, pd.DataFrame):
+            return list(zip(batch['TS'].tolist(), batch['Transactions'].tolist()))
+        # Dạng [timestamp, item1, item2, ...] như TransactionData hoặc (timestamp, [items])
+        rows = []
+        for row in batch:
+            if len(row) == 2 and isinstance(row[1], (list, tuple, set)):
+                rows.append((row[0], row[1]))
+            else:
+                rows.append((row[0], row[1:]))
+        return rows
+
+    def _update(self, pattern, timeStamps, keep_duplicates=False):
+        # Cộng các khoảng mới (từ timestamp cuối đã biết tới các timestamp của lô) vào support
+        state = self._state.get(pattern)
+        last = state[1] if state is not None else None
+        support = state[0] if state is not None else 0
+        for ts in timeStamps:
+            if last is not None:
+                if ts == last and not keep_duplicates:
+                    continue
+                if ts - last <= self._period:
+                    support += 1
+            last = ts
+        self._state[pattern] = [support, last]
+        if pattern in self._finalPatterns:
+            self._finalPatterns[pattern] = support
+        return support
+
+    @staticmethod
+    def _group_by_timestamp(rows):
+        # Gộp các giao dịch liền nhau có cùng timestamp thành một tập item: như khi khai thác cả CSDL, mẫu xuất hiện
+        # tại timestamp t khi mọi item của mẫu có mặt tại t, dù nằm trong các giao dịch khác nhau
+        groups = []
+        for ts, items in rows:
+            if groups and groups[-1][0] == ts:
+                groups[-1][1].update(items)
+            else:
+                groups.append((ts, set(items)))
+        return [(ts, sorted(items)) for ts, items in groups]
+
+    def _is_candidate(self, pattern):
+        return all(pattern[:k] + pattern[k + 1:] in self._finalPatterns for k in range(len(pattern)))
+
+    def _touch(self, items, ts, touched):
+        # Duyệt các mẫu phổ biến / ứng viên nằm trong giao dịch; chỉ mở rộng từ mẫu phổ biến
+        stack = [((item,), i + 1) for i, item in enumerate(items)]
+        while stack:
+            pattern, start = stack.pop()
+            for k in range(start, len(items)):
+                extended = pattern + (items[k],)
+                if extended in self._finalPatterns:
+                    touched.setdefault(extended, []).append(ts)
+                    stack.append((extended, k + 1))
+                elif self._is_candidate(extended):
+                    touched.setdefault(extended, []).append(ts)
+
+    def _tid_array(self, item, cache):
+        arr = cache.get(item)
+        if arr is None:
+            arr = np.unique(np.asarray(self._tidList[item], dtype=np.int64))
+            cache[item] = arr
+        return arr
+
+    def _track(self, pattern, tidSetX):
+        # Bắt đầu theo dõi một ứng viên từ tid-list đầy đủ của nó; không có lần xuất hiện nào thì không cần lưu
+        if not len(tidSetX):
+            self._state.pop(pattern, None)
+            return 0
+        support = periodic_support(tidSetX, self._period)
+        self._state[pattern] = [support, int(tidSetX[-1])]
+        return support
+
+    def _promote(self, promoted):
+        # Mẫu mới phổ biến sinh ra các ứng viên mới; lịch sử của ứng viên được tính một lần từ tid-list của item
+        if not promoted:
+            return
+        cache = {}
+        seen = set()
+        queue = list(promoted)
+        frequent_items = [p[0] for p in self._finalPatterns if len(p) == 1]
+        while queue:
+            pattern = queue.pop()
+            tidSetP = self._tid_array(pattern[0], cache)
+            for item in pattern[1:]:
+                tidSetP = np.intersect1d(tidSetP, self._tid_array(item, cache), assume_unique=True)
+            for item in frequent_items:
+                if item in pattern:
+                    continue
+                candidate = tuple(sorted(pattern + (item,)))
+                if candidate in seen or candidate in self._finalPatterns or not self._is_candidate(candidate):
+                    continue
+                seen.add(candidate)
+                tidSetX = np.intersect1d(tidSetP, self._tid_array(item, cache), assume_unique=True)
+                support = self._track(candidate, tidSetX)
+                if support >= self._minPS:
+                    self._finalPatterns[candidate] = support
+                    queue.append(candidate)
+
+    def add_batch(self, batch):
+        start_time = time.time()
+        rows = self._read_batch(batch)
+        last = self._lastTimestamp
+        for ts, _ in rows:
+            if last is not None and ts < last:
+                raise ValueError(f"Timestamp phải không giảm: {ts} < {last}")
+            last = ts
+
+        # Bước 1: nối timestamp vào tid-list của item (giữ timestamp trùng), cập nhật các mẫu phổ biến / ứng viên
+        # có mặt tại từng timestamp của lô
+        new_items = {}
+        touched = {}
+        for ts, items in rows:
+            for item in sorted(set(items)):
+                new_items.setdefault(item, []).append(ts)
+        groups = self._group_by_timestamp(rows)
+        if groups and groups[0][0] == self._lastTimestamp:
+            groups[0] = (groups[0][0], sorted(set(groups[0][1]).union(self._lastItems)))
+        for ts, items in groups:
+            self._touch([item for item in items if (item,) in self._finalPatterns], ts, touched)
+        if groups:
+            self._lastItems = groups[-1][1]
+        for item, timeStamps in new_items.items():
+            tids = self._tidList.get(item)
+            if tids is None:
+                tids = self._tidList[item] = self._tidlist_type()
+            tids.extend(timeStamps)
+            # Item đơn giữ timestamp trùng như khi đọc từ file
+            self._update((item,), timeStamps, keep_duplicates=True)
+        for pattern, timeStamps in touched.items():
+            self._update(pattern, timeStamps)
+        self._lastTimestamp = last
+        self._lno += len(rows)
+
+        # Bước 2: các mẫu vừa vượt ngưỡng
+        promoted = [(item,) for item in new_items if (item,) not in self._finalPatterns and self._state[(item,)][0] >= self._minPS]
+        promoted += [p for p in touched if p not in self._finalPatterns and self._state[p][0] >= self._minPS]
+        for pattern in promoted:
+            self._finalPatterns[pattern] = self._state[pattern][0]
+        self._promote(promoted)
+
+        return {
+            'transactions': len(rows),
+            'updated_patterns': len(touched) + len(new_items),
+            'new_patterns': len(promoted),
+            'num_patterns': len(self._finalPatterns),
+            'latency': time.time() - start_time,
+        }
+
+    def get_final_patterns(self):
+        return dict(self._finalPatterns)
+
+    def get_num_transactions(self):
+        return self._lno
+
+
+class ThreePEclatWindow(ThreePEclatStream):
+    _tidlist_type = deque
+
+    # Chỉ giữ các giao dịch có timestamp trong (t_cuối - window, t_cuối]; mẫu nhiều item giữ thêm tid-list trong cửa sổ
+    # để khi loại timestamp cũ nhất chỉ cần trừ khoảng đầu tiên khỏi support
+    def __init__(self, minPS, period, window):
+        super().__init__(minPS, period)
+        if not isinstance(window, int) or window <= 0:
+            raise ValueError("Kích thước cửa sổ phải là số nguyên dương")
+        self._windowSize = window
+        self._window = deque()
+        self._windows = {}
+
+    def _update(self, pattern, timeStamps, keep_duplicates=False):
+        if len(pattern) > 1:
+            tids = self._windows.get(pattern)
+            if tids is None:
+                tids = self._windows[pattern] = deque()
+            for ts in timeStamps:
+                if not tids or tids[-1] != ts:
+                    tids.append(ts)
+        return super()._update(pattern, timeStamps, keep_duplicates)
+
+    def _track(self, pattern, tidSetX):
+        support = super()._track(pattern, tidSetX)
+        if len(tidSetX):
+            self._windows[pattern] = deque(tidSetX.tolist())
+        else:
+            self._windows.pop(pattern, None)
+        return support
+
+    def _forget(self, pattern):
+        self._state.pop(pattern, None)
+        self._windows.pop(pattern, None)
+        self._finalPatterns.pop(pattern, None)
+
+    def _pop_front(self, pattern, tids, cutoff):
+        state = self._state[pattern]
+        while tids and tids[0] <= cutoff:
+            first = tids.popleft()
+            if tids and tids[0] - first <= self._period:
+                state[0] -= 1
+        if not tids:
+            self._forget(pattern)
+            return 0
+        if pattern in self._finalPatterns:
+            self._finalPatterns[pattern] = state[0]
+        return state[0]
+
+    def _evict(self, cutoff):
+        # Các mẫu bị ảnh hưởng được tìm như khi thêm giao dịch, nhưng trên các giao dịch hết hạn
+        touched = {}
+        evicted_items = set()
+        evicted = []
+        while self._window and self._window[0][0] <= cutoff:
+            evicted.append(self._window.popleft())
+        num_evicted = len(evicted)
+        # Mọi giao dịch cùng timestamp rời cửa sổ cùng lúc (cùng so với cutoff), nên timestamp chỉ bị loại một lần
+        for ts, items in self._group_by_timestamp(evicted):
+            evicted_items.update(items)
+            self._touch([item for item in items if (item,) in self._finalPatterns], ts, touched)
+        changed = []
+        for item in evicted_items:
+            tids = self._tidList[item]
+            if self._pop_front((item,), tids, cutoff) == 0 and not tids:
+                del self._tidList[item]
+            changed.append((item,))
+        for pattern in touched:
+            tids = self._windows.get(pattern)
+            if tids is not None:
+                self._pop_front(pattern, tids, cutoff)
+                changed.append(pattern)
+
+        # Loại các mẫu dưới minPS; các ứng viên dựa trên chúng không còn là ứng viên nên bỏ trạng thái
+        demoted = [p for p in changed if p in self._finalPatterns and self._state[p][0] < self._minPS]
+        for pattern in demoted:
+            del self._finalPatterns[pattern]
+        for pattern in demoted:
+            if len(pattern) > 1 and pattern in self._state and not self._is_candidate(pattern):
+                self._forget(pattern)
+            for item in self._tidList:
+                if item in pattern:
+                    continue
+                candidate = tuple(sorted(pattern + (item,)))
+                if candidate in self._state and not self._is_candidate(candidate):
+                    self._forget(candidate)
+        return num_evicted, len(demoted)
+
+    def add_batch(self, batch):
+        start_time = time.time()
+        rows = [(ts, sorted(set(items))) for ts, items in self._read_batch(batch)]
+        result = super().add_batch(rows)
+        self._window.extend(rows)
+        num_evicted, num_demoted = self._evict(self._lastTimestamp - self._windowSize)
+        self._lno -= num_evicted
+        result['evicted_transactions'] = num_evicted
+        result['removed_patterns'] = num_demoted
+        result['num_patterns'] = len(self._finalPatterns)
+        result['latency'] = time.time() - start_time
+        return result
+
+
+def benchmark_window(iFile, minPS, period, window, slides=200, remine_slides=5, sep='\t'):
+    # Thông lượng trượt từng giao dịch một so với khai thác lại toàn bộ cửa sổ bằng ThreePEclatPruning
+    from ThreeP_Eclat_Pruning import ThreePEclatPruning
+    with open(iFile, 'r', encoding='utf-8') as f:
+        rows = list(read_transactions(f, sep)[0])
+    if len(rows) <= slides:
+        raise ValueError("Số lần trượt phải nhỏ hơn số giao dịch")
+    warm = len(rows) - slides
+    miner = ThreePEclatWindow(minPS, period, window)
+    miner.add_batch(rows[:warm])
+    start_time = time.time()
+    for row in rows[warm:]:
+        miner.add_batch([row])
+    slide_time = (time.time() - start_time) / slides
+
+    timestamps = [row[0] for row in rows]
+    remine_slides = min(remine_slides, slides)
+    start_time = time.time()
+    for end in range(warm + 1, warm + 1 + remine_slides):
+        begin = bisect_right(timestamps, timestamps[end - 1] - window, 0, end)
+        frame = pd.DataFrame({'TS': timestamps[begin:end], 'Transactions': [row[1:] for row in rows[begin:end]]})
+        remine = ThreePEclatPruning(minPS=minPS, period=period)
+        with contextlib.redirect_stdout(io.StringIO()):
+            remine._creatingItemSets(frame)
+            remine._mine()
+    remine_time = (time.time() - start_time) / remine_slides
+
+    result = {
+        'slides': slides,
+        'window_transactions': miner.get_num_transactions(),
+        'num_patterns': len(miner.get_final_patterns()),
+        'slide_time': slide_time,
+        'remine_time': remine_time,
+        'slide_throughput': 1 / slide_time if slide_time else float('inf'),
+        'remine_throughput': 1 / remine_time if remine_time else float('inf'),
+    }
+    print(f"Trượt từng giao dịch: {result['slide_throughput']:.1f} lần/giây, khai thác lại: {result['remine_throughput']:.2f} lần/giây "
+          f"({result['window_transactions']} giao dịch trong cửa sổ, {result['num_patterns']} mẫu)")
+    return result
+
+
+if __name__ == '__main__':
+    # python streaming.py <file> <minPS> <period> <window> [số lần trượt]
+    if len(sys.argv) < 5:
+        print("Cách dùng: python streaming.py <file> <minPS> <period> <window> [slides]")
+        sys.exit(1)
+    benchmark_window(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4]),
+                     int(sys.argv[5]) if len(sys.argv) > 5 else 200)
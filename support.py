@@ -0,0 +1,87 @@
+import numpy as np
+import kernels
+
+# Số phần tử của mảng ngắn được giao mỗi lần trước khi kiểm tra cận trên để dừng sớm
+ABORT_CHUNK = 2048
+
+
+def periodic_support(timeStamps, period):
+    # timeStamps đã sắp xếp tăng dần: đếm các khoảng liên tiếp <= period trong một lượt, không sắp xếp lại
+    if len(timeStamps) < 2:
+        return 0
+    if kernels.KERNEL == 'numba' and isinstance(timeStamps, np.ndarray):
+        return kernels.gap_count(timeStamps, period)
+    return int(np.count_nonzero(np.diff(timeStamps) <= period))
+
+
+def grouped_periodic_support(rows, timeStamps, period, num_rows):
+    # Periodic support của nhiều tid-list nối liền nhau: rows[k] là tid-list chứa timeStamps[k], không giảm,
+    # timestamp tăng dần trong từng tid-list. Chỉ đếm khoảng giữa hai phần tử cùng tid-list, một lượt cho tất cả
+    if len(timeStamps) < 2:
+        return np.zeros(num_rows, dtype=np.int64)
+    close = (rows[1:] == rows[:-1]) & (np.diff(timeStamps) <= period)
+    return np.bincount(rows[1:][close], minlength=num_rows)
+
+
+def intersect_sorted(tidSetA, tidSetB, out=None):
+    # Giao hai mảng đã sắp xếp, không trùng lặp: tìm nhị phân phần tử của mảng ngắn trong mảng dài.
+    # out (nếu có) đủ chỗ cho mảng ngắn: kết quả được ghi vào đầu out và trả về view thay vì cấp mảng mới
+    if len(tidSetA) > len(tidSetB):
+        tidSetA, tidSetB = tidSetB, tidSetA
+    if len(tidSetA) == 0:
+        return tidSetA
+    if kernels.KERNEL == 'numba':
+        if out is None:
+            out = np.empty(len(tidSetA), dtype=tidSetA.dtype)
+        written, _, _ = kernels.merge_intersect(tidSetA, tidSetB, 0, 0, None, len(tidSetA), out)
+        return out[:written]
+    idx = np.searchsorted(tidSetB, tidSetA)
+    np.minimum(idx, len(tidSetB) - 1, out=idx)
+    found = tidSetB[idx] == tidSetA
+    if out is None:
+        return tidSetA[found]
+    common = out[:np.count_nonzero(found)]
+    np.compress(found, tidSetA, out=common)
+    return common
+
+
+def intersect_bounded(tidSetA, tidSetB, period, minPS, timestamps=None, chunk=ABORT_CHUNK, out=None):
+    # Giao theo từng khối của mảng ngắn, đếm support dần; mỗi phần tử chưa xét thêm được nhiều nhất một khoảng,
+    # nên khi support hiện có cộng số phần tử còn lại vẫn < minPS thì dừng và trả về (None, cận trên).
+    # timestamps (nếu có) ánh xạ phần tử của tid-list sang timestamp để tính khoảng cách;
+    # out (nếu có) đủ chỗ cho mảng ngắn, các khối kết quả được ghi nối tiếp vào đó
+    if len(tidSetA) > len(tidSetB):
+        tidSetA, tidSetB = tidSetB, tidSetA
+    n = len(tidSetA)
+    if kernels.KERNEL == 'numba':
+        if out is None:
+            out = np.empty(n, dtype=tidSetA.dtype)
+        written, support, aborted = kernels.merge_intersect(tidSetA, tidSetB, period, minPS, timestamps, chunk, out)
+        if aborted:
+            return None, support
+        return out[:written], support
+    if n <= chunk:
+        common = intersect_sorted(tidSetA, tidSetB, out)
+        return common, periodic_support(common if timestamps is None else timestamps[common], period)
+    parts = []
+    written = 0
+    support = 0
+    last = None
+    for start in range(0, n, chunk):
+        part = intersect_sorted(tidSetA[start:start + chunk], tidSetB, None if out is None else out[written:])
+        if len(part):
+            values = part if timestamps is None else timestamps[part]
+            support += periodic_support(values, period)
+            if last is not None and values[0] - last <= period:
+                support += 1
+            last = values[-1]
+            parts.append(part)
+            written += len(part)
+        remaining = n - start - chunk
+        if remaining > 0 and support + remaining < minPS:
+            return None, support + remaining
+    if out is not None:
+        return out[:written], support
+    if not parts:
+        return tidSetA[:0], 0
+    return np.concatenate(parts), support
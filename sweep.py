@@ -0,0 +1,49 @@
+import numpy as np
+from tidlist import TidList
+
+
+def sorted_timestamps(tidSet):
+    if isinstance(tidSet, TidList):
+        return tidSet.timestamps()
+    return np.sort(np.asarray(tidSet, dtype=np.int64))
+
+
+def gap_histogram(timeStamps, periods):
+    # periods tăng dần: phần tử j là số khoảng liên tiếp <= periods[j], tức support của mẫu tại periods[j]
+    gaps = np.sort(np.diff(timeStamps))
+    return np.searchsorted(gaps, periods, side='right').astype(np.int64)
+
+
+def item_gate_histograms(sorted_items, vertical_ts, num_items, periods):
+    # Support của item đơn theo thứ tự trong file (cách chọn plist) tại mọi period của lưới, tính một lượt
+    same = sorted_items[1:] == sorted_items[:-1]
+    owners = sorted_items[1:][same].astype(np.int64)
+    bins = np.searchsorted(periods, np.diff(vertical_ts)[same], side='left')
+    width = len(periods) + 1
+    counts = np.bincount(owners * width + bins, minlength=num_items * width).reshape(num_items, width)
+    return np.cumsum(counts, axis=1)[:, :len(periods)]
+
+
+class SweepTable:
+    # Kết quả của một lần khai thác ở ngưỡng lỏng nhất; mỗi điểm (minPS, period) của lưới chỉ là một phép lọc cột
+    def __init__(self, patterns, histograms, gates, periods):
+        self.patterns = list(patterns)
+        self.periods = np.asarray(periods, dtype=np.int64)
+        num_periods = len(self.periods)
+        self.supports = np.array([histograms[p] for p in self.patterns], dtype=np.int64).reshape(-1, num_periods)
+        # Mẫu chỉ được sinh ra khi mọi item của nó vượt ngưỡng ở bước chọn item đơn
+        gate = np.array([np.min([gates[item] for item in p], axis=0) for p in self.patterns], dtype=np.int64).reshape(-1, num_periods)
+        self.bounds = np.minimum(self.supports, gate)
+
+    def query(self, minPS, period):
+        j = int(np.searchsorted(self.periods, period))
+        if j >= len(self.periods) or self.periods[j] != period:
+            raise ValueError(f"Period {period} không nằm trong lưới đã khai thác")
+        column = self.supports[:, j]
+        return {self.patterns[k]: int(column[k]) for k in np.flatnonzero(self.bounds[:, j] >= minPS)}
+
+
+def build_table(data, patterns, histograms, periods):
+    sorted_items, vertical_ts, bounds = data.vertical()
+    gates = item_gate_histograms(sorted_items, vertical_ts, len(data.labels), periods)
+    return SweepTable(patterns, histograms, dict(zip(data.labels, gates)), periods)
@@ -0,0 +1,18 @@
+import contextlib
+import io
+import os
+import sys
+
+# Các module nằm phẳng ở thư mục gốc của repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'fixture.txt')
+
+
+def mine(miner_class, minPS, period, source=FIXTURE, **kwargs):
+    # Khai thác source (file hoặc DataFrame, mặc định là fixture) không in ra màn hình; trả về {frozenset(mẫu): support}
+    miner = miner_class(minPS=minPS, period=period, **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        miner._creatingItemSets(source)
+        miner._mine()
+    return {frozenset(pattern): support for pattern, support in miner.get_final_patterns().items()}
@@ -0,0 +1,28 @@
+import pytest
+
+from ThreeP_Eclat import ThreePEclat
+from ThreeP_Eclat_Pruning import ThreePEclatPruning
+from conftest import mine
+from tidlist import TIDLIST_BACKENDS
+
+SETTINGS = [(2, 1), (3, 2), (6, 3)]
+
+
+@pytest.mark.parametrize('minPS, period', SETTINGS)
+@pytest.mark.parametrize('miner_class', [ThreePEclat, ThreePEclatPruning])
+def test_backends_agree(miner_class, minPS, period):
+    # Mọi kiểu tid-list phải cho cùng tập (mẫu, support); dùng array làm chuẩn
+    expected = mine(miner_class, minPS, period, tidlist='array')
+    assert any(len(pattern) > 2 for pattern in expected)
+    for backend in TIDLIST_BACKENDS:
+        assert mine(miner_class, minPS, period, tidlist=backend) == expected, backend
+    # Ngưỡng mật độ cao: 'auto' trộn bitset (item dày) với roaring (item thưa) trong cùng một lần khai thác
+    assert mine(miner_class, minPS, period, tidlist='auto', density=0.5) == expected
+
+
+@pytest.mark.parametrize('minPS, period', SETTINGS)
+def test_miners_agree(minPS, period):
+    # ThreePEclat với list timestamp ban đầu (tidlist=None) và hai miner phải khớp nhau
+    expected = mine(ThreePEclatPruning, minPS, period, tidlist='auto')
+    assert mine(ThreePEclat, minPS, period) == expected
+    assert mine(ThreePEclat, minPS, period, tidlist='auto') == expected
@@ -0,0 +1,41 @@
+import pytest
+
+from ThreeP_Eclat_Pruning import ThreePEclatPruning
+from conftest import mine
+from test_generation import brute_force, read_fixture
+
+OPTIONS = [{}, {'tidlist': 'array'}, {'workers': 2}, {'diffset': True, 'diffset_density': 0.0}]
+
+
+def timestamp_sets(rows, patterns):
+    # Như khi khai thác: mẫu có mặt tại timestamp t khi mọi item của mẫu có mặt tại t (có thể ở các giao dịch khác nhau)
+    occurrences = {}
+    for ts, items in rows:
+        for item in items:
+            occurrences.setdefault(item, set()).add(ts)
+    return {pattern: frozenset.intersection(*(frozenset(occurrences[item]) for item in pattern)) for pattern in patterns}
+
+
+def closed_patterns(rows, patterns):
+    # Mẫu đóng: không có tập cha phổ biến cùng tập timestamp
+    tids = timestamp_sets(rows, patterns)
+    return {pattern: support for pattern, support in patterns.items()
+            if not any(pattern < other and tids[other] == tids[pattern] for other in patterns)}
+
+
+def maximal_patterns(patterns):
+    # Mẫu cực đại: không có tập cha phổ biến
+    return {pattern: support for pattern, support in patterns.items()
+            if not any(pattern < other for other in patterns)}
+
+
+@pytest.mark.parametrize('options', OPTIONS)
+@pytest.mark.parametrize('minPS, period', [(1, 10), (2, 3), (4, 2)])
+def test_closed_and_maximal_match_brute_force(minPS, period, options):
+    rows = read_fixture()
+    full = brute_force(rows, minPS, period)
+    closed = closed_patterns(rows, full)
+    maximal = maximal_patterns(full)
+    assert len(maximal) < len(closed) < len(full)
+    assert mine(ThreePEclatPruning, minPS, period, closed=True, **options) == closed
+    assert mine(ThreePEclatPruning, minPS, period, maximal=True, **options) == maximal
@@ -0,0 +1,84 @@
+import glob
+import shutil
+
+import numpy as np
+import pytest
+
+from conftest import FIXTURE
+from dbcache import CACHE_EXT, cache_path, load_database, read_cached
+from loader import read_transactions
+
+ARRAYS = ('offsets', 'items', 'timestamps', 'vertical_ts', 'bounds')
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = str(tmp_path / 'fixture.txt')
+    shutil.copyfile(FIXTURE, path)
+    return path
+
+
+def parse(path, sep='\t'):
+    with open(path, 'r', encoding='utf-8') as f:
+        return read_transactions(f, sep)
+
+
+def assert_same(data, expected):
+    data.vertical()
+    expected.vertical()
+    assert data.labels == expected.labels
+    for name in ARRAYS:
+        assert np.array_equal(getattr(data, name), getattr(expected, name)), name
+
+
+def cache_files(path):
+    return glob.glob(f"{glob.escape(path)}.*{CACHE_EXT}")
+
+
+def test_second_load_is_memory_mapped(source):
+    first, first_lines = read_cached(source, '\t')
+    assert cache_files(source) == [cache_path(source, '\t')]
+    second, second_lines = read_cached(source, '\t')
+    assert first_lines == second_lines
+    for name in ARRAYS:
+        assert isinstance(getattr(second, name), np.memmap), name
+    assert_same(second, first)
+    assert_same(second, parse(source)[0])
+
+
+def test_edit_or_new_sep_replaces_stale_cache(source):
+    read_cached(source, '\t')
+    old = cache_path(source, '\t')
+    with open(source, 'a', encoding='utf-8') as f:
+        f.write('500\ta\tz\n')
+    data, _ = read_cached(source, '\t')
+    assert cache_files(source) == [cache_path(source, '\t')] != [old]
+    assert 'z' in data.labels
+    # Cùng nội dung nhưng ký tự phân tách khác: cache mới, cache cũ bị xoá
+    edited = cache_path(source, '\t')
+    read_cached(source, ',')
+    assert cache_files(source) == [cache_path(source, ',')] != [edited]
+
+
+@pytest.mark.parametrize('damage', ['header', 'arrays', 'magic', 'meta'])
+def test_corrupt_cache_falls_back_to_parsing(source, damage):
+    read_cached(source, '\t')
+    target = cache_path(source, '\t')
+    with open(target, 'r+b') as f:
+        content = f.read()
+        if damage == 'header':
+            f.truncate(10)
+        elif damage == 'arrays':
+            f.truncate(len(content) // 2)
+        elif damage == 'magic':
+            f.seek(0)
+            f.write(b'XXXX')
+        else:
+            f.seek(16)
+            f.write(b'\xff{{{')
+    data, num_lines = read_cached(source, '\t')
+    expected, expected_lines = parse(source)
+    assert num_lines == expected_lines
+    assert_same(data, expected)
+    # File cache hỏng được ghi lại và lần nạp sau dùng được
+    assert_same(load_database(target)[0], expected)
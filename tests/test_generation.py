@@ -0,0 +1,53 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from ThreeP_Eclat import ThreePEclat
+from ThreeP_Eclat_Pruning import ThreePEclatPruning
+from conftest import FIXTURE, mine
+from ordering import ITEM_ORDERS
+
+
+def read_fixture():
+    rows = []
+    with open(FIXTURE, encoding='utf-8') as f:
+        for line in f:
+            tokens = line.split()
+            if tokens:
+                rows.append((int(tokens[0]), set(tokens[1:])))
+    return rows
+
+
+def brute_force(rows, minPS, period, maxLength=None):
+    # Duyệt mọi tập item: item đơn tính trên mọi giao dịch chứa nó (giữ timestamp trùng), mẫu nhiều item tính trên
+    # tập timestamp mà mọi item của mẫu cùng có mặt
+    items = sorted(set().union(*(items for _, items in rows)))
+    occurrences = {item: {ts for ts, row in rows if item in row} for item in items}
+    patterns = {}
+    for length in range(1, (maxLength or len(items)) + 1):
+        for pattern in itertools.combinations(items, length):
+            if length == 1:
+                timestamps = sorted(ts for ts, row in rows if pattern[0] in row)
+            else:
+                timestamps = sorted(set.intersection(*(occurrences[item] for item in pattern)))
+            support = int(np.count_nonzero(np.diff(timestamps) <= period))
+            if support >= minPS:
+                patterns[frozenset(pattern)] = support
+    return patterns
+
+
+OPTIONS = [{}, {'tidlist': 'array'}, {'tidlist': 'bitset'}, {'diffset': True, 'diffset_density': 0.0}, {'workers': 2}]
+
+
+@pytest.mark.parametrize('order', ITEM_ORDERS)
+@pytest.mark.parametrize('options', OPTIONS)
+@pytest.mark.parametrize('miner_class', [ThreePEclat, ThreePEclatPruning])
+@pytest.mark.parametrize('minPS, period, maxLength', [(1, 10, None), (2, 3, None), (4, 2, None), (1, 10, 3)])
+def test_generation_matches_brute_force(miner_class, options, order, minPS, period, maxLength):
+    expected = brute_force(read_fixture(), minPS, period, maxLength)
+    if maxLength is None and minPS == 1:
+        # Ngưỡng thấp nhất cho mẫu sâu gần bằng cả giao dịch, để kiểm tra stack qua nhiều mức
+        assert max(map(len, expected)) >= 6
+    # Thứ tự item và đổi nhãn sang số nguyên không được làm thay đổi tập mẫu
+    assert mine(miner_class, minPS, period, maxLength=maxLength, order=order, **options) == expected
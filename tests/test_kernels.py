@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+import kernels
+from support import intersect_bounded, periodic_support
+from tidlist import BitsetTidList, PackedTidList, TidBuffer, TidUniverse, intersect_class, make_tidlist
+
+PERIOD = 3
+
+
+@pytest.fixture(params=kernels.KERNELS)
+def kernel(request):
+    # Chạy cùng một test với từng kernel; bỏ qua numba khi chưa cài
+    if request.param == 'numba' and kernels.njit is None:
+        pytest.skip("Chưa cài numba")
+    previous = kernels.KERNEL
+    kernels.use_kernel(request.param)
+    yield request.param
+    kernels.use_kernel(previous)
+
+
+def reference_support(timestamps):
+    return int(np.count_nonzero(np.diff(timestamps) <= PERIOD))
+
+
+def random_timestamps(rng, size, density, max_gap=4):
+    timestamps = np.cumsum(rng.integers(1, max_gap + 1, size=size))
+    return timestamps[rng.random(size) < density]
+
+
+@pytest.mark.parametrize('minPS', [0, 100, 10 ** 6])
+@pytest.mark.parametrize('mapped', [False, True])
+def test_intersect_bounded(kernel, mapped, minPS):
+    # _merge_intersect (numba) và giao theo khối (numpy) phải cho cùng tid-list và support, dừng sớm chỉ khi không đạt
+    rng = np.random.default_rng(minPS)
+    timestamps = np.cumsum(rng.integers(1, 5, size=20000))
+    tidSetA = np.flatnonzero(rng.random(len(timestamps)) < 0.3)
+    tidSetB = np.flatnonzero(rng.random(len(timestamps)) < 0.6)
+    if not mapped:
+        tidSetA, tidSetB, timestamps = timestamps[tidSetA], timestamps[tidSetB], None
+    expected = np.intersect1d(tidSetA, tidSetB)
+    expected_support = reference_support(expected if timestamps is None else timestamps[expected])
+    common, support = intersect_bounded(tidSetA, tidSetB, PERIOD, minPS, timestamps, chunk=512)
+    if common is None:
+        assert expected_support < minPS and expected_support <= support
+    else:
+        assert np.array_equal(common, expected) and support == expected_support
+    assert periodic_support(np.sort(tidSetA), PERIOD) == reference_support(np.sort(tidSetA))
+
+
+def test_bitset_gaps(kernel):
+    # _and_gaps (AND từng cặp) và _and_rows (cả lớp) so với giao trên mảng timestamp
+    rng = np.random.default_rng(2)
+    universe = TidUniverse(np.cumsum(rng.integers(1, 5, size=5000)))
+    tidSetX = make_tidlist('bitset', universe, universe.timestamps[rng.random(universe.size) < 0.5])
+    others = [make_tidlist('bitset', universe, universe.timestamps[rng.random(universe.size) < d])
+              for d in (0.0, 0.1, 0.5, 1.0)]
+    batched = intersect_class(tidSetX, others, PERIOD, 0)
+    for tidSetJ, (row, row_support) in zip(others, batched):
+        expected = np.intersect1d(tidSetX.timestamps(), tidSetJ.timestamps())
+        common, support = tidSetX.intersect_bounded(tidSetJ, PERIOD, 0, TidBuffer())
+        assert isinstance(common, BitsetTidList)
+        assert np.array_equal(common.timestamps(), expected) and len(common) == len(expected)
+        assert support == row_support == reference_support(expected)
+        assert np.array_equal(row.timestamps(), expected)
+
+
+@pytest.mark.parametrize('max_gap', [1, 4, 1000, 1 << 40])
+def test_packed_gaps(kernel, max_gap):
+    # _pack_deltas, _unpack_timestamps và _packed_gaps: giải nén đúng và đếm khoảng trên dạng nén như trên mảng
+    rng = np.random.default_rng(max_gap % 97)
+    for size in (0, 1, 2, 129, 1000):
+        timestamps = random_timestamps(rng, size, 1.0, max_gap)
+        tidSet = PackedTidList.from_timestamps(None, timestamps)
+        assert np.array_equal(tidSet.timestamps(), timestamps)
+        for period in (0, 1, PERIOD, max_gap // 2, max_gap):
+            assert tidSet.periodic_support(period) == int(np.count_nonzero(np.diff(timestamps) <= period))
+
+
+def test_packed_encoding_is_kernel_independent():
+    # Dạng nén phải giống hệt nhau giữa hai kernel để tid-list ghi ra đĩa / gửi giữa tiến trình đọc được ở cả hai
+    if kernels.njit is None:
+        pytest.skip("Chưa cài numba")
+    timestamps = random_timestamps(np.random.default_rng(3), 5000, 0.7, 300)
+    previous = kernels.KERNEL
+    encoded = {}
+    try:
+        for name in kernels.KERNELS:
+            kernels.use_kernel(name)
+            tidSet = PackedTidList.from_timestamps(None, timestamps)
+            encoded[name] = (tidSet.refs, tidSet.widths, tidSet.offsets, tidSet.data)
+    finally:
+        kernels.use_kernel(previous)
+    for numba_part, numpy_part in zip(encoded['numba'], encoded['numpy']):
+        assert np.array_equal(numba_part, numpy_part)
@@ -0,0 +1,52 @@
+import io
+
+import numpy as np
+import pytest
+
+from conftest import FIXTURE
+from loader import CHUNK_SIZE, read_transactions
+
+
+def fixture_text():
+    # Fixture (đã có timestamp trùng) thêm dòng trống, dòng chỉ có khoảng trắng và nhãn nhiều byte UTF-8
+    with open(FIXTURE, encoding='utf-8', newline='') as f:
+        lines = f.read().split('\r\n')
+    lines[3:3] = ['', '   ']
+    lines[10] += '\tcà phê'
+    lines[20:20] = ['']
+    lines[30] += '\tcà phê\tphở'
+    return '\n'.join(lines) + '\n\n'
+
+
+def parse_lines(text, sep='\t'):
+    # Đọc từng dòng như trước khi có loader theo khối: nhãn được đánh số theo thứ tự xuất hiện đầu tiên
+    index, labels, items, lengths, timestamps = {}, [], [], [], []
+    for line in text.splitlines():
+        tokens = [t.strip() for t in line.split(sep) if t.strip()]
+        if not tokens:
+            continue
+        timestamps.append(int(tokens[0]))
+        lengths.append(len(tokens) - 1)
+        for label in tokens[1:]:
+            if label not in index:
+                index[label] = len(labels)
+                labels.append(label)
+            items.append(index[label])
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    return labels, offsets, np.array(items), np.array(timestamps)
+
+
+@pytest.mark.parametrize('as_bytes', [False, True])
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64, CHUNK_SIZE])
+def test_chunked_load_matches_line_parse(chunk_size, as_bytes):
+    # Khối nhỏ cắt giữa dòng, giữa token và (khi đọc bytes) giữa một ký tự UTF-8 nhiều byte
+    text = fixture_text()
+    stream = io.BytesIO(text.encode('utf-8')) if as_bytes else io.StringIO(text)
+    data, num_lines = read_transactions(stream, '\t', chunk_size)
+    labels, offsets, items, timestamps = parse_lines(text)
+    assert num_lines == len(text.splitlines())
+    assert data.labels == labels
+    assert np.array_equal(data.offsets, offsets)
+    assert np.array_equal(data.items, items)
+    assert np.array_equal(data.timestamps, timestamps)
+    assert len(np.unique(data.timestamps)) < len(data.timestamps)
@@ -0,0 +1,25 @@
+import contextlib
+import io
+import os
+import shutil
+
+import pytest
+
+from ThreeP_Eclat_Pruning import ThreePEclatPruning
+from conftest import FIXTURE, mine
+
+
+@pytest.mark.parametrize('tidlist', ['auto', 'array', 'packed'])
+@pytest.mark.parametrize('minPS, period', [(1, 10), (2, 3), (4, 2)])
+def test_out_of_core_matches_in_memory(tmp_path, minPS, period, tidlist):
+    # CSDL trên đĩa (*.3pvp) nằm cạnh file nguồn nên khai thác bản sao trong tmp_path
+    source = str(tmp_path / os.path.basename(FIXTURE))
+    shutil.copyfile(FIXTURE, source)
+    # memory_limit=1: mọi lớp đều vượt giới hạn nên được ghi ra phân vùng trên đĩa rồi khai thác lại từ đó
+    miner = ThreePEclatPruning(minPS=minPS, period=period, tidlist=tidlist, out_of_core=True, memory_limit=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        miner._creatingItemSets(source)
+        miner._mine()
+    assert miner._counters['io_written'] > 0
+    found = {frozenset(pattern): support for pattern, support in miner.get_final_patterns().items()}
+    assert found == mine(ThreePEclatPruning, minPS, period, tidlist=tidlist)
@@ -0,0 +1,103 @@
+import random
+
+import numpy as np
+import pytest
+
+from results import STORE_EXT, PatternStore
+
+LABELS = [f"i{k:02d}" for k in range(12)]
+
+
+def random_patterns(rng, n=300):
+    # Mẫu ngẫu nhiên với support trùng nhau nhiều để kiểm tra thứ tự khi hoà
+    patterns = {}
+    while len(patterns) < n:
+        patterns.setdefault(tuple(sorted(rng.sample(LABELS, rng.randint(1, 6)))), rng.randint(1, 30))
+    return patterns
+
+
+def random_items(rng):
+    # Có thể rỗng, có thể chứa item không có trong kho
+    items = rng.sample(LABELS, rng.randint(0, 3))
+    if rng.random() < 0.15:
+        items.append('missing')
+    rng.shuffle(items)
+    return items
+
+
+def scan(source, contains=None, prefix=None, within=None, min_support=None, max_support=None,
+         min_length=None, max_length=None):
+    found = {}
+    for pattern, support in source.items():
+        if contains is not None and not set(contains) <= set(pattern):
+            continue
+        if prefix is not None and pattern[:len(set(prefix))] != tuple(sorted(set(prefix))):
+            continue
+        if within is not None and not set(pattern) <= set(within):
+            continue
+        if min_support is not None and support < min_support:
+            continue
+        if max_support is not None and support > max_support:
+            continue
+        if min_length is not None and len(pattern) < min_length:
+            continue
+        if max_length is not None and len(pattern) > max_length:
+            continue
+        found[pattern] = support
+    return found
+
+
+@pytest.fixture(params=[False, True], ids=['memory', 'saved'])
+def stores(request, tmp_path):
+    rng = random.Random(20)
+    source = random_patterns(rng)
+    # Truyền mẫu với item xáo trộn: kho phải tự sắp xếp
+    store = PatternStore.from_patterns({tuple(rng.sample(p, len(p))): s for p, s in source.items()}, {'minPS': 1})
+    if request.param:
+        store = PatternStore.load(store.save(str(tmp_path / f"patterns{STORE_EXT}")))
+        assert isinstance(store.supports, np.memmap) and store.meta == {'minPS': 1}
+    return rng, source, store
+
+
+def test_lookups_match_linear_scan(stores):
+    rng, source, store = stores
+    assert len(store) == len(source)
+    assert store.patterns(range(len(store))) == source
+    for pattern, support in source.items():
+        assert store.get(tuple(rng.sample(pattern, len(pattern)))) == support
+    for _ in range(200):
+        items = random_items(rng)
+        expected = source.get(tuple(sorted(items)))
+        assert store.get(items) == expected
+        assert (tuple(items) in store) == (expected is not None)
+        assert store.patterns(store.with_prefix(items)) == scan(source, prefix=items)
+        assert store.patterns(store.containing(items)) == scan(source, contains=items)
+        assert store.patterns(store.within(items)) == (scan(source, within=items) if items else {})
+
+
+def test_support_range_matches_linear_scan(stores):
+    rng, source, store = stores
+    for _ in range(100):
+        low = rng.choice([None, rng.randint(0, 32)])
+        high = rng.choice([None, rng.randint(0, 32)])
+        ids = store.support_range(low, high)
+        assert store.patterns(ids) == scan(source, min_support=low, max_support=high)
+        assert np.all(np.diff(store.supports[ids]) >= 0)
+
+
+def test_query_matches_linear_scan(stores):
+    rng, source, store = stores
+    for _ in range(300):
+        options = {
+            'contains': rng.choice([None, random_items(rng)]),
+            'prefix': rng.choice([None, random_items(rng)]),
+            'within': rng.choice([None, random_items(rng) + rng.sample(LABELS, 4)]),
+            'min_support': rng.choice([None, rng.randint(0, 30)]),
+            'max_support': rng.choice([None, rng.randint(0, 30)]),
+            'min_length': rng.choice([None, rng.randint(1, 4)]),
+            'max_length': rng.choice([None, rng.randint(1, 6)]),
+        }
+        limit = rng.choice([None, 1, 10])
+        # Support giảm dần, cùng support thì theo thứ tự từ điển của mẫu đã sắp xếp
+        expected = sorted(scan(source, **options).items(), key=lambda entry: (-entry[1], entry[0]))[:limit]
+        assert list(store.query(limit=limit, **options).items()) == expected
@@ -0,0 +1,60 @@
+import ast
+import contextlib
+import gzip
+import io
+import json
+import os
+
+import pytest
+
+from ThreeP_Eclat import ThreePEclat
+from ThreeP_Eclat_Pruning import ThreePEclatPruning
+from conftest import FIXTURE, mine
+from sinks import SINK_TYPES
+
+MINPS, PERIOD = 2, 2
+
+
+def read_text(path):
+    # Bỏ dòng tiêu đề và dòng kết thúc; mỗi dòng còn lại là "(item, ...): support"
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    assert lines[0] == f"--- Mẫu Tuần Hoàn Cục Bộ từ {os.path.basename(FIXTURE)} ---" and lines[-1].startswith('---')
+    patterns = {}
+    for line in lines[1:-1]:
+        pattern, support = line.rsplit(': ', 1)
+        patterns[frozenset(ast.literal_eval(pattern))] = int(support)
+    return patterns
+
+
+def read_jsonl(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    return {frozenset(row['pattern']): row['support'] for row in rows}
+
+
+def read_parquet(path):
+    import pyarrow.parquet as pq
+    table = pq.read_table(path).to_pydict()
+    return dict(zip(map(frozenset, table['pattern']), table['support']))
+
+
+@pytest.mark.parametrize('sink', (None,) + SINK_TYPES)
+@pytest.mark.parametrize('miner_class', [ThreePEclat, ThreePEclatPruning])
+def test_sink_output_matches_mine(tmp_path, miner_class, sink):
+    if sink == 'parquet':
+        pytest.importorskip('pyarrow')
+    expected = mine(miner_class, MINPS, PERIOD)
+    patterns_file = str(tmp_path / 'patterns.txt')
+    miner = miner_class(minPS=MINPS, period=PERIOD, sink=sink)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, (num_patterns, _, _, _) = miner.startMine(FIXTURE, str(tmp_path / 'stats.txt'), patterns_file)
+    assert num_patterns == len(expected)
+    if sink in (None, 'text'):
+        assert read_text(patterns_file) == expected
+    elif sink == 'jsonl':
+        assert read_jsonl(str(tmp_path / 'patterns.jsonl.gz')) == expected
+    elif sink == 'parquet':
+        assert read_parquet(str(tmp_path / 'patterns.parquet')) == expected
+    else:
+        assert not os.path.exists(patterns_file)
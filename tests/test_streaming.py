@@ -0,0 +1,70 @@
+import random
+
+import pandas as pd
+import pytest
+
+from ThreeP_Eclat_Pruning import ThreePEclatPruning
+from conftest import mine
+from streaming import ThreePEclatStream, ThreePEclatWindow
+
+
+def batch_mine(rows, minPS, period):
+    # Khai thác lại toàn bộ các dòng [ts, item...] bằng thuật toán theo lô để làm kết quả chuẩn
+    frame = pd.DataFrame({'TS': [row[0] for row in rows], 'Transactions': [row[1:] for row in rows]})
+    return mine(ThreePEclatPruning, minPS, period, frame)
+
+
+def normalize(patterns):
+    return {frozenset(pattern): support for pattern, support in patterns.items()}
+
+
+def random_rows(rng):
+    # Timestamp tăng dần với nhiều bước 0 để có nhiều giao dịch trùng timestamp
+    rows, ts = [], 0
+    for _ in range(rng.randint(1, 40)):
+        ts += rng.choice([0, 0, 1, 1, 2, 3])
+        rows.append([ts] + rng.sample('abcdef', rng.randint(1, 4)))
+    return rows
+
+
+def test_duplicate_timestamps_row_by_row():
+    rows = [[2, 'b'], [3, 'a', 'b', 'c'], [4, 'a'], [4, 'b']]
+    stream = ThreePEclatStream(1, 1)
+    for row in rows:
+        stream.add_batch([row])
+    assert normalize(stream.get_final_patterns()) == batch_mine(rows, 1, 1)
+    assert stream.get_final_patterns()[('a', 'b')] == 1
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_stream_matches_batch_with_duplicate_timestamps(seed):
+    rng = random.Random(seed)
+    for _ in range(40):
+        rows = random_rows(rng)
+        minPS, period = rng.randint(1, 4), rng.randint(0, 3)
+        stream = ThreePEclatStream(minPS, period)
+        i = 0
+        while i < len(rows):
+            size = rng.randint(1, 5)
+            stream.add_batch(rows[i:i + size])
+            i += size
+        assert normalize(stream.get_final_patterns()) == batch_mine(rows, minPS, period)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_window_checkpoints_match_batch(seed):
+    # Sau mỗi lô, kết quả của cửa sổ phải bằng khai thác lại các dòng có timestamp trong cửa sổ
+    rng = random.Random(seed)
+    for _ in range(20):
+        rows = random_rows(rng)
+        minPS, period, size = rng.randint(1, 4), rng.randint(0, 3), rng.randint(1, 8)
+        window = ThreePEclatWindow(minPS, period, size)
+        i = 0
+        while i < len(rows):
+            step = rng.randint(1, 5)
+            window.add_batch(rows[i:i + step])
+            i = min(i + step, len(rows))
+            last = rows[i - 1][0]
+            inside = [row for row in rows[:i] if row[0] > last - size]
+            assert normalize(window.get_final_patterns()) == batch_mine(inside, minPS, period)
+            assert window.get_num_transactions() == len(inside)
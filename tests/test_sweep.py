@@ -0,0 +1,24 @@
+import contextlib
+import io
+
+import pytest
+
+from ThreeP_Eclat import ThreePEclat
+from ThreeP_Eclat_Pruning import ThreePEclatPruning
+from conftest import FIXTURE, mine
+
+# period 0.03 là tỉ lệ theo số giao dịch (3 trên 100 dòng của fixture), các giá trị còn lại là số tuyệt đối
+MINPS_LIST = [2, 5, 0.08]
+PERIOD_LIST = [1, 0.03, 6]
+
+
+@pytest.mark.parametrize('miner_class', [ThreePEclat, ThreePEclatPruning])
+def test_sweep_matches_separate_runs(miner_class):
+    miner = miner_class(minPS=1, period=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = miner.sweep(FIXTURE, MINPS_LIST, PERIOD_LIST)
+    assert [(r['minPS'], r['period']) for r in results] == [(m, p) for m in MINPS_LIST for p in PERIOD_LIST]
+    for result in results:
+        patterns = {frozenset(pattern): support for pattern, support in result['patterns'].items()}
+        assert result['num_patterns'] == len(patterns)
+        assert patterns == mine(miner_class, result['minPS'], result['period']), (result['minPS'], result['period'])
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from conftest import mine
+from support import ABORT_CHUNK
+from tidlist import TidBuffer, TidUniverse, batchable, intersect_class, make_tidlist
+
+PERIOD = 3
+
+
+def random_class(kind, seed, size=4000, num_others=12):
+    # t(X) dày vừa phải và các t(J) với mật độ khác nhau (có cả rỗng) để lớp có cả hàng đạt và không đạt minPS
+    rng = np.random.default_rng(seed)
+    universe = TidUniverse(np.cumsum(rng.integers(1, 4, size=size)))
+    pick = lambda density: universe.timestamps[rng.random(size) < density]
+    tidSetX = make_tidlist(kind, universe, pick(0.5))
+    densities = np.linspace(0.0, 0.5, num_others)
+    others = [make_tidlist(kind, universe, pick(density)) for density in densities]
+    return tidSetX, [t for t in others if kind != 'array' or len(t.pos) <= ABORT_CHUNK]
+
+
+def test_batchable():
+    universe = TidUniverse(np.arange(3 * ABORT_CHUNK))
+    short = make_tidlist('array', universe, np.arange(ABORT_CHUNK))
+    long = make_tidlist('array', universe, np.arange(ABORT_CHUNK + 1))
+    bitset = make_tidlist('bitset', universe, np.arange(10))
+    packed = make_tidlist('packed', universe, np.arange(10))
+    assert batchable(long, short)
+    assert not batchable(short, long)
+    assert batchable(bitset, bitset)
+    assert not batchable(short, bitset) and not batchable(bitset, short)
+    assert not batchable(packed, packed)
+
+
+@pytest.mark.parametrize('use_buffer', [False, True])
+@pytest.mark.parametrize('minPS', [0, 40, 200])
+@pytest.mark.parametrize('kind', ['array', 'bitset'])
+def test_intersect_class_matches_pairwise(kind, minPS, use_buffer):
+    tidSetX, others = random_class(kind, seed=minPS)
+    buffer = TidBuffer() if use_buffer else None
+    batched = intersect_class(tidSetX, others, PERIOD, minPS, buffer)
+    assert len(batched) == len(others)
+    for tidSetJ, (common, support) in zip(others, batched):
+        expected, expected_support = tidSetX.intersect_bounded(tidSetJ, PERIOD, minPS)
+        if support >= minPS:
+            # Hàng được giữ: cùng tid-list và support như phép giao từng cặp
+            assert expected is not None and expected_support == support
+            assert np.array_equal(common.timestamps(), expected.timestamps())
+        else:
+            # Hàng bị bỏ vì support < minPS: cặp tương ứng cũng không đạt (hoặc đã dừng sớm)
+            assert common is None
+            assert expected is None or expected_support < minPS
+    kept = [support >= minPS for _, support in batched]
+    if minPS:
+        assert any(kept) and not all(kept)
+
+
+def test_intersect_class_skips_pairs_that_abort():
+    # t(J) dài hơn một khối ABORT_CHUNK: phép giao từng cặp dừng sớm và trả về cận trên; intersect_class vẫn giao
+    # hết nên support thật không vượt cận trên đó và hàng cũng bị bỏ
+    rng = np.random.default_rng(1)
+    universe = TidUniverse(np.arange(0, 40000, 2))
+    tidSetX = make_tidlist('array', universe, universe.timestamps[:12000])
+    tidSetJ = make_tidlist('array', universe, universe.timestamps[rng.random(universe.size) < 0.3])
+    minPS = len(tidSetJ.pos) - 1
+    pairwise, bound = tidSetX.intersect_bounded(tidSetJ, PERIOD, minPS)
+    assert pairwise is None and bound < minPS
+    [(common, support)] = intersect_class(tidSetX, [tidSetJ], PERIOD, minPS)
+    assert common is None and support <= bound
+
+
+@pytest.mark.parametrize('kind', ['array', 'bitset', 'packed'])
+def test_class_batching_does_not_change_patterns(monkeypatch, kind):
+    # Cùng dữ liệu, lớp con sinh bằng intersect_class cho mọi lớp hay chỉ giao từng cặp phải cho cùng kết quả
+    import ThreeP_Eclat_Pruning
+    expected = mine(ThreeP_Eclat_Pruning.ThreePEclatPruning, 2, 2, tidlist=kind)
+    monkeypatch.setattr(ThreeP_Eclat_Pruning, 'CLASS_BATCH_MIN', 1)
+    assert mine(ThreeP_Eclat_Pruning.ThreePEclatPruning, 2, 2, tidlist=kind) == expected
@@ -0,0 +1,27 @@
+import pytest
+
+from ThreeP_Eclat import ThreePEclat
+from ThreeP_Eclat_Pruning import ThreePEclatPruning
+from conftest import mine
+
+MINPS, PERIOD = 1, 3
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+@pytest.mark.parametrize('miner_class', [ThreePEclat, ThreePEclatPruning])
+def test_topk_returns_highest_supports(miner_class, workers):
+    full = mine(miner_class, MINPS, PERIOD)
+    ranked = sorted(full.values(), reverse=True)
+    for k in (1, 5, len(full), len(full) + 10):
+        top = mine(miner_class, MINPS, PERIOD, topK=k, workers=workers)
+        # Cùng support thì mẫu nào vào top-k tuỳ thứ tự duyệt: so multiset support và mọi mẫu bị bỏ không lớn hơn
+        assert len(top) == min(k, len(full))
+        assert all(full[pattern] == support for pattern, support in top.items())
+        assert sorted(top.values(), reverse=True) == ranked[:k]
+        assert all(support <= min(top.values()) for pattern, support in full.items() if pattern not in top)
+
+
+@pytest.mark.parametrize('mode', ['closed', 'maximal'])
+def test_topk_rejects_closed_and_maximal(mode):
+    with pytest.raises(ValueError):
+        ThreePEclatPruning(minPS=MINPS, period=PERIOD, topK=5, **{mode: True})
@@ -0,0 +1,538 @@
+import numpy as np
+from support import grouped_periodic_support, intersect_sorted, intersect_bounded, periodic_support, ABORT_CHUNK
+import kernels
+
+TIDLIST_BACKENDS = ('array', 'bitset', 'roaring', 'packed', 'auto')
+
+# Mật độ (số timestamp / kích thước universe) từ đó bitset nhỏ hơn mảng uint16
+BITSET_DENSITY = 1 / 16
+
+_CONTAINER_BITS = 16
+_CONTAINER_SIZE = 1 << _CONTAINER_BITS
+# Ngưỡng chuyển giữa array container và bitmap container (giống Roaring)
+_ARRAY_CONTAINER_MAX = 4096
+
+# Số ứng viên cùng kiểu với X tối thiểu để giao cả lớp một lần (intersect_class) thay vì từng cặp
+CLASS_BATCH_MIN = 4
+# Số bit tối đa được giải nén cùng lúc khi đếm khoảng cách trên ma trận bitset (1 byte mỗi bit)
+CLASS_BATCH_BITS = 1 << 24
+
+# Số khoảng cách trong mỗi khối của tid-list nén (packed): PACK_BLOCK giá trị b bit chiếm đúng PACK_BLOCK * b / 8 byte
+PACK_BLOCK = 128
+# Số bit lớn nhất của khối được giải nén bằng một lần đọc 8 byte cho mỗi giá trị; khối rộng hơn giải nén từng bit
+_PACK_WORD_BITS = 56
+
+
+def _popcount(words):
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+def _words_from_positions(positions, nbits):
+    mask = np.zeros(((nbits + 63) // 64) * 64, dtype=bool)
+    mask[positions] = True
+    return np.packbits(mask, bitorder='little').view('<u8').copy()
+
+
+def _positions_from_words(words):
+    return np.flatnonzero(np.unpackbits(words.view(np.uint8), bitorder='little'))
+
+
+def _test_bits(words, positions):
+    return ((words[positions >> 6] >> (positions & 63).astype(np.uint64)) & np.uint64(1)).astype(bool)
+
+
+def _pack_deltas(deltas):
+    # Frame-of-reference theo khối PACK_BLOCK giá trị: trả về (ref, số bit, vị trí byte của từng khối, dữ liệu).
+    # Khối cuối được đệm để không làm tăng số bit và chỉ lưu số byte đủ cho các giá trị thật;
+    # khối có mọi giá trị bằng nhau không tốn byte nào
+    num_blocks = -(-len(deltas) // PACK_BLOCK)
+    blocks = np.empty(num_blocks * PACK_BLOCK, dtype=np.int64)
+    blocks[:len(deltas)] = deltas
+    blocks[len(deltas):] = deltas[-1] if len(deltas) else 0
+    blocks = blocks.reshape(num_blocks, PACK_BLOCK)
+    refs = blocks.min(axis=1)
+    widths = np.frexp((blocks.max(axis=1) - refs).astype(np.float64))[1].astype(np.uint8)
+    if num_blocks:
+        # Phần dư của giá trị đệm là 0: byte cuối giống nhau dù nén bằng NumPy hay kernel
+        blocks[-1, len(deltas) - PACK_BLOCK * (num_blocks - 1):] = refs[-1]
+    sizes = widths.astype(np.int64) * (PACK_BLOCK // 8)
+    if num_blocks:
+        sizes[-1] = -(-(len(deltas) - PACK_BLOCK * (num_blocks - 1)) * int(widths[-1]) // 8)
+    offsets = np.zeros(num_blocks + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    # 8 byte đệm ở cuối để mọi giá trị đọc được bằng một lần lấy 8 byte (xem _unpack_blocks)
+    data = np.zeros(offsets[-1] + 8, dtype=np.uint8)
+    if kernels.KERNEL == 'numba':
+        kernels.pack_deltas(deltas, refs, widths, offsets, PACK_BLOCK, data)
+        return refs, widths, offsets, data
+    for width in np.unique(widths[widths > 0]).tolist():
+        rows = np.flatnonzero(widths == width)
+        values = blocks[rows] - refs[rows, None]
+        bits = np.empty((len(rows), PACK_BLOCK, width), dtype=np.uint8)
+        for bit in range(width):
+            bits[:, :, bit] = (values >> bit) & 1
+        packed = np.packbits(bits.reshape(len(rows), -1), axis=1, bitorder='little')
+        index = offsets[rows, None] + np.arange(packed.shape[1])
+        stored = index < offsets[rows + 1, None]
+        data[index[stored]] = packed[stored]
+    return refs, widths, offsets, data
+
+
+def _unpack_blocks(refs, widths, offsets, data, blocks):
+    # Giải nén các khối được chọn thành ma trận (số khối, PACK_BLOCK) giá trị. Giá trị thứ k của khối b bắt đầu ở bit
+    # k * width: đọc 8 byte từ byte chứa bit đó (view uint64 bước 1 byte trên data) rồi dịch và lấy width bit thấp.
+    # Giá trị đệm của khối cuối có thể đọc sang vùng khác, chúng bị bỏ qua ở nơi gọi
+    block_widths = widths[blocks].astype(np.int64)
+    words = np.ndarray((len(data) - 7,), dtype='<u8', buffer=data, strides=(1,))
+    bits = np.arange(PACK_BLOCK) * block_widths[:, None]
+    index = np.minimum(offsets[blocks, None] + (bits >> 3), len(words) - 1)
+    masks = (np.uint64(1) << block_widths.astype(np.uint64)[:, None]) - np.uint64(1)
+    out = ((words[index] >> (bits & 7).astype(np.uint64)) & masks).astype(np.int64)
+    out += refs[blocks, None]
+    wide = np.flatnonzero(block_widths > _PACK_WORD_BITS)
+    for width in np.unique(block_widths[wide]).tolist():
+        rows = wide[block_widths[wide] == width]
+        selected = blocks[rows]
+        index = offsets[selected, None] + np.arange(PACK_BLOCK * width // 8)
+        stored = index < offsets[selected + 1, None]
+        packed = np.zeros(index.shape, dtype=np.uint8)
+        packed[stored] = data[index[stored]]
+        bits = np.unpackbits(packed, axis=1, bitorder='little').reshape(len(rows), PACK_BLOCK, width)
+        values = np.broadcast_to(refs[selected, None], (len(rows), PACK_BLOCK)).copy()
+        for bit in range(width):
+            values += bits[:, :, bit].astype(np.int64) << bit
+        out[rows] = values
+    return out
+
+
+class TidUniverse:
+    # Ánh xạ timestamp <-> vị trí liên tục 0..size-1 dùng chung cho mọi tid-list
+    def __init__(self, timestamps):
+        self.timestamps = np.unique(np.asarray(timestamps, dtype=np.int64))
+        self.size = len(self.timestamps)
+
+    @classmethod
+    def from_sorted(cls, timestamps):
+        # timestamps đã sắp xếp và không trùng (ví dụ memmap của CSDL trên đĩa): dùng trực tiếp, không sao chép
+        universe = cls.__new__(cls)
+        universe.timestamps = timestamps
+        universe.size = len(timestamps)
+        return universe
+
+    def positions(self, timestamps):
+        return np.searchsorted(self.timestamps, np.asarray(timestamps, dtype=np.int64))
+
+
+class TidBuffer:
+    # Vùng nhớ cấp sẵn cho tid-list của một lớp tương đương. Khi duyệt theo chiều sâu, lớp trước ở cùng độ sâu
+    # đã duyệt xong nên vùng nhớ được dùng lại từ đầu (reset). Phép giao ghi kết quả vào reserve() và đặt pending;
+    # commit() giữ lại kết quả đó, nếu không thì lần reserve sau ghi đè. Thiếu chỗ thì cấp vùng mới gấp đôi,
+    # các tid-list đã ghi vẫn tham chiếu vùng cũ. allocations đếm số mảng tid-list phải cấp mới
+    __slots__ = ('data', 'used', 'pending', 'allocations')
+
+    def __init__(self):
+        self.data = np.empty(0, dtype=np.int64)
+        self.used = 0
+        self.pending = 0
+        self.allocations = 0
+
+    def reset(self):
+        self.used = 0
+        self.pending = 0
+
+    def reserve(self, size):
+        self.pending = 0
+        if self.used + size > len(self.data):
+            self.data = np.empty(max(2 * len(self.data), size), dtype=np.int64)
+            self.used = 0
+            self.allocations += 1
+        return self.data[self.used:self.used + size]
+
+    def commit(self):
+        self.used += self.pending
+        self.pending = 0
+
+
+class TidList:
+    __slots__ = ('universe',)
+
+    def intersect(self, other):
+        raise NotImplementedError
+
+    def intersect_bounded(self, other, period, minPS, buffer=None):
+        # Trả về (tid-list giao, support); tid-list là None khi phép giao dừng sớm vì support không thể đạt minPS.
+        # buffer (TidBuffer): kiểu tid-list hỗ trợ thì ghi kết quả vào đó, nếu không thì tính là một lần cấp phát
+        common = self.intersect(other)
+        if buffer is not None:
+            buffer.allocations += 1
+        return common, common.periodic_support(period)
+
+    def periodic_support(self, period):
+        return periodic_support(self.timestamps(), period)
+
+    def positions(self):
+        raise NotImplementedError
+
+    def timestamps(self):
+        return self.universe.timestamps[self.positions()]
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class ArrayTidList(TidList):
+    __slots__ = ('pos',)
+
+    def __init__(self, universe, positions):
+        self.universe = universe
+        self.pos = positions
+
+    def intersect(self, other):
+        if isinstance(other, ArrayTidList):
+            return ArrayTidList(self.universe, intersect_sorted(self.pos, other.pos))
+        return other.intersect(self)
+
+    def intersect_bounded(self, other, period, minPS, buffer=None):
+        if not isinstance(other, ArrayTidList):
+            return TidList.intersect_bounded(self, other, period, minPS, buffer)
+        out = None if buffer is None else buffer.reserve(min(len(self.pos), len(other.pos)))
+        common, support = intersect_bounded(self.pos, other.pos, period, minPS, self.universe.timestamps, out=out)
+        if common is None:
+            return None, support
+        if buffer is not None:
+            buffer.pending = len(common)
+        return ArrayTidList(self.universe, common), support
+
+    def positions(self):
+        return self.pos
+
+    def __len__(self):
+        return len(self.pos)
+
+
+class BitsetTidList(TidList):
+    __slots__ = ('words', '_count')
+
+    def __init__(self, universe, words, count=None):
+        self.universe = universe
+        self.words = words
+        self._count = count
+
+    @classmethod
+    def from_positions(cls, universe, positions):
+        return cls(universe, _words_from_positions(positions, universe.size), len(positions))
+
+    def intersect(self, other):
+        if isinstance(other, BitsetTidList):
+            return BitsetTidList(self.universe, np.bitwise_and(self.words, other.words))
+        if isinstance(other, ArrayTidList):
+            return ArrayTidList(self.universe, other.pos[_test_bits(self.words, other.pos)])
+        return other.intersect(self)
+
+    def intersect_bounded(self, other, period, minPS, buffer=None):
+        if not isinstance(other, BitsetTidList) or (buffer is None and kernels.KERNEL != 'numba'):
+            return TidList.intersect_bounded(self, other, period, minPS, buffer)
+        if buffer is None:
+            words = np.empty(len(self.words), dtype=np.uint64)
+        else:
+            words = buffer.reserve(len(self.words)).view(np.uint64)
+            buffer.pending = len(words)
+        if kernels.KERNEL == 'numba':
+            # AND và đếm khoảng cách trong một lượt, không giải nén bitset ra mảng vị trí
+            count, support = kernels.and_gaps(self.words, other.words, self.universe.timestamps, period, words)
+            return BitsetTidList(self.universe, words, count), support
+        np.bitwise_and(self.words, other.words, out=words)
+        common = BitsetTidList(self.universe, words)
+        return common, periodic_support(common.timestamps(), period)
+
+    def test(self, positions):
+        return _test_bits(self.words, positions)
+
+    def positions(self):
+        return _positions_from_words(self.words)
+
+    def __len__(self):
+        if self._count is None:
+            self._count = _popcount(self.words)
+        return self._count
+
+
+class RoaringTidList(TidList):
+    # Chia vị trí theo 16 bit cao; mỗi khối là mảng uint16 đã sắp xếp (thưa) hoặc bitmap 2^16 bit (dày)
+    __slots__ = ('containers', '_count')
+
+    def __init__(self, universe, containers):
+        self.universe = universe
+        self.containers = containers
+        self._count = None
+
+    @staticmethod
+    def _container(low):
+        if len(low) > _ARRAY_CONTAINER_MAX:
+            return _words_from_positions(low, _CONTAINER_SIZE)
+        return low.astype(np.uint16)
+
+    @staticmethod
+    def _is_bitmap(container):
+        return container.dtype == np.uint64
+
+    @classmethod
+    def from_positions(cls, universe, positions):
+        positions = np.asarray(positions, dtype=np.int64)
+        containers = {}
+        if len(positions):
+            high = positions >> _CONTAINER_BITS
+            keys, starts = np.unique(high, return_index=True)
+            bounds = list(starts[1:]) + [len(positions)]
+            for key, start, end in zip(keys, starts, bounds):
+                containers[int(key)] = cls._container(positions[start:end] & (_CONTAINER_SIZE - 1))
+        return cls(universe, containers)
+
+    @classmethod
+    def _intersect_containers(cls, a, b):
+        a_bitmap = cls._is_bitmap(a)
+        b_bitmap = cls._is_bitmap(b)
+        if a_bitmap and b_bitmap:
+            words = np.bitwise_and(a, b)
+            if _popcount(words) <= _ARRAY_CONTAINER_MAX:
+                return _positions_from_words(words).astype(np.uint16)
+            return words
+        if a_bitmap:
+            return b[_test_bits(a, b.astype(np.int64))]
+        if b_bitmap:
+            return a[_test_bits(b, a.astype(np.int64))]
+        return intersect_sorted(a, b)
+
+    def intersect(self, other):
+        if isinstance(other, RoaringTidList):
+            containers = {}
+            small, large = sorted((self.containers, other.containers), key=len)
+            for key, container in small.items():
+                other_container = large.get(key)
+                if other_container is None:
+                    continue
+                result = self._intersect_containers(container, other_container)
+                if result.any() if self._is_bitmap(result) else len(result):
+                    containers[key] = result
+            return RoaringTidList(self.universe, containers)
+        positions = self.positions()
+        if isinstance(other, BitsetTidList):
+            keep = other.test(positions)
+        else:
+            keep = np.isin(positions, other.positions(), assume_unique=True)
+        return RoaringTidList.from_positions(self.universe, positions[keep])
+
+    def positions(self):
+        parts = []
+        for key in sorted(self.containers):
+            container = self.containers[key]
+            if self._is_bitmap(container):
+                low = _positions_from_words(container)
+            else:
+                low = container.astype(np.int64)
+            parts.append(low + (key << _CONTAINER_BITS))
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(parts)
+
+    def __len__(self):
+        if self._count is None:
+            self._count = sum(_popcount(c) if self._is_bitmap(c) else len(c) for c in self.containers.values())
+        return self._count
+
+
+class PackedTidList(TidList):
+    # Timestamp đã sắp xếp, nén delta + frame-of-reference: khoảng cách giữa hai timestamp liên tiếp được chia thành
+    # khối PACK_BLOCK giá trị, mỗi khối lưu giá trị nhỏ nhất (ref) và phần dư (khoảng - ref) với cùng số bit (width).
+    # Periodic support là số khoảng <= period nên phần lớn khối được quyết định chỉ từ ref và width, không giải nén
+    __slots__ = ('first', 'count', 'refs', 'widths', 'offsets', 'data')
+
+    def __init__(self, universe, first, count, refs, widths, offsets, data):
+        self.universe = universe
+        self.first = first
+        self.count = count
+        self.refs = refs
+        self.widths = widths
+        self.offsets = offsets
+        self.data = data
+
+    @classmethod
+    def from_timestamps(cls, universe, timestamps):
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        first = int(timestamps[0]) if len(timestamps) else 0
+        return cls(universe, first, len(timestamps), *_pack_deltas(np.diff(timestamps)))
+
+    @classmethod
+    def from_positions(cls, universe, positions):
+        return cls.from_timestamps(universe, universe.timestamps[positions])
+
+    @property
+    def nbytes(self):
+        return self.refs.nbytes + self.widths.nbytes + self.offsets.nbytes + self.data.nbytes
+
+    def _block_lengths(self):
+        lengths = np.full(len(self.refs), PACK_BLOCK, dtype=np.int64)
+        if len(lengths):
+            lengths[-1] = self.count - 1 - PACK_BLOCK * (len(lengths) - 1)
+        return lengths
+
+    def periodic_support(self, period):
+        # Khối có ref > period không góp khoảng nào, khối có ref + 2^width - 1 <= period góp mọi khoảng;
+        # chỉ giải nén các khối còn lại
+        if self.count < 2:
+            return 0
+        if kernels.KERNEL == 'numba':
+            return kernels.packed_gaps(self.count, self.refs, self.widths, self.offsets, PACK_BLOCK, self.data, period)
+        lengths = self._block_lengths()
+        full = self.refs + ((np.int64(1) << self.widths.astype(np.int64)) - 1) <= period
+        support = int(lengths[full].sum())
+        partial = np.flatnonzero(~full & (self.refs <= period))
+        if len(partial):
+            values = _unpack_blocks(self.refs, self.widths, self.offsets, self.data, partial)
+            valid = np.arange(PACK_BLOCK) < lengths[partial, None]
+            support += int(np.count_nonzero((values <= period) & valid))
+        return support
+
+    def intersect(self, other):
+        if isinstance(other, PackedTidList):
+            return PackedTidList.from_timestamps(self.universe, intersect_sorted(self.timestamps(), other.timestamps()))
+        return ArrayTidList(self.universe, self.positions()).intersect(other)
+
+    def intersect_bounded(self, other, period, minPS, buffer=None, timestamps=None):
+        # timestamps: t(self) đã giải nén sẵn. Khi sinh lớp con, t(X) được giao lần lượt với mọi t(J) nên miner giải nén
+        # một lần cho cả lớp rồi truyền vào
+        if not isinstance(other, PackedTidList):
+            return TidList.intersect_bounded(self, other, period, minPS, buffer)
+        # Giải nén hai tid-list rồi giao theo khối như mảng (dừng sớm được); kết quả được nén lại
+        if timestamps is None:
+            timestamps = self.timestamps()
+        common, support = intersect_bounded(timestamps, other.timestamps(), period, minPS)
+        if buffer is not None:
+            buffer.allocations += 1
+        if common is None:
+            return None, support
+        return PackedTidList.from_timestamps(self.universe, common), support
+
+    def timestamps(self):
+        if kernels.KERNEL == 'numba':
+            return kernels.unpack_timestamps(self.first, self.count, self.refs, self.widths, self.offsets, PACK_BLOCK,
+                                             self.data)
+        out = np.empty(self.count, dtype=np.int64)
+        if self.count:
+            out[0] = self.first
+            blocks = np.arange(len(self.refs))
+            deltas = _unpack_blocks(self.refs, self.widths, self.offsets, self.data, blocks).ravel()[:self.count - 1]
+            np.cumsum(deltas, out=out[1:])
+            out[1:] += self.first
+        return out
+
+    def positions(self):
+        return self.universe.positions(self.timestamps())
+
+    def __len__(self):
+        return self.count
+
+
+def batchable(tidSetX, tidSetJ):
+    # Cặp được giao theo lô khi cùng kiểu bitset, hoặc cùng kiểu array và t(J) không dài hơn một khối ABORT_CHUNK
+    # (tid-list dài hơn giao từng cặp để còn dừng sớm được)
+    if type(tidSetJ) is not type(tidSetX):
+        return False
+    if isinstance(tidSetX, ArrayTidList):
+        return len(tidSetJ.pos) <= ABORT_CHUNK
+    return isinstance(tidSetX, BitsetTidList)
+
+
+def intersect_class(tidSetX, others, period, minPS, buffer=None):
+    # Giao X với mọi tid-list trong others (cùng kiểu với X, xem batchable) và tính support của tất cả trong vài phép
+    # NumPy, không gọi intersect_bounded cho từng cặp. Trả về danh sách (tid-list giao, support) theo thứ tự của others;
+    # tid-list là None khi support < minPS. Kết quả nằm liền nhau trong buffer (nếu có) và đã được commit
+    if isinstance(tidSetX, BitsetTidList):
+        commons, counts, supports = _intersect_class_bitset(tidSetX, others, period, buffer)
+        results = [BitsetTidList(tidSetX.universe, commons[r], int(counts[r])) if supports[r] >= minPS else None
+                   for r in range(len(others))]
+    else:
+        commons, bounds, supports = _intersect_class_array(tidSetX, others, period, buffer)
+        results = [ArrayTidList(tidSetX.universe, commons[bounds[r]:bounds[r + 1]]) if supports[r] >= minPS else None
+                   for r in range(len(others))]
+    if buffer is not None and (supports >= minPS).any():
+        buffer.commit()
+    return list(zip(results, supports.tolist()))
+
+
+def _intersect_class_array(tidSetX, others, period, buffer):
+    # Nối tid-list của cả lớp thành một mảng kèm số hàng, tìm nhị phân mọi phần tử trong t(X) một lần;
+    # phần tử giữ lại vẫn theo hàng rồi theo vị trí nên tid-list giao của hàng r là một đoạn liền nhau
+    xpos = tidSetX.pos
+    lengths = np.fromiter((len(t.pos) for t in others), dtype=np.int64, count=len(others))
+    merged = np.concatenate([t.pos for t in others])
+    rows = np.repeat(np.arange(len(others)), lengths)
+    if len(xpos):
+        idx = np.searchsorted(xpos, merged)
+        np.minimum(idx, len(xpos) - 1, out=idx)
+        found = xpos[idx] == merged
+    else:
+        found = np.zeros(len(merged), dtype=bool)
+    count = int(np.count_nonzero(found))
+    if buffer is None:
+        commons = merged[found]
+    else:
+        commons = buffer.reserve(count)
+        np.compress(found, merged, out=commons)
+        buffer.pending = count
+    rows = rows[found]
+    supports = grouped_periodic_support(rows, tidSetX.universe.timestamps[commons], period, len(others))
+    bounds = np.zeros(len(others) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(others)), out=bounds[1:])
+    return commons, bounds, supports
+
+
+def _intersect_class_bitset(tidSetX, others, period, buffer):
+    # Ma trận bitset của cả lớp (mỗi hàng một tid-list) AND với t(X), rồi giải nén theo khối hàng
+    # để đếm số phần tử và khoảng cách của mọi hàng cùng lúc
+    num_rows = len(others)
+    num_words = len(tidSetX.words)
+    if buffer is None:
+        matrix = np.empty((num_rows, num_words), dtype=np.uint64)
+    else:
+        matrix = buffer.reserve(num_rows * num_words).view(np.uint64).reshape(num_rows, num_words)
+        buffer.pending = num_rows * num_words
+    np.stack([t.words for t in others], out=matrix)
+    timestamps = tidSetX.universe.timestamps
+    if kernels.KERNEL == 'numba':
+        counts, supports = kernels.and_rows(matrix, tidSetX.words, timestamps, period)
+        return matrix, counts, supports
+    np.bitwise_and(matrix, tidSetX.words, out=matrix)
+    counts = np.zeros(num_rows, dtype=np.int64)
+    supports = np.zeros(num_rows, dtype=np.int64)
+    step = max(1, CLASS_BATCH_BITS // max(1, num_words * 64))
+    for start in range(0, num_rows, step):
+        block = matrix[start:start + step]
+        rows, cols = np.nonzero(np.unpackbits(block.view(np.uint8), axis=1, bitorder='little'))
+        counts[start:start + len(block)] = np.bincount(rows, minlength=len(block))
+        supports[start:start + len(block)] = grouped_periodic_support(rows, timestamps[cols], period, len(block))
+    return matrix, counts, supports
+
+
+def choose_backend(count, universe_size, density=BITSET_DENSITY):
+    if universe_size and count / universe_size >= density:
+        return 'bitset'
+    return 'roaring'
+
+
+def make_tidlist(backend, universe, timestamps, density=BITSET_DENSITY):
+    if backend == 'packed':
+        # Nén trực tiếp trên timestamp, không cần đổi sang vị trí trong universe
+        return PackedTidList.from_timestamps(universe, np.unique(np.asarray(timestamps, dtype=np.int64)))
+    positions = np.unique(universe.positions(timestamps))
+    if backend == 'auto':
+        backend = choose_backend(len(positions), universe.size, density)
+    if backend == 'bitset':
+        return BitsetTidList.from_positions(universe, positions)
+    if backend == 'roaring':
+        return RoaringTidList.from_positions(universe, positions)
+    if backend == 'array':
+        return ArrayTidList(universe, positions)
+    raise ValueError(f"Kiểu tid-list không được hỗ trợ: {backend}")